@@ -0,0 +1,4 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks of ComicPy over a synthetic corpus, see `benchmarks.run`.
+"""
@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+"""
+Generator of a synthetic corpus of comics, built locally:
+
+* PDF files with N pages, each page an embedded JPEG or PNG image.
+* ZIP files and ZIP files encrypted with AES.
+* RAR files, when the RAR command is available.
+* Directories of images, nested in a directory by comic.
+
+Each page is a different image (gradient, noise and the page number), the
+handlers discard duplicated images.
+"""
+
+from comicpy.utils import Paths
+
+from PIL import Image, ImageDraw
+import subprocess
+import pyzipper
+import shutil
+import io
+
+try:
+    import pymupdf as fitz
+except ImportError:
+    import fitz
+
+from typing import Dict, Iterator, List, Literal, Tuple, Union
+
+
+PASSWORD = 'benchmark'
+
+
+def page_images(
+    pages: int,
+    size: Tuple[int, int] = (1200, 1700),
+    format: Literal['jpeg', 'png'] = 'jpeg'
+) -> Iterator[Tuple[str, bytes]]:
+    """
+    Generates the images of the pages of a comic.
+
+    Args
+        pages: number of pages.
+        size: width and height of images in pixels.
+        format: 'jpeg' or 'png'. Default is 'jpeg'.
+
+    Returns
+        iterator: tuples with the name and data of each image.
+    """
+    width, height = size
+    gradient = Image.linear_gradient('L').resize(size)
+    noise = Image.effect_noise(size, 48)
+    base = Image.merge('RGB', (gradient, noise, gradient.rotate(180)))
+    extension = 'jpg' if format == 'jpeg' else 'png'
+    for number in range(1, pages + 1):
+        image = base.copy()
+        draw = ImageDraw.Draw(image)
+        # a band in a different place by page, so the images are not equal.
+        top = (number * 97) % max(height - 40, 1)
+        draw.rectangle((0, top, width, top + 40), fill=(number % 256, 0, 0))
+        draw.text((20, top + 10), 'page %d' % number, fill=(255, 255, 255))
+        data = io.BytesIO()
+        image.save(data, format=format)
+        yield 'page_%05d.%s' % (number, extension), data.getvalue()
+
+
+def make_pdf(
+    path: str,
+    images: List[Tuple[str, bytes]]
+) -> str:
+    """
+    Writes a PDF file with one image by page.
+    """
+    document = fitz.open()
+    for name, data in images:
+        with Image.open(io.BytesIO(data)) as image:
+            width, height = image.size
+        page = document.new_page(width=width, height=height)
+        page.insert_image(page.rect, stream=data)
+    document.save(path)
+    document.close()
+    return path
+
+
+def make_zip(
+    path: str,
+    images: List[Tuple[str, bytes]],
+    password: str = None
+) -> str:
+    """
+    Writes a ZIP file with the images in a directory, encrypted with AES if
+    a password is given.
+    """
+    directory = Paths.splitext(Paths.get_basename(path))[0]
+    with pyzipper.AESZipFile(
+        path,
+        'w',
+        compression=pyzipper.ZIP_STORED,
+        encryption=pyzipper.WZ_AES if password is not None else None
+    ) as file:
+        if password is not None:
+            file.setpassword(password.encode())
+        for name, data in images:
+            file.writestr('%s/%s' % (directory, name), data)
+    return path
+
+
+def make_images_dir(
+    path: str,
+    images: List[Tuple[str, bytes]]
+) -> str:
+    """
+    Writes the images in a directory.
+    """
+    Paths.build(path, make=True)
+    for name, data in images:
+        with open(Paths.build(path, name), 'wb') as file:
+            file.write(data)
+    return path
+
+
+def find_rar(
+    exec_path_rar: str = None
+) -> Union[str, None]:
+    """
+    Returns the path of the RAR command, `None` if it is not available.
+    """
+    return shutil.which('rar', path=exec_path_rar) or shutil.which('rar')
+
+
+def make_rar(
+    path: str,
+    images: List[Tuple[str, bytes]],
+    rar: str
+) -> Union[str, None]:
+    """
+    Writes a RAR file with the images in a directory.
+
+    Returns
+        str: path of RAR file.
+        None: if the RAR command failed.
+    """
+    name = Paths.splitext(Paths.get_basename(path))[0]
+    temp = Paths.build(Paths.get_dirname(path), '.%s' % name, make=True)
+    make_images_dir(path=Paths.build(temp, name), images=images)
+    process = subprocess.run(
+                    [rar, 'a', '-r', '-m0', '-ep1', Paths.get_abs_path(path),
+                     Paths.build(temp, name)],
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE
+                )
+    shutil.rmtree(temp, ignore_errors=True)
+    return path if process.returncode == 0 else None
+
+
+def build_corpus(
+    directory: str,
+    files: int = 2,
+    pages: int = 20,
+    size: Tuple[int, int] = (1200, 1700),
+    exec_path_rar: str = None
+) -> Dict[str, Union[str, None]]:
+    """
+    Builds the corpus, a directory by kind of input with `files` comics of
+    `pages` pages. The PDF files alternate JPEG and PNG pages.
+
+    Args
+        directory: directory of corpus.
+        files: number of comics by kind. Default is 2.
+        pages: number of pages of each comic. Default is 20.
+        size: width and height of pages in pixels.
+        exec_path_rar: directory of RAR command.
+
+    Returns
+        dict: directory by kind, 'pdf', 'zip', 'zip_aes', 'rar' (`None` if
+              the RAR command is not available) and 'images'.
+    """
+    rar = find_rar(exec_path_rar=exec_path_rar)
+    kinds = {
+        'pdf': Paths.build(directory, 'pdf', make=True),
+        'zip': Paths.build(directory, 'zip', make=True),
+        'zip_aes': Paths.build(directory, 'zip_aes', make=True),
+        'rar': Paths.build(directory, 'rar', make=True) if rar else None,
+        'images': Paths.build(directory, 'images', make=True)
+    }
+    for index in range(1, files + 1):
+        name = 'comic_%03d' % index
+        format = 'jpeg' if index % 2 else 'png'
+        make_pdf(
+            path=Paths.build(kinds['pdf'], '%s.pdf' % name),
+            images=page_images(pages=pages, size=size, format=format)
+        )
+        images = list(page_images(pages=pages, size=size))
+        make_zip(path=Paths.build(kinds['zip'], '%s.zip' % name),
+                 images=images)
+        make_zip(path=Paths.build(kinds['zip_aes'], '%s.zip' % name),
+                 images=images,
+                 password=PASSWORD)
+        if rar:
+            make_rar(path=Paths.build(kinds['rar'], '%s.rar' % name),
+                     images=images,
+                     rar=rar)
+        make_images_dir(path=Paths.build(kinds['images'], name),
+                        images=images)
+    return kinds
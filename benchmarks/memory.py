@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+"""
+Memory regression harness.
+
+Runs each case of `benchmarks.run` (`process_pdf`, `process_zip`,
+`process_rar`, `process_stream` and `process_dir`) over generated inputs of
+1k and 10k pages, split in comics of `--pages_per_file` pages converted by
+one `ComicPy` instance, each run in a new process. The peak of memory
+traced by `tracemalloc` and the growth of the peak resident memory (RSS)
+over the memory used before converting are recorded, and their growth with
+the number of pages must be sublinear:
+
+    exponent = log(peak_large / peak_small) / log(pages_large / pages_small)
+
+An exponent near 0 is a flat peak, 1 is a peak proportional to the pages,
+what happens when the images of every comic are kept in lists. The
+conversion of one comic keeps its images until they are written, so the
+size of each comic is fixed and only their number grows.
+
+    $ python -m benchmarks.memory --pages 1000 10000 --output memory.json
+"""
+
+from comicpy.comicpycontroller import ComicPy
+
+from benchmarks.corpus import build_corpus
+from benchmarks.run import CASES, convert, peak_rss
+
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+import tracemalloc
+import argparse
+import tempfile
+import shutil
+import json
+import math
+import sys
+
+from typing import Dict, List, Union
+
+
+def measure_case(
+    case: str,
+    corpus: Dict[str, str],
+    pages: int,
+    options: dict = None
+) -> dict:
+    """
+    Converts the files of a case measuring its memory, in a new process.
+
+    Args
+        case: name of case, see `benchmarks.run.CASES`.
+        corpus: directories of corpus.
+        pages: number of pages converted by the case.
+        options: arguments of `ComicPy`.
+
+    Returns
+        dict: 'pages', 'tracemalloc_peak', 'peak_rss' and 'rss_growth',
+              in bytes.
+    """
+    dest = tempfile.mkdtemp(prefix='comicpy_memory_')
+    try:
+        with ComicPy(**(options or {})) as comic:
+            baseline = peak_rss()
+            tracemalloc.start()
+            try:
+                convert(comic=comic, case=case, corpus=corpus, dest=dest)
+                traced = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+    finally:
+        shutil.rmtree(dest, ignore_errors=True)
+    rss = peak_rss()
+    return {
+        'pages': pages,
+        'tracemalloc_peak': traced,
+        'peak_rss': rss,
+        'rss_growth': rss - baseline if rss is not None else None
+    }
+
+
+def growth(
+    small: dict,
+    large: dict,
+    key: str
+) -> Union[float, None]:
+    """
+    Returns the exponent of the growth of a measure between two sizes of
+    input, 1.0 is linear.
+
+    Args
+        small: measures of the small input.
+        large: measures of the large input.
+        key: name of measure.
+
+    Returns
+        float: exponent of growth.
+        None: if the measure is not available.
+    """
+    if not small[key] or large[key] is None:
+        return None
+    # a peak lower than the small one is not growth.
+    ratio = max(large[key] / small[key], 1.0)
+    return math.log(ratio) / math.log(large['pages'] / small['pages'])
+
+
+def check(
+    results: Dict[str, List[dict]],
+    max_exponent: float = 0.5
+) -> Dict[str, dict]:
+    """
+    Computes the growth of each case, between its smallest and largest
+    input.
+
+    Args
+        results: measures by case, one by size of input.
+        max_exponent: highest exponent of growth allowed. Default is 0.5.
+
+    Returns
+        dict: 'tracemalloc', 'rss' exponents and 'sublinear' by case.
+    """
+    report = {}
+    for case, measures in results.items():
+        small = min(measures, key=lambda item: item['pages'])
+        large = max(measures, key=lambda item: item['pages'])
+        exponents = {
+            'tracemalloc': growth(small, large, 'tracemalloc_peak'),
+            'rss': growth(small, large, 'rss_growth')
+        }
+        exponents['sublinear'] = all(
+                exponent is None or exponent <= max_exponent
+                for exponent in exponents.values()
+            )
+        report[case] = exponents
+    return report
+
+
+def main() -> None:
+    """
+    Main function of memory harness.
+    """
+    parser = argparse.ArgumentParser(
+                prog='benchmarks.memory',
+                description='Checks that the memory of ComicPy grows \
+                sublinearly with the pages converted.'
+            )
+    parser.add_argument(
+            '--cases',
+            nargs='+',
+            choices=[case for case in CASES if case != 'zip_aes'],
+            default=['pdf', 'zip', 'rar', 'stream', 'dir_pdf', 'dir_images'],
+            help='Cases to run. Default is all.'
+        )
+    parser.add_argument(
+            '--pages',
+            nargs='+',
+            type=int,
+            default=[1000, 10000],
+            help='Number of pages of inputs. Default is "1000 10000".'
+        )
+    parser.add_argument(
+            '--pages_per_file',
+            type=int,
+            default=50,
+            help='Number of pages of each comic. Default is "50".'
+        )
+    parser.add_argument(
+            '--size',
+            default='160x220',
+            help='Size of pages, WIDTHxHEIGHT. Default is "160x220".'
+        )
+    parser.add_argument(
+            '--max_exponent',
+            type=float,
+            default=0.5,
+            help='Highest exponent of growth of memory allowed, 1 is \
+            linear. Default is "0.5".'
+        )
+    parser.add_argument(
+            '--path_exec',
+            default=None,
+            help='Directory of RAR command.'
+        )
+    parser.add_argument(
+            '--output',
+            default=None,
+            help='Path of JSON file of results.'
+        )
+    args = parser.parse_args()
+
+    width, height = (int(value) for value in args.size.lower().split('x'))
+    options = {'exec_path_rar': args.path_exec}
+    context = get_context('spawn')
+    results: Dict[str, List[dict]] = {case: [] for case in args.cases}
+    for pages in sorted(args.pages):
+        corpus_dir = tempfile.mkdtemp(prefix='comicpy_corpus_')
+        try:
+            print('Building corpus of %d pages ...' % pages)
+            corpus = build_corpus(
+                        directory=corpus_dir,
+                        files=max(pages // args.pages_per_file, 1),
+                        pages=args.pages_per_file,
+                        size=(width, height),
+                        exec_path_rar=args.path_exec
+                    )
+            for case in args.cases:
+                if case == 'rar' and corpus['rar'] is None:
+                    continue
+                with ProcessPoolExecutor(1, mp_context=context) as executor:
+                    measures = executor.submit(
+                                    measure_case, case, corpus, pages, options
+                                ).result()
+                results[case].append(measures)
+                print('%-10s %6d pages  tracemalloc: %8.2f MB  RSS growth: '
+                      '%8.2f MB' % (
+                        case,
+                        pages,
+                        measures['tracemalloc_peak'] / 10**6,
+                        (measures['rss_growth'] or 0) / 10**6
+                    ))
+        finally:
+            shutil.rmtree(corpus_dir, ignore_errors=True)
+
+    results = {case: items for case, items in results.items() if items}
+    report = check(results=results, max_exponent=args.max_exponent)
+    for case, exponents in report.items():
+        print('%-10s exponent tracemalloc: %s  RSS: %s  %s' % (
+                case,
+                '%.2f' % exponents['tracemalloc']
+                if exponents['tracemalloc'] is not None else '-',
+                '%.2f' % exponents['rss']
+                if exponents['rss'] is not None else '-',
+                'ok' if exponents['sublinear'] else 'NOT SUBLINEAR'
+            ))
+    if args.output is not None:
+        with open(args.output, 'w') as file:
+            json.dump({
+                'params': {
+                    'pages_per_file': args.pages_per_file,
+                    'size': [width, height],
+                    'max_exponent': args.max_exponent
+                },
+                'results': results,
+                'growth': report
+            }, file, indent=2)
+    if not all(exponents['sublinear'] for exponents in report.values()):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
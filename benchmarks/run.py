@@ -0,0 +1,436 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks of `process_pdf`, `process_zip`, `process_rar`, `process_stream`
+and `process_dir` over a synthetic corpus (`benchmarks.corpus`).
+
+Each case runs in a new process, its pages per second and its peak resident
+memory (RSS) are written to a JSON file, which can be compared with the
+results of other release:
+
+    $ python -m benchmarks.run --pages 50 --output results.json
+    $ python -m benchmarks.run --pages 50 --compare results.json
+"""
+
+from comicpy.comicpycontroller import ComicPy
+from comicpy.utils import Paths
+from comicpy.version import VERSION
+
+from benchmarks.corpus import PASSWORD, build_corpus
+
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from time import perf_counter
+import datetime
+import argparse
+import platform
+import tempfile
+import shutil
+import json
+import sys
+import os
+
+from typing import Dict, List, Union
+
+
+CASES = (
+    'pdf',
+    'zip',
+    'zip_aes',
+    'rar',
+    'stream',
+    'dir_pdf',
+    'dir_images'
+)
+
+
+def peak_rss() -> Union[int, None]:
+    """
+    Returns the peak resident memory in bytes of the process and its
+    children, `None` if it can not be measured.
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = max(
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+            resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+        )
+    # kilobytes, bytes on macOS.
+    return rss if sys.platform == 'darwin' else rss * 1024
+
+
+def convert(
+    comic: ComicPy,
+    case: str,
+    corpus: Dict[str, str],
+    dest: str,
+    jobs: int = 1
+) -> List[dict]:
+    """
+    Converts the files of a case.
+    """
+    if case == 'dir_pdf':
+        return comic.process_dir(
+                    directory_path=corpus['pdf'],
+                    extension_filter='pdf',
+                    dest=dest,
+                    jobs=jobs
+                )
+    if case == 'dir_images':
+        return comic.process_dir(
+                    directory_path=corpus['images'],
+                    extension_filter='images',
+                    dest=dest
+                )
+    directory = corpus['pdf' if case == 'stream' else case]
+    results = []
+    for name in sorted(os.listdir(directory)):
+        filename = Paths.build(directory, name)
+        if case == 'pdf':
+            results += comic.process_pdf(filename=filename, dest=dest)
+        elif case == 'zip':
+            results += comic.process_zip(filename=filename, dest=dest)
+        elif case == 'zip_aes':
+            results += comic.process_zip(
+                            filename=filename,
+                            dest=dest,
+                            password=PASSWORD
+                        )
+        elif case == 'rar':
+            results += comic.process_rar(filename=filename, dest=dest)
+        elif case == 'stream':
+            with open(filename, 'rb') as source, \
+                    open(os.devnull, 'wb') as sink:
+                results.append(comic.process_stream(
+                                    source=source,
+                                    sink=sink,
+                                    filename=filename
+                                ))
+    return results
+
+
+def run_case(
+    case: str,
+    corpus: Dict[str, str],
+    pages: int,
+    options: dict
+) -> dict:
+    """
+    Runs a case, in a new process.
+
+    Args
+        case: name of case.
+        corpus: directories of corpus.
+        pages: number of pages converted by the case.
+        options: arguments of `ComicPy` and `jobs`.
+
+    Returns
+        dict: 'files', 'pages', 'seconds', 'pages_per_sec' and 'peak_rss'.
+    """
+    options = dict(options)
+    jobs = options.pop('jobs')
+    dest = tempfile.mkdtemp(prefix='comicpy_benchmark_')
+    try:
+        with ComicPy(**options) as comic:
+            start = perf_counter()
+            results = convert(
+                        comic=comic,
+                        case=case,
+                        corpus=corpus,
+                        dest=dest,
+                        jobs=jobs
+                    )
+            seconds = perf_counter() - start
+    finally:
+        shutil.rmtree(dest, ignore_errors=True)
+    return {
+        'files': len(results or []),
+        'pages': pages,
+        'seconds': seconds,
+        'pages_per_sec': pages / seconds if seconds > 0 else None,
+        'peak_rss': peak_rss()
+    }
+
+
+def run(
+    corpus: Dict[str, str],
+    cases: List[str],
+    pages: int,
+    options: dict,
+    repeat: int = 1
+) -> Dict[str, dict]:
+    """
+    Runs the cases, each one `repeat` times in new processes, the fastest
+    run and the highest peak of memory are kept.
+
+    Returns
+        dict: results by case, cases without corpus are skipped.
+    """
+    results = {}
+    context = get_context('spawn')
+    for case in cases:
+        if case == 'rar' and corpus['rar'] is None:
+            print('%-10s skipped, RAR command not found.' % case)
+            continue
+        runs = []
+        for _ in range(repeat):
+            with ProcessPoolExecutor(1, mp_context=context) as executor:
+                runs.append(executor.submit(
+                                run_case, case, corpus, pages, options
+                            ).result())
+        result = min(runs, key=lambda item: item['seconds'])
+        rss = [item['peak_rss'] for item in runs if item['peak_rss']]
+        result['peak_rss'] = max(rss) if rss else None
+        results[case] = result
+        print(format_result(case=case, result=result))
+    return results
+
+
+def format_result(
+    case: str,
+    result: dict,
+    baseline: dict = None
+) -> str:
+    """
+    Returns a line with the result of a case, and its change over the
+    baseline.
+    """
+    line = '%-10s %5d pages %8.3f s %8.1f pages/s' % (
+                case,
+                result['pages'],
+                result['seconds'],
+                result['pages_per_sec'] or 0
+            )
+    if result['peak_rss'] is not None:
+        line += ' %8.1f MB RSS' % (result['peak_rss'] / 10**6)
+    if baseline is not None:
+        line += '  (%+.1f%% pages/s' % change(
+                    new=result['pages_per_sec'],
+                    old=baseline['pages_per_sec']
+                )
+        if result['peak_rss'] and baseline['peak_rss']:
+            line += ', %+.1f%% RSS' % change(
+                        new=result['peak_rss'],
+                        old=baseline['peak_rss']
+                    )
+        line += ')'
+    return line
+
+
+def change(
+    new: float,
+    old: float
+) -> float:
+    """
+    Returns the change in percent of a value.
+    """
+    if not old or new is None:
+        return 0.0
+    return (new - old) * 100 / old
+
+
+def compare(
+    results: Dict[str, dict],
+    baseline: Dict[str, dict],
+    tolerance: float
+) -> List[str]:
+    """
+    Prints the results with their changes over a baseline.
+
+    Args
+        results: results by case.
+        baseline: results by case of other run.
+        tolerance: loss of pages per second allowed, in percent.
+
+    Returns
+        List[str]: cases slower than the tolerance.
+    """
+    regressions = []
+    for case, result in results.items():
+        if case not in baseline:
+            continue
+        print(format_result(
+                case=case,
+                result=result,
+                baseline=baseline[case]
+            ))
+        speed = change(
+                    new=result['pages_per_sec'],
+                    old=baseline[case]['pages_per_sec']
+                )
+        if speed < -tolerance:
+            regressions.append(case)
+    return regressions
+
+
+def main() -> None:
+    """
+    Main function of benchmarks.
+    """
+    parser = argparse.ArgumentParser(
+                prog='benchmarks',
+                description='Benchmarks of ComicPy over a synthetic corpus.'
+            )
+    parser.add_argument(
+            '--cases',
+            nargs='+',
+            choices=CASES,
+            default=list(CASES),
+            help='Cases to run. Default is all.'
+        )
+    parser.add_argument(
+            '--files',
+            type=int,
+            default=2,
+            help='Number of comics by case. Default is "2".'
+        )
+    parser.add_argument(
+            '--pages',
+            type=int,
+            default=20,
+            help='Number of pages of each comic. Default is "20".'
+        )
+    parser.add_argument(
+            '--size',
+            default='1200x1700',
+            help='Size of pages, WIDTHxHEIGHT. Default is "1200x1700".'
+        )
+    parser.add_argument(
+            '--corpus',
+            default=None,
+            help='Directory of corpus, a temporary one by default. An \
+            existing corpus is used again.'
+        )
+    parser.add_argument(
+            '--repeat',
+            type=int,
+            default=1,
+            help='Runs of each case, the fastest is kept. Default is "1".'
+        )
+    parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Number of workers to transcode images. Default is "1".'
+        )
+    parser.add_argument(
+            '--backend',
+            choices=['thread', 'process'],
+            default='thread',
+            help='Backend of workers. Default is "thread".'
+        )
+    parser.add_argument(
+            '--jobs',
+            type=int,
+            default=1,
+            help='Number of files converted at the same time by "dir_pdf". \
+            Default is "1".'
+        )
+    parser.add_argument(
+            '--path_exec',
+            default=None,
+            help='Directory of RAR command.'
+        )
+    parser.add_argument(
+            '--output',
+            default=None,
+            help='Path of JSON file of results.'
+        )
+    parser.add_argument(
+            '--compare',
+            default=None,
+            help='Path of JSON file of results of other run, the changes are \
+            shown.'
+        )
+    parser.add_argument(
+            '--tolerance',
+            type=float,
+            default=10.0,
+            help='Loss of pages per second in percent allowed by --compare, \
+            exits with status 1 if passed. Default is "10".'
+        )
+    args = parser.parse_args()
+
+    width, height = (int(value) for value in args.size.lower().split('x'))
+    corpus_dir = args.corpus
+    temporary = corpus_dir is None
+    if temporary:
+        corpus_dir = tempfile.mkdtemp(prefix='comicpy_corpus_')
+    try:
+        corpus_file = Paths.build(corpus_dir, 'corpus.json')
+        params = {
+            'files': args.files,
+            'pages': args.pages,
+            'size': [width, height]
+        }
+        corpus = None
+        if Paths.exists(corpus_file):
+            with open(corpus_file) as file:
+                saved = json.load(file)
+            if saved['params'] == params:
+                corpus = saved['corpus']
+        if corpus is None:
+            print('Building corpus in %s ...' % corpus_dir)
+            corpus = build_corpus(
+                        directory=corpus_dir,
+                        files=args.files,
+                        pages=args.pages,
+                        size=(width, height),
+                        exec_path_rar=args.path_exec
+                    )
+            with open(corpus_file, 'w') as file:
+                json.dump({'params': params, 'corpus': corpus}, file)
+
+        options = {
+            'unit': 'mb',
+            'exec_path_rar': args.path_exec,
+            'workers': args.workers,
+            'backend': args.backend,
+            'jobs': args.jobs
+        }
+        results = run(
+                    corpus=corpus,
+                    cases=args.cases,
+                    pages=args.files * args.pages,
+                    options=options,
+                    repeat=args.repeat
+                )
+    finally:
+        if temporary:
+            shutil.rmtree(corpus_dir, ignore_errors=True)
+
+    report = {
+        'comicpy': VERSION,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'date': datetime.datetime.now().isoformat(timespec='seconds'),
+        'params': dict(params, **options),
+        'results': results
+    }
+    if args.output is not None:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+
+    if args.compare is not None:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        print('Compared with comicpy %s (%s):' % (
+                baseline['comicpy'],
+                baseline['date']
+            ))
+        regressions = compare(
+                        results=results,
+                        baseline=baseline['results'],
+                        tolerance=args.tolerance
+                    )
+        if regressions:
+            print('Slower than %.1f%%: %s' % (
+                    args.tolerance,
+                    ', '.join(regressions)
+                ))
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
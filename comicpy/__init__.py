@@ -1,40 +1,69 @@
 # -*- coding: utf-8 -*-
 """
 ComicPy app
+
+The names of the package are imported when they are used, so `import comicpy`
+does not import PyMuPDF, Pillow, rarfile or pyzipper.
 """
 
-from comicpy.comicpycontroller import ComicPy
-
-from comicpy.models import (
-    ImageComicData,
-    CurrentFile,
-    CompressorFileData
-)
-
-from comicpy.checkfile import CheckFile
-
-from comicpy.exceptionsClasses import (
-    UnitFileSizeInvalid,
-    ErrorFileBase,
-    FilePasswordProtected,
-    BadPassword,
-    InvalidFile,
-    EmptyFile,
-    ExtensionError,
-    FileExtensionNotMatch,
-    DirectoryPathNotExists,
-    DirectoryFilterEmptyFiles,
-    DirectoryEmptyFilesValid,
-    InvalidCompressor
-)
-
-from comicpy.valid_extensions import ValidExtensions
-
-from comicpy.handlers import (
-    PdfHandler,
-    ZipHandler,
-    RarHandler,
-    ImagesHandler
-)
-
-from comicpy.cli import CliComicPy
+import importlib
+
+from typing import Any, List
+
+
+# module of each name of the package.
+_LAZY_NAMES = {
+    'ComicPy': 'comicpy.comicpycontroller',
+
+    'ImageComicData': 'comicpy.models',
+    'CurrentFile': 'comicpy.models',
+    'CompressorFileData': 'comicpy.models',
+
+    'CheckFile': 'comicpy.checkfile',
+
+    'UnitFileSizeInvalid': 'comicpy.exceptionsClasses',
+    'ErrorFileBase': 'comicpy.exceptionsClasses',
+    'FilePasswordProtected': 'comicpy.exceptionsClasses',
+    'BadPassword': 'comicpy.exceptionsClasses',
+    'InvalidFile': 'comicpy.exceptionsClasses',
+    'EmptyFile': 'comicpy.exceptionsClasses',
+    'ExtensionError': 'comicpy.exceptionsClasses',
+    'FileExtensionNotMatch': 'comicpy.exceptionsClasses',
+    'DirectoryPathNotExists': 'comicpy.exceptionsClasses',
+    'DirectoryFilterEmptyFiles': 'comicpy.exceptionsClasses',
+    'DirectoryEmptyFilesValid': 'comicpy.exceptionsClasses',
+    'InvalidCompressor': 'comicpy.exceptionsClasses',
+    'InvalidEncoderProfile': 'comicpy.exceptionsClasses',
+    'ConversionCancelled': 'comicpy.exceptionsClasses',
+
+    'ValidExtensions': 'comicpy.valid_extensions',
+
+    'EncoderProfile': 'comicpy.encoderprofiles',
+    'EncoderProfiles': 'comicpy.encoderprofiles',
+
+    'PdfHandler': 'comicpy.handlers',
+    'ZipHandler': 'comicpy.handlers',
+    'RarHandler': 'comicpy.handlers',
+    'ImagesHandler': 'comicpy.handlers',
+
+    'CliComicPy': 'comicpy.cli'
+}
+
+__all__ = list(_LAZY_NAMES)
+
+
+def __getattr__(name: str) -> Any:
+    """
+    Imports a name of the package on first use.
+    """
+    if name not in _LAZY_NAMES:
+        raise AttributeError(
+            "module 'comicpy' has no attribute '%s'" % name
+        )
+    value = getattr(importlib.import_module(_LAZY_NAMES[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
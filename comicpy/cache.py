@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+"""
+Persistent cache of transcoded images.
+
+The images are stored on disk, by default in `~/comicpyData/cache`, the name
+of each entry is the hash of the original data and the parameters used to
+transcode it (resize, encoder profile, etc.). Entries are evicted by least
+recent use when the cache is larger than its size limit.
+"""
+
+from comicpy.utils import Paths
+
+from hashlib import blake2b
+from threading import Lock
+import tempfile
+import os
+
+from typing import Tuple, Union
+
+
+class TranscodeCache:
+    """
+    Class in charge of storing and loading transcoded images by content.
+    """
+    DIR = 'cache'
+    # after an eviction the cache is reduced to this fraction of the limit.
+    LOW_WATERMARK = 0.9
+
+    def __init__(
+        self,
+        path: str = None,
+        max_size: int = 2 * 10**9
+    ) -> None:
+        """
+        Constructor.
+
+        Args:
+            path: directory of cache, default is `~/comicpyData/cache`.
+            max_size: size limit of cache in bytes. Default is 2 GB.
+        """
+        if path is None:
+            path = Paths.build(Paths.ROOT_PATH, TranscodeCache.DIR)
+        self.path = Paths.build(path, make=True)
+        self.max_size = max_size
+        self.current_size = None
+        self.lock = Lock()
+
+    def key(
+        self,
+        data: bytes,
+        *parameters: str
+    ) -> str:
+        """
+        Builds the key of an entry from original data and parameters.
+
+        Args
+            data: original data of image.
+            parameters: strings with the parameters used to transcode.
+
+        Returns
+            str: hexadecimal hash.
+        """
+        hash_ = blake2b(data, digest_size=20)
+        for parameter in parameters:
+            hash_.update(b'\0')
+            hash_.update(str(parameter).encode('utf-8'))
+        return hash_.hexdigest()
+
+    def get_path(
+        self,
+        key: str,
+        mode: str
+    ) -> str:
+        """
+        Returns path of an entry, the color mode is kept in its extension.
+        """
+        return Paths.build(self.path, key[:2], '%s.%s' % (key, mode))
+
+    def get(
+        self,
+        key: str
+    ) -> Union[Tuple[bytes, str], None]:
+        """
+        Loads an entry and marks it as recently used.
+
+        Args
+            key: key of entry.
+
+        Returns
+            tuple: data and color mode of image.
+            None: if entry not exists.
+        """
+        directory = Paths.build(self.path, key[:2])
+        for mode in ('L', 'RGB'):
+            path = Paths.build(directory, '%s.%s' % (key, mode))
+            try:
+                with open(path, 'rb') as file:
+                    data = file.read()
+                os.utime(path)
+                return data, mode
+            except FileNotFoundError:
+                continue
+        return None
+
+    def put(
+        self,
+        key: str,
+        data: bytes,
+        mode: str
+    ) -> None:
+        """
+        Stores an entry, evicting the least recently used if required.
+
+        Args
+            key: key of entry.
+            data: transcoded data of image.
+            mode: color mode of image.
+        """
+        path = self.get_path(key=key, mode=mode)
+        directory = Paths.get_dirname(path)
+        Paths.check_and_create(path=directory)
+        # written apart and renamed, readers never see a partial entry. The
+        # temporary file is unique, threads can write the same key at once.
+        descriptor, path_temp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(descriptor, 'wb') as file:
+                file.write(data)
+        except BaseException:
+            Paths.remove(path=path_temp)
+            raise
+
+        with self.lock:
+            try:
+                previous = os.path.getsize(path)
+            except FileNotFoundError:
+                previous = 0
+            os.replace(path_temp, path)
+            if self.current_size is None:
+                self.current_size = self.get_cache_size()
+            else:
+                # an entry written again only changes by its difference.
+                self.current_size += len(data) - previous
+            if self.current_size > self.max_size:
+                self.evict()
+
+    def entries(self) -> list:
+        """
+        Returns the entries of the cache.
+
+        Returns
+            list: list of tuples with modification time, size and path.
+        """
+        results = []
+        for directory in os.scandir(self.path):
+            if not directory.is_dir():
+                continue
+            for entry in os.scandir(directory.path):
+                if entry.name.endswith('.tmp'):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                results.append((stat.st_mtime, stat.st_size, entry.path))
+        return results
+
+    def get_cache_size(self) -> int:
+        """
+        Returns size in bytes of all entries.
+        """
+        return sum(size for mtime, size, path in self.entries())
+
+    def evict(self) -> None:
+        """
+        Removes the least recently used entries until the size of cache is
+        under the low watermark.
+        """
+        entries = sorted(self.entries())
+        total = sum(size for mtime, size, path in entries)
+        target = self.max_size * TranscodeCache.LOW_WATERMARK
+        for mtime, size, path in entries:
+            if total <= target:
+                break
+            if Paths.remove(path=path):
+                total -= size
+        self.current_size = total
+
+    def clear(self) -> None:
+        """
+        Removes all entries.
+        """
+        with self.lock:
+            for mtime, size, path in self.entries():
+                Paths.remove(path=path)
+            self.current_size = 0
@@ -4,9 +4,12 @@ Checks files looking theris file signatures.
 """
 
 
-from comicpy.filesigns import hexSignsDict
+from comicpy.filesigns import HEADER_SIZE, fileSigns, extensionsTypes
 
-from typing import Union, TypeVar
+from concurrent.futures import ThreadPoolExecutor
+import os
+
+from typing import Dict, Iterable, Union, TypeVar
 
 CurrentFile = TypeVar('CurrentFile')
 
@@ -14,8 +17,11 @@ CurrentFile = TypeVar('CurrentFile')
 class CheckFile:
     """
     Class in charge of checking if the given file is valid based on its
-    signature and extension.
+    signature and extension, and of detecting the type of files from their
+    first bytes.
     """
+    # bytes of the signature, read from the start of file.
+    HEADER_SIZE = HEADER_SIZE
 
     def check(
         self,
@@ -29,69 +35,163 @@ class CheckFile:
 
         Returns:
             bool: `True` if file is valid, otherwise `False`.
+            None: if the extension has no signature.
+        """
+        return self.match(
+                    extension=currenf_file.extension,
+                    chunk_bytes=currenf_file.chunk_bytes
+                )
+
+    def check_header(
+        self,
+        filename: str
+    ) -> Union[bool, None]:
+        """
+        Checks if file is valid reading only its first bytes.
+
+        Args:
+            filename: path of file, its extension indicates the signature.
+
+        Returns:
+            bool: `True` if file is valid, otherwise `False`, also if it is
+                  empty or does not exist.
+            None: if the extension has no signature.
+        """
+        chunk_bytes = self.read_header(filename=filename)
+        if not chunk_bytes:
+            return False
+        return self.match(
+                    extension=os.path.splitext(filename)[1],
+                    chunk_bytes=chunk_bytes
+                )
+
+    def match(
+        self,
+        extension: str,
+        chunk_bytes: bytes
+    ) -> Union[bool, None]:
+        """
+        Compares the type detected from the first bytes of a file with the
+        type of its extension.
+
+        Args:
+            extension: extension of file.
+            chunk_bytes: first bytes of file.
+
+        Returns:
+            bool: `True` if the types match, otherwise `False`.
+            None: if the extension has no signature.
+        """
+        file_type = self.get_extension_type(extension=extension)
+        if file_type is None:
+            return None
+        return self.detect(chunk_bytes=chunk_bytes) == file_type
 
-        Raises:
-            KeyError: if the file extension is not valid with respect to its
-                      signature.
+    def get_extension_type(
+        self,
+        extension: str
+    ) -> Union[str, None]:
+        """
+        Returns the type of file of an extension, 'cbz' is 'zip', 'cbr' is
+        'rar', 'jpg' is 'jpeg'.
+
+        Args:
+            extension: extension of file, with or without dot.
+
+        Returns:
+            str: type of file.
+            None: if the extension has no signature.
+        """
+        return extensionsTypes.get((extension or '').lstrip('.').lower())
+
+    def detect(
+        self,
+        chunk_bytes: bytes
+    ) -> Union[str, None]:
+        """
+        Detects the type of a file comparing its first bytes with the
+        signatures, 'pdf', 'zip', 'rar', 'jpeg', 'png' or 'webp'.
+
+        Args:
+            chunk_bytes: first bytes of file, `HEADER_SIZE` are enough.
+
+        Returns:
+            str: type of file.
+            None: if no signature matches.
+        """
+        if not chunk_bytes:
+            return None
+        chunk_bytes = bytes(chunk_bytes[:HEADER_SIZE])
+        for file_type, signatures in fileSigns.items():
+            for signature in signatures:
+                if all(
+                    chunk_bytes.startswith(part, offset)
+                    for offset, part in signature
+                ):
+                    return file_type
+        return None
+
+    def read_header(
+        self,
+        filename: str
+    ) -> Union[bytes, None]:
+        """
+        Reads the first `HEADER_SIZE` bytes of a file.
+
+        Args:
+            filename: path of file.
+
+        Returns:
+            bytes: first bytes of file.
+            None: if the file can not be read.
         """
         try:
-            extension = currenf_file.extension.replace('.', '')
-            if extension == 'cbr':
-                extension_file = 'rar'
-            elif extension == 'cbz':
-                extension_file = 'zip'
-            else:
-                extension_file = extension
-            data = hexSignsDict[extension_file]
-        except KeyError:
+            with open(filename, 'rb') as file:
+                return file.read(HEADER_SIZE)
+        except OSError:
             return None
 
-        # print(data)
-
-        match_bool = False
-        list_hexsigns = data['hexsigns']
-        byteoffet = data['byteoffet']
-        hexsign_file = self.to_hexsign(raw_data=currenf_file.chunk_bytes)
-        # print(hexsign_file)
-
-        string_hexsign_file = ' '.join(hexsign_file)
-
-        for hexsign in list_hexsigns:
-            tuple_hexsigns = tuple(zip(hexsign.split(' '), hexsign_file))
-            result_bools = [i[0] == i[1] for i in tuple_hexsigns]
-            falses = result_bools.count(False)
-            # print(string_hexsign_file, falses)
-            if 0 <= falses < 2:
-                # print(hexsign, string_hexsign_file)
-                match_bool = True
-                break
-            elif falses == 1:
-                print('---> ', hexsign, '--', string_hexsign_file)
-        return match_bool
-
-    def to_hexsign(
+    def detect_file(
+        self,
+        filename: str
+    ) -> Union[str, None]:
+        """
+        Detects the type of a file reading only its first bytes.
+
+        Args:
+            filename: path of file.
+
+        Returns:
+            str: type of file, see `detect`.
+            None: if no signature matches or the file can not be read.
+        """
+        return self.detect(chunk_bytes=self.read_header(filename=filename))
+
+    def classify(
         self,
-        raw_data: bytes
-    ) -> list:
+        filenames: Iterable[str],
+        workers: int = 8
+    ) -> Dict[str, Union[str, None]]:
         """
-        Builds the hexadecimal sign from a byte chunk of the file.
+        Detects the type of many files, their headers are read in parallel
+        threads.
 
         Args:
-            raw_data: bytes of file content.
+            filenames: paths of files.
+            workers: number of threads reading headers. Default is `8`.
 
         Returns:
-            list: list of strings with the hexadecimal sign.
-        """
-        hexsign = ''
-        hex_signs_list = []
-        for i_byte in raw_data:
-            ahex = hex(i_byte)[2:]
-            if ahex.isnumeric():
-                ahex = '%02d' % int(ahex)
-            hexsign += ahex.upper()
-        for x in range(0, len(hexsign), 2):
-            if x > 12:
-                hex_signs_list.append(hexsign[x - 1:])
-            else:
-                hex_signs_list.append(hexsign[x:x + 2])
-        return hex_signs_list
+            dict: type of file by path, `None` for unknown files, in the
+                  order of `filenames`.
+        """
+        filenames = list(filenames)
+        if len(filenames) == 0:
+            return {}
+        with ThreadPoolExecutor(
+            max_workers=min(workers, len(filenames))
+        ) as executor:
+            types = executor.map(
+                        lambda filename: self.detect_file(filename=filename),
+                        filenames
+                    )
+            return dict(zip(filenames, types))
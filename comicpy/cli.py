@@ -4,21 +4,38 @@ CLI comicpy
 """
 
 import argparse
+import contextlib
 import sys
+import os
 
-from comicpy.comicpycontroller import ComicPy
-from comicpy.utils import Paths
+from comicpy.encoderprofiles import EncoderProfiles
+from comicpy.profiling import (
+    PROFILERS,
+    profile_file,
+    start_profiling,
+    stop_profiling
+)
+from comicpy.utils import (
+    Paths,
+    SizeUnits
+)
 from comicpy.version import VERSION
 
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from comicpy.comicpycontroller import ComicPy
+
 
 def pdf(
-    comicInstance: ComicPy,
+    comicInstance: 'ComicPy',
     filename: str,
     compressor: str,
     # dest: str,
     check: bool,
     resize: str = 'preserve',
-    motor: str = 'pymupdf'
+    motor: str = 'pymupdf',
+    check_level: str = 'header'
 ) -> None:
     """
     Function for PDF file.
@@ -31,20 +48,21 @@ def pdf(
                     # dest=dest
                 )
     if data is not None and check is True:
-        for item in data:
-            comicInstance.check_integrity(
-                    filename=item['name'],
-                    show=True
+        comicInstance.check_integrity_batch(
+                    filenames=[item['name'] for item in data],
+                    show=True,
+                    level=check_level
                 )
 
 
 def rar(
-    comicInstance: ComicPy,
+    comicInstance: 'ComicPy',
     filename: str,
     # dest: str,
     check: bool,
     password: str,
-    resize: str = 'preserve'
+    resize: str = 'preserve',
+    check_level: str = 'header'
 ) -> None:
     """
     Function for RAR file.
@@ -56,20 +74,21 @@ def rar(
                     # dest=dest
                 )
     if data is not None and check is True:
-        for item in data:
-            comicInstance.check_integrity(
-                    filename=item['name'],
-                    show=True
+        comicInstance.check_integrity_batch(
+                    filenames=[item['name'] for item in data],
+                    show=True,
+                    level=check_level
                 )
 
 
 def zip(
-    comicInstance: ComicPy,
+    comicInstance: 'ComicPy',
     filename: str,
     # dest: str,
     check: bool,
     password: str,
-    resize: str = 'preserve'
+    resize: str = 'preserve',
+    check_level: str = 'header'
 ) -> None:
     """
     Function for ZIP file.
@@ -81,15 +100,73 @@ def zip(
                     # dest=dest
                 )
     if data is not None and check is True:
-        for item in data:
+        comicInstance.check_integrity_batch(
+                    filenames=[item['name'] for item in data],
+                    show=True,
+                    level=check_level
+                )
+
+
+def stream(
+    comicInstance: 'ComicPy',
+    filename: str,
+    output: str,
+    compressor: str,
+    check: bool,
+    password: str,
+    resize: str = 'preserve',
+    check_level: str = 'header'
+) -> None:
+    """
+    Function for PDF, RAR, ZIP files written as a CBZ stream to a file or,
+    with "-", to stdout, the messages go to stderr.
+    """
+    if compressor != 'zip':
+        print("\n'--output' writes only CBZ files.\n", file=sys.stderr)
+        return
+
+    stdout_fd = None
+    if output == '-':
+        # the CBZ file is written to a copy of stdout, anything printed
+        # meanwhile, also by libraries, goes to stderr.
+        sys.stdout.flush()
+        stdout_fd = os.dup(sys.stdout.fileno())
+        os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+        sink = os.fdopen(os.dup(stdout_fd), 'wb')
+        messages = contextlib.redirect_stdout(sys.stderr)
+    else:
+        sink = open(output, 'wb')
+        messages = contextlib.nullcontext()
+
+    try:
+        with messages, open(filename, 'rb') as source:
+            data = comicInstance.process_stream(
+                            source=source,
+                            sink=sink,
+                            filename=filename,
+                            password=password,
+                            resize=resize
+                        )
+    finally:
+        sink.close()
+        if stdout_fd is not None:
+            sys.stdout.flush()
+            os.dup2(stdout_fd, sys.stdout.fileno())
+            os.close(stdout_fd)
+
+    if data is not None and check is True:
+        if output == '-':
+            print('Output to stdout can not be checked.', file=sys.stderr)
+        else:
             comicInstance.check_integrity(
-                        filename=item['name'],
-                        show=True
+                        filename=output,
+                        show=True,
+                        level=check_level
                     )
 
 
 def dir(
-    comicInstance: ComicPy,
+    comicInstance: 'ComicPy',
     directory_path: str,
     extension_filter: str,
     # dest: str,
@@ -99,7 +176,12 @@ def dir(
     join: bool = False,
     check: bool = False,
     resize: str = 'preserve',
-    motor: str = 'pymupdf'
+    motor: str = 'pymupdf',
+    incremental: bool = False,
+    jobs: int = 1,
+    check_level: str = 'header',
+    dedupe: str = None,
+    dedupe_index: str = None
 ) -> None:
     """
     Function for directories.
@@ -110,17 +192,21 @@ def dir(
                     compressor=compressor,
                     join=join,
                     password=password,
-                    resize=resize
+                    resize=resize,
+                    incremental=incremental,
+                    jobs=jobs,
+                    dedupe=dedupe,
+                    dedupe_index=dedupe_index
                     # motor=motor
                     # dest=dest
                 )
     # print('--> ', data)
     if data is not None and check is True:
-        for item in data:
-            comicInstance.check_integrity(
-                        filename=item['name'],
-                        show=True
-                    )
+        comicInstance.check_integrity_batch(
+                    filenames=[item['name'] for item in data],
+                    show=True,
+                    level=check_level
+                )
 
 
 def CliComicPy() -> None:
@@ -143,6 +229,13 @@ def CliComicPy() -> None:
             '--path',
             help='Path of file or directory.'
         )
+    main_parser.add_argument(
+            '-o',
+            '--output',
+            default=None,
+            help='Path of CBZ file written as a stream, "-" writes it to \
+            stdout and the messages to stderr. Only for files.'
+        )
     main_parser.add_argument(
             '--filter',
             choices=['pdf', 'rar', 'zip', 'cbr', 'cbz', 'images'],
@@ -163,6 +256,14 @@ def CliComicPy() -> None:
             default=False,
             help='Check the CBR or CBZ files created.',
         )
+    main_parser.add_argument(
+            '--check_level',
+            choices=['header', 'structure', 'decode'],
+            default='header',
+            help='Level of "--check": "header" compares the file signature, \
+            "structure" also checks the archive and the CRC of its files, \
+            "decode" also decodes every image. Default is "header".',
+        )
     main_parser.add_argument(
             '--join',
             default=False,
@@ -192,6 +293,134 @@ def CliComicPy() -> None:
             default=None,
             help='Path of RAR executable.'
         )
+    main_parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Number of workers to transcode images. Default is "1".'
+        )
+    main_parser.add_argument(
+            '--backend',
+            choices=['thread', 'process'],
+            default='thread',
+            help='Type of workers to transcode images. Default is "thread".'
+        )
+    main_parser.add_argument(
+            '--profile',
+            choices=list(EncoderProfiles.keys()),
+            default='original',
+            help='Encoder profile of images. Default is "original".'
+        )
+    main_parser.add_argument(
+            '--page_budget',
+            type=int,
+            default=None,
+            help='Maximum size in bytes of each image, JPEG and WEBP images \
+            use the highest quality that fits.'
+        )
+    main_parser.add_argument(
+            '--cache',
+            default=False,
+            action='store_true',
+            help='Keeps transcoded images in a cache, "~/comicpyData/cache", \
+            unchanged images are not transcoded again.'
+        )
+    main_parser.add_argument(
+            '--cache_size',
+            type=int,
+            default=2000,
+            help='Size limit of cache in MB. Default is "2000".'
+        )
+    main_parser.add_argument(
+            '--rgb',
+            default=False,
+            action='store_true',
+            help='Converts all images to RGB, black and white images are kept \
+            in grayscale by default.'
+        )
+    main_parser.add_argument(
+            '--near_duplicates',
+            type=int,
+            default=None,
+            help='Drops the pages whose perceptual hash differs in at most \
+            this number of bits, from 0 to 64, from a page already written to \
+            the same CBZ or CBR file.'
+        )
+    main_parser.add_argument(
+            '--prefetch',
+            type=int,
+            default=2,
+            help='Number of files or images read ahead while the current one \
+            is converted, "0" disables it. Default is "2".'
+        )
+    main_parser.add_argument(
+            '--memory_limit',
+            type=int,
+            default=None,
+            help='Maximum size in MB of images in memory, the extraction \
+            waits while it is passed. With "--jobs", it is divided between \
+            the worker processes.'
+        )
+    main_parser.add_argument(
+            '--jobs',
+            type=int,
+            default=1,
+            help='Number of files of directory converted at the same time. \
+            Default is "1".'
+        )
+    main_parser.add_argument(
+            '--incremental',
+            default=False,
+            action='store_true',
+            help='Skips files of directory not changed since the last \
+            conversion.'
+        )
+    main_parser.add_argument(
+            '--dedupe',
+            choices=['report', 'link'],
+            default=None,
+            help='Converts each distinct content of directory only once, \
+            the duplicates are reported, with "link" their outputs are \
+            links to the outputs of the original.'
+        )
+    main_parser.add_argument(
+            '--dedupe_index',
+            default=None,
+            help='Path of index of hashes of "--dedupe", kept between runs. \
+            Default is "~/comicpyData/dedupe_index.json".'
+        )
+    main_parser.add_argument(
+            '--metrics_file',
+            default=None,
+            help='Writes the time, calls and bytes by stage of conversion to \
+            a file, in the Prometheus text format.'
+        )
+    main_parser.add_argument(
+            '--trace',
+            default=None,
+            help='Writes the spans of files, pages, images and writers to a \
+            file, in the Chrome Trace Event format.'
+        )
+    main_parser.add_argument(
+            '--profiler',
+            choices=list(PROFILERS),
+            default=None,
+            help='Profiles the run, "cpu" with cProfile, "mem" with \
+            tracemalloc, and prints a summary.'
+        )
+    main_parser.add_argument(
+            '--profiler_file',
+            default=None,
+            help='Path of profile, "comicpy.pstats" for "cpu" and \
+            "comicpy.tracemalloc" for "mem" by default.'
+        )
+    main_parser.add_argument(
+            '--profiler_top',
+            type=int,
+            default=20,
+            help='Number of functions or allocation sites of the summary of \
+            the profile. Default is "20".'
+        )
     main_parser.add_argument(
             '--progress',
             default=False,
@@ -209,65 +438,129 @@ def CliComicPy() -> None:
     args = main_parser.parse_args()
     typeFile = args.type
     pathFile = args.path
+    output = args.output
     filterFile = args.filter
     compressorFile = args.compressor
     checkFile = args.check
+    checkLevel = args.check_level
     unitFile = args.unit
     joinFile = args.join
     password = args.password
     resizeImage = args.resize
     path_exec = args.path_exec
     progress = args.progress
-    version = args.version
+    workers = args.workers
+    backend = args.backend
+    rgb = args.rgb
+    near_duplicates = args.near_duplicates
+    profile = args.profile
+    page_budget = args.page_budget
+    cache = args.cache
+    cache_size = args.cache_size
+    incremental = args.incremental
+    dedupe = args.dedupe
+    dedupe_index = args.dedupe_index
+    jobs = args.jobs
+    prefetch = args.prefetch
+    memory_limit = args.memory_limit
+    metrics_file = args.metrics_file
+    trace = args.trace
+    profiler_mode = args.profiler
+    profiler_file = args.profiler_file
+    if profiler_mode is not None and profiler_file is None:
+        profiler_file = 'comicpy%s' % PROFILERS[profiler_mode].EXTENSION
+    if memory_limit is not None:
+        memory_limit *= SizeUnits['mb']
+    if args.version:
+        print(f"\ncomicpy version: {VERSION}\n")
+        return
+
+    # the backends are imported with the controller.
+    from comicpy.comicpycontroller import ComicPy
+
+    profiler = None
+    if profiler_mode is not None:
+        profiler = start_profiling(
+                        mode=profiler_mode,
+                        path=profiler_file,
+                        top=args.profiler_top
+                    )
 
     # Instance
     comic = ComicPy(
                 unit=unitFile,
                 exec_path_rar=path_exec,
-                show_progress=progress
+                show_progress=progress,
+                workers=workers,
+                backend=backend,
+                grayscale=not rgb,
+                profile=profile,
+                page_budget=page_budget,
+                cache=cache,
+                cache_size=cache_size * SizeUnits['mb'],
+                prefetch=prefetch,
+                memory_limit=memory_limit,
+                trace=trace,
+                near_duplicates=near_duplicates
             )
     try:
-        if version:
-            print(f"\ncomicpy version: {VERSION}\n")
         # FILE
-        elif typeFile == 'f':
+        if typeFile == 'f':
 
             if pathFile is None:
                 print("\nNeeds '--path' parameter of the file.\n")
                 return
 
-            name_, extension_ = Paths.splitext(pathFile)
-            if extension_.lower() == '.pdf':
-                pdf(
-                    comicInstance=comic,
-                    filename=pathFile,
-                    compressor=compressorFile,
-                    check=checkFile,
-                    resize=resizeImage
-                )
-            if extension_.lower() == '.rar' or extension_.lower() == '.cbr':
-                rar(
-                    comicInstance=comic,
-                    filename=pathFile,
-                    check=checkFile,
-                    password=password,
-                    resize=resizeImage
-                )
+            with profile_file(filename=pathFile):
+                name_, extension_ = Paths.splitext(pathFile)
+                if output is not None:
+                    stream(
+                        comicInstance=comic,
+                        filename=pathFile,
+                        output=output,
+                        compressor=compressorFile,
+                        check=checkFile,
+                        check_level=checkLevel,
+                        password=password,
+                        resize=resizeImage
+                    )
+                elif extension_.lower() == '.pdf':
+                    pdf(
+                        comicInstance=comic,
+                        filename=pathFile,
+                        compressor=compressorFile,
+                        check=checkFile,
+                        check_level=checkLevel,
+                        resize=resizeImage
+                    )
+                elif extension_.lower() in ('.rar', '.cbr'):
+                    rar(
+                        comicInstance=comic,
+                        filename=pathFile,
+                        check=checkFile,
+                        check_level=checkLevel,
+                        password=password,
+                        resize=resizeImage
+                    )
 
-            if extension_.lower() == '.zip' or extension_.lower() == '.cbz':
-                zip(
-                    comicInstance=comic,
-                    filename=pathFile,
-                    check=checkFile,
-                    password=password,
-                    resize=resizeImage
-                )
+                elif extension_.lower() in ('.zip', '.cbz'):
+                    zip(
+                        comicInstance=comic,
+                        filename=pathFile,
+                        check=checkFile,
+                        check_level=checkLevel,
+                        password=password,
+                        resize=resizeImage
+                    )
 
         # DIRECTORY
         elif typeFile == 'd':
             if pathFile is None:
                 print("\nNeeds '--path' parameter of the file.\n")
                 return
+            if output is not None:
+                print("\n'--output' is only for files.\n")
+                return
 
             dir(
                 comicInstance=comic,
@@ -277,12 +570,36 @@ def CliComicPy() -> None:
                 compressor=compressorFile,
                 join=joinFile,
                 check=checkFile,
-                resize=resizeImage
+                check_level=checkLevel,
+                resize=resizeImage,
+                incremental=incremental,
+                dedupe=dedupe,
+                dedupe_index=dedupe_index,
+                jobs=jobs
             )
 
+        messages = sys.stderr if output == '-' else sys.stdout
+        if progress and comic.imageshandler.stats['images'] > 0:
+            print(comic.imageshandler.report(), file=messages)
+        if progress and comic.iostats.stats['files'] > 0:
+            print(comic.iostats.report(), file=messages)
+        if progress and comic.budget.stats['peak'] > 0:
+            print(comic.budget.report(), file=messages)
+        if progress and comic.metrics.stages:
+            print(comic.metrics.report(), file=messages)
+        if metrics_file is not None:
+            comic.metrics.write_prometheus(path=metrics_file)
+        if profiler is not None:
+            stop_profiling()
+            print(profiler.report(), file=messages)
+            print('Profile written to: %s' % profiler.path, file=messages)
+
     except KeyboardInterrupt:
         print('Interrumped by user.')
         sys.exit(1)
+    finally:
+        stop_profiling()
+        comic.close()
 
 
 if __name__ == '__main__':
@@ -13,16 +13,19 @@ the current location when running this program.
 
 from comicpy.models import (
     CurrentFile,
-    CompressorFileData
+    CompressorFileData,
+    ImageComicData
 )
 
 from comicpy.checkfile import CheckFile
 from comicpy.utils import (
+    SizeUnits,
     Paths,
     VarEnviron
 )
 
 from comicpy.exceptionsClasses import (
+    ErrorFileBase,
     InvalidFile,
     EmptyFile,
     FileExtensionNotMatch,
@@ -36,17 +39,61 @@ from comicpy.exceptionsClasses import (
 )
 
 from comicpy.valid_extensions import ValidExtensions
-
-from comicpy.handlers import (
-    PdfHandler,
-    ZipHandler,
-    RarHandler,
-    DirectoryHandler
+from comicpy.encoderprofiles import EncoderProfile
+from comicpy.cache import TranscodeCache
+from comicpy.manifest import ConversionManifest
+from comicpy.dedupe import DuplicateIndex
+from comicpy.prefetcher import Prefetcher, IOStats
+from comicpy.streams import CBZWriter
+from comicpy.memorybudget import MemoryBudget
+from comicpy.metrics import Metrics
+from comicpy.tracing import (
+    TRACE_ENV,
+    get_tracer,
+    start_tracing,
+    start_worker_tracing,
+    span,
+    traced
+)
+from comicpy.profiling import profile_file
+from comicpy.context import (
+    ConversionContexts,
+    ContextAttribute,
+    conversion
 )
 
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from collections import deque
+import functools
+import importlib
+import threading
+import asyncio
+import queue
+import weakref
 import io
+import os
+
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Tuple,
+    TypeVar,
+    Literal,
+    Union
+)
 
-from typing import List, TypeVar, Literal, Union
+if TYPE_CHECKING:
+    from comicpy.handlers import (
+        PdfHandler,
+        ZipHandler,
+        RarHandler,
+        DirectoryHandler
+    )
 
 
 class ComicPy:
@@ -55,36 +102,197 @@ class ComicPy:
     verifying, extracting images, saving to final `CBZ` or `CBR` file.
     """
     PATH_CONVERTED_ = 'Converted_comicpy'
+    # module and class of handlers, they are imported and created when they
+    # are used, with their backends (PyMuPDF, rarfile, pyzipper).
+    HANDLERS = {
+        'directory': ('comicpy.handlers.directoryhandler', 'DirectoryHandler'),
+        'zip': ('comicpy.handlers.ziphandler', 'ZipHandler'),
+        'pdf': ('comicpy.handlers.pdfhandler', 'PdfHandler'),
+        'rar': ('comicpy.handlers.rarhandler', 'RarHandler')
+    }
+    # extensions of the inputs of `process_dir`, except images.
+    COMIC_EXTENSIONS = ('.pdf', '.cbz', '.cbr', '.zip', '.rar')
+    # levels of `check_integrity`, from the fastest to the most complete.
+    CHECK_LEVELS = ('header', 'structure', 'decode')
+    # state of the conversion of the current thread, one instance can run
+    # conversions in several threads.
+    directory_path = ContextAttribute('directory_path')
+    filename = ContextAttribute('filename')
+    join_files = ContextAttribute('join_files')
+    BASE_DIR_ = ContextAttribute('BASE_DIR_')
+    CONVERTED_COMICPY_PATH_ = ContextAttribute('CONVERTED_COMICPY_PATH_')
+    FILE_CBR_CBZ_ = ContextAttribute('FILE_CBR_CBZ_')
+    LAST_ITEM_ = ContextAttribute('LAST_ITEM_')
+    prefetcher = ContextAttribute('prefetcher')
 
     def __init__(
         self,
         unit: Literal['b', 'kb', 'mb', 'gb'] = 'mb',
         exec_path_rar: str = None,
-        show_progress: bool = False
+        show_progress: bool = False,
+        workers: int = 1,
+        backend: Literal['thread', 'process'] = 'thread',
+        grayscale: bool = True,
+        profile: Union[str, EncoderProfile] = 'original',
+        page_budget: int = None,
+        cache: bool = False,
+        cache_size: int = 2 * 10**9,
+        cache_path: str = None,
+        prefetch: int = 2,
+        concurrency: int = 4,
+        memory_limit: int = None,
+        trace: Union[str, bool] = None,
+        near_duplicates: int = None
     ) -> None:
         """
         Constructor.
 
         Args:
             unit: indicate unit of measure using to represent file size.
+            exec_path_rar: path of RAR executable.
+            show_progress: boolean to show the file in progress.
+            workers: number of workers used to transcode images, `None` uses
+                     the number of CPUs. Default is `1`.
+            backend: type of workers used to transcode images, 'thread' or
+                     'process'. Default is 'thread'.
+            grayscale: `True` to keep black and white images in grayscale,
+                       `False` to convert all images to RGB. Default is `True`.
+            profile: name of encoder profile, 'original', 'high', 'balanced',
+                     'small', 'fast', or `EncoderProfile` instance. Default is
+                     'original'.
+            page_budget: maximum size in bytes of each image, the highest
+                         quality that fits is searched. Default is `None`.
+            cache: `True` to keep transcoded images in a persistent cache, so
+                   unchanged images are not transcoded again. Default is
+                   `False`.
+            cache_size: size limit of cache in bytes. Default is 2 GB.
+            cache_path: directory of cache. Default is
+                        `~/comicpyData/cache`.
+            prefetch: number of files of a directory, or images, read ahead
+                      in background threads while the current one is
+                      converted, `0` disables it, the data read ahead
+                      counts in `memory_limit`. Default is `2`.
+            concurrency: maximum number of conversions run at the same time
+                         by the async methods, `aprocess_pdf`, etc. Default
+                         is `4`.
+            memory_limit: maximum number of bytes of images in flight, shared
+                          by the conversions of the instance, the extraction
+                          waits while it is passed. With `jobs`, it is
+                          divided between the worker processes. Default is
+                          `None`, no limit.
+            trace: path of file where the spans of conversions are written
+                   in the Chrome Trace Event format, when the instance is
+                   closed or the process exits. By default the environment
+                   variable `COMICPY_TRACE`, `False` disables tracing.
+            near_duplicates: maximum Hamming distance, from 0 to 64 bits,
+                             between the perceptual hashes of two pages of an
+                             output to drop the second one, so repeated
+                             credit pages or ads are written once. Default is
+                             `None`, all pages are kept.
         """
         VarEnviron.setup(path_exec=exec_path_rar)
+        if trace is None:
+            trace = os.environ.get(TRACE_ENV)
+        self.tracer = start_tracing(path=trace) if trace else None
+        self.exec_path_rar = exec_path_rar
         self.unit = self.__validating_unit(unit=unit)
         self.show_progress = show_progress
-        self.directory_path = None
-        self.filename = None
+        # bytes of images in flight, metrics of stages of all conversions,
+        # and state of conversions by thread.
+        self.budget = MemoryBudget(limit=memory_limit)
+        self.metrics = Metrics()
+        self.contexts = ConversionContexts(
+                                budget=self.budget,
+                                metrics=self.metrics
+                            )
         self.checker = CheckFile()
-        self.directoryhandler = DirectoryHandler(unit=self.unit)
-        self.ziphandler = ZipHandler(unit=self.unit)
-        self.pdfphandler = PdfHandler(unit=self.unit)
-        self.rarhandler = RarHandler(unit=self.unit)
+        self.prefetch = prefetch
+        self.iostats = IOStats()
+        # Pillow is imported with the first instance, not with the module.
+        from comicpy.handlers.imageshandler import ImagesHandler
+        self.imageshandler = ImagesHandler(
+                                workers=workers,
+                                backend=backend,
+                                grayscale=grayscale,
+                                profile=profile,
+                                page_budget=page_budget,
+                                cache=TranscodeCache(
+                                        path=cache_path,
+                                        max_size=cache_size
+                                    ) if cache else None,
+                                near_duplicates=near_duplicates
+                            )
+        # handlers created, by name of `HANDLERS`.
+        self.handlers = {}
+        self.handlers_lock = threading.Lock()
         self.validextentions = ValidExtensions()
 
-        self.join_files = False
-        self.BASE_DIR_ = None
-        self.CONVERTED_COMICPY_PATH_ = None
-        self.FILE_CBR_CBZ_ = None
-        self.LAST_ITEM_ = False
+        if concurrency < 1:
+            raise ValueError('"concurrency" must be greater than 0.')
+        self.concurrency = concurrency
+        self.async_executor = None
+        # semaphores of async methods, by event loop.
+        self.semaphores = weakref.WeakKeyDictionary()
+
+    @property
+    def last_stats(self) -> Union[Metrics, None]:
+        """
+        `Metrics` of the last conversion of the current thread, the time,
+        calls and bytes in and out of its stages.
+        """
+        return self.contexts.last_stats
+
+    def get_handler(
+        self,
+        name: str
+    ) -> Union[
+            'DirectoryHandler', 'PdfHandler', 'RarHandler', 'ZipHandler'
+        ]:
+        """
+        Returns a handler, it is imported and created on first use.
+
+        Args
+            name: name of handler, 'directory', 'zip', 'pdf' or 'rar'.
+
+        Returns
+            DirectoryHandler, PdfHandler, RarHandler, ZipHandler: handler.
+        """
+        handler = self.handlers.get(name)
+        if handler is not None:
+            return handler
+        with self.handlers_lock:
+            if name not in self.handlers:
+                module, class_name = ComicPy.HANDLERS[name]
+                Handler = getattr(importlib.import_module(module), class_name)
+                options = {}
+                if name == 'directory':
+                    options = {
+                        'prefetch': self.prefetch,
+                        'iostats': self.iostats
+                    }
+                self.handlers[name] = Handler(
+                                        unit=self.unit,
+                                        imageshandler=self.imageshandler,
+                                        contexts=self.contexts,
+                                        **options
+                                    )
+            return self.handlers[name]
+
+    @property
+    def directoryhandler(self) -> 'DirectoryHandler':
+        return self.get_handler(name='directory')
+
+    @property
+    def ziphandler(self) -> 'ZipHandler':
+        return self.get_handler(name='zip')
+
+    @property
+    def pdfphandler(self) -> 'PdfHandler':
+        return self.get_handler(name='pdf')
+
+    @property
+    def rarhandler(self) -> 'RarHandler':
+        return self.get_handler(name='rar')
 
     def __validating_unit(
         self,
@@ -126,19 +334,61 @@ class ComicPy:
         """
         if filename is None:
             return None
-        with open(filename, 'rb') as file:
-            file.seek(0)
-            data = file.read()
-            if len(data) == 0:
-                file.close()
-                raise EmptyFile()
-
-            currentFile = CurrentFile(
-                            filename=filename,
-                            bytes_data=io.BytesIO(data),
-                            chunk_bytes=data[:8],
-                            unit=self.unit
-                        )
+        with self.contexts.context.timer(stage='read') as record:
+            if self.prefetcher is not None:
+                # read ahead while the previous file was converted.
+                data = self.prefetcher.get(path=filename)
+            else:
+                with open(filename, 'rb') as file:
+                    file.seek(0)
+                    data = file.read()
+            record['bytes_in'] = record['bytes_out'] = len(data)
+        return self.new_current_file(filename=filename, data=data)
+
+    def read_stream(
+        self,
+        source: Union[bytes, bytearray, memoryview, BinaryIO],
+        filename: str
+    ) -> CurrentFile:
+        """
+        Read content of bytes or a file-like object, without using the disk.
+
+        Args:
+            source: bytes or readable file-like object with the data of file.
+            filename: name of file, its extension indicates the type of file.
+
+        Returns:
+            Returns `CurrentFile` object with data of file.
+
+        Raises:
+            EmptyFile: if data is empty.
+        """
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            data = bytes(source)
+        else:
+            data = source.read()
+        return self.new_current_file(filename=filename, data=data)
+
+    def new_current_file(
+        self,
+        filename: str,
+        data: bytes
+    ) -> CurrentFile:
+        """
+        Creates `CurrentFile` instance with data of a file.
+
+        Raises:
+            EmptyFile: if data is empty.
+        """
+        if len(data) == 0:
+            raise EmptyFile()
+
+        currentFile = CurrentFile(
+                        filename=filename,
+                        bytes_data=io.BytesIO(data),
+                        chunk_bytes=data[:CheckFile.HEADER_SIZE],
+                        unit=self.unit
+                    )
         return currentFile
 
     def check_file(
@@ -158,7 +408,11 @@ class ComicPy:
             FileExtensionNotMatch: if file extension of file is not valid.
             InvalidFile: if file extension and file signature not match.
         """
-        is_valid = self.checker.check(currenf_file=currentFile)
+        with self.contexts.context.timer(
+            stage='check',
+            bytes_in=len(currentFile.chunk_bytes or b'')
+        ):
+            is_valid = self.checker.check(currenf_file=currentFile)
         # print('-> check_file ', is_valid)
         if is_valid is False:
             raise FileExtensionNotMatch()
@@ -189,17 +443,21 @@ class ComicPy:
 
     def load_file(
         self,
-        filename: str
-    ) -> bytes:
+        filename: str,
+        currentFile: CurrentFile = None
+    ) -> CurrentFile:
         """
-        Load file given, sets attributes `filename`, `currentFile`.
+        Load file given, sets attributes `filename`, `currentFile`. If
+        `currentFile` is given, the file is not read.
         """
         self.filename = filename
+        if currentFile is not None:
+            return currentFile
         return self.read(filename=self.filename)
 
     def check_protectedFile(
         self,
-        handler: Union[RarHandler, ZipHandler],
+        handler: Union['RarHandler', 'ZipHandler'],
         compressCurrentFile: CurrentFile,
         password: str = None
     ) -> bool:
@@ -219,10 +477,18 @@ class ComicPy:
             FilePasswordProtected: if `password` parameters and `is_protected`
                                    are `True`s.
         """
-        if handler.type == ValidExtensions.ZIP[1:]:
-            is_protected = handler.testZip(currentFileZip=compressCurrentFile)
-        if handler.type == ValidExtensions.RAR[1:]:
-            is_protected = handler.testRar(currentFileRar=compressCurrentFile)
+        with self.contexts.context.timer(
+            stage='protection',
+            bytes_in=compressCurrentFile.bytes_data.getbuffer().nbytes
+        ):
+            if handler.type == ValidExtensions.ZIP[1:]:
+                is_protected = handler.testZip(
+                                    currentFileZip=compressCurrentFile
+                                )
+            if handler.type == ValidExtensions.RAR[1:]:
+                is_protected = handler.testRar(
+                                    currentFileRar=compressCurrentFile
+                                )
         if is_protected and password is None:
             msg = 'File %s is protected with password.\n' % (
                                 handler.type.upper()
@@ -232,6 +498,8 @@ class ComicPy:
             return True
         return False
 
+    @traced()
+    @conversion
     def process_pdf(
         self,
         filename: str,
@@ -241,7 +509,8 @@ class ComicPy:
         motor: Literal['pymupdf'] = 'pymupdf'
     ) -> Union[List[dict], None]:
         """
-        Process PDF file, load content, extract images.
+        Process PDF file, load content, extract images. The images are
+        written as the pages are extracted, see `write_pdf`.
 
         Args:
             filename: PDF file name.
@@ -253,14 +522,93 @@ class ComicPy:
         Returns:
             list: list of diccionaries with metadata of file/s CBZ or CBR.
         """
-        metaFileCompress = []
+        compressor = compressor.replace('.', '').lower().strip()
 
-        self.__show_progress(file=filename)
+        return self.write_pdf(
+                        filename=filename,
+                        compressor=compressor,
+                        resize=resize,
+                        motor=motor,
+                        dest=dest
+                    )
+
+    @traced()
+    @conversion
+    def extract_pdf(
+        self,
+        filename: str,
+        compressor: Literal['rar', 'zip'] = 'zip',
+        resize: Literal['preserve', 'small', 'medium', 'large'] = 'preserve',
+        motor: Literal['pymupdf'] = 'pymupdf',
+        currentFile: CurrentFile = None
+    ) -> Union[CompressorFileData, None]:
+        """
+        Loads PDF file and extracts its images, without writing them.
 
-        file_raw = self.load_file(filename=filename)
+        Args:
+            filename: PDF file name.
+            compressor: type of compressor, 'rar' or 'zip', default is 'zip'.
+            resize: resize images, default is 'preserve'
+            motor: motor to use, `pymupdf`, default `pymupdf`.
+            currentFile: `CurrentFile` instance with the data of file, if it
+                         is given the file is not read.
 
+        Returns:
+            CompressorFileData: instance with the images of PDF file.
+            None: if the file is not valid.
+
+        Raises:
+            EmptyFile: if PDF file not have images.
+        """
         compressor = compressor.replace('.', '').lower().strip()
 
+        file_raw = self.load_pdf(
+                        filename=filename,
+                        compressor=compressor,
+                        currentFile=currentFile
+                    )
+        if file_raw is None:
+            return None
+
+        with self.contexts.context.keep(
+            nbytes=file_raw.bytes_data.getbuffer().nbytes
+        ):
+            compressFileData = self.pdfphandler.process_pdf(
+                                currentFilePDF=file_raw,
+                                compressor=compressor,
+                                resizeImage=resize,
+                                motor=motor,
+                                is_join=self.join_files,
+                                show_progress=self.show_progress
+                            )
+        if compressFileData is None:
+            raise EmptyFile('File PDF not have images.')
+
+        return compressFileData
+
+    def load_pdf(
+        self,
+        filename: str,
+        compressor: str,
+        currentFile: CurrentFile = None
+    ) -> Union[CurrentFile, None]:
+        """
+        Loads and checks a PDF file, used by `extract_pdf` and `write_pdf`.
+
+        Args:
+            filename: PDF file name.
+            compressor: type of compressor, 'rar' or 'zip'.
+            currentFile: `CurrentFile` instance with the data of file, if it
+                         is given the file is not read.
+
+        Returns:
+            CurrentFile: instance with the data of PDF file.
+            None: if the file is not valid.
+        """
+        self.__show_progress(file=filename)
+
+        file_raw = self.load_file(filename=filename, currentFile=currentFile)
+
         self.raiser_error_compressor(compressor_str=compressor)
 
         try:
@@ -268,18 +616,139 @@ class ComicPy:
         except Exception as e:
             print(f"\n{e}\n")
             return None
+        return file_raw
 
-        compressFileData = self.pdfphandler.process_pdf(
-                            currentFilePDF=file_raw,
-                            compressor=compressor,
-                            resizeImage=resize,
-                            motor=motor,
-                            is_join=self.join_files,
-                            show_progress=self.show_progress
-                        )
-        if compressFileData is None:
+    @traced()
+    @conversion
+    def write_pdf(
+        self,
+        filename: str,
+        compressor: Literal['rar', 'zip'] = 'zip',
+        resize: Literal['preserve', 'small', 'medium', 'large'] = 'preserve',
+        motor: Literal['pymupdf'] = 'pymupdf',
+        dest: str = '.',
+        currentFile: CurrentFile = None
+    ) -> Union[List[dict], None]:
+        """
+        Converts a PDF file writing its images as the pages are extracted.
+        Each batch of pages is written to the CBZ or CBR file by a background
+        thread while the next pages are extracted, the memory of the images
+        is released as they are written, so the extraction waits for the
+        writer when the bytes in flight pass the memory limit.
+
+        Args:
+            filename: PDF file name.
+            compressor: type of compressor, 'rar' or 'zip', default is 'zip'.
+            resize: resize images, default is 'preserve'
+            motor: motor to use, `pymupdf`, default `pymupdf`.
+            dest: destination path of CBZ or CBR files, default is '.'.
+            currentFile: `CurrentFile` instance with the data of file, if it
+                         is given the file is not read.
+
+        Returns:
+            list: list of diccionaries with metadata of file/s CBZ or CBR.
+            None: if the file is not valid.
+
+        Raises:
+            EmptyFile: if PDF file not have images.
+        """
+        compressor = compressor.replace('.', '').lower().strip()
+
+        file_raw = self.load_pdf(
+                        filename=filename,
+                        compressor=compressor,
+                        currentFile=currentFile
+                    )
+        if file_raw is None:
+            return None
+
+        context = self.contexts.context
+        batches = queue.Queue(maxsize=2)
+        errors = []
+
+        def write_batches() -> None:
+            with self.contexts.attach(context=context):
+                try:
+                    with context.draining():
+                        for batch in iter(batches.get, None):
+                            self.to_compressor(
+                                    filename=self.FILE_CBR_CBZ_,
+                                    basedir=self.BASE_DIR_,
+                                    listCompressorData=batch.list_data,
+                                    join_files=True,
+                                    compressor=compressor,
+                                    dest=self.CONVERTED_COMICPY_PATH_,
+                                    last_item=False
+                                )
+                except BaseException as e:
+                    errors.append(e)
+                    # the batches left are discarded.
+                    for batch in iter(batches.get, None):
+                        pass
+
+        started = False
+
+        def write(batch: CompressorFileData) -> None:
+            nonlocal started
+            if errors:
+                # the writer failed, the extraction stops.
+                raise errors[0]
+            if not started:
+                self.__start_output(
+                        filename=filename,
+                        compressor=compressor,
+                        dest=dest
+                    )
+                started = True
+            batches.put(batch)
+
+        writer = threading.Thread(
+                        target=write_batches,
+                        name='comicpy-writer',
+                        daemon=True
+                    )
+        writer.start()
+        try:
+            with context.keep(nbytes=file_raw.bytes_data.getbuffer().nbytes):
+                images = self.pdfphandler.stream_pdf(
+                                currentFilePDF=file_raw,
+                                compressor=compressor,
+                                write=write,
+                                resizeImage=resize,
+                                motor=motor,
+                                is_join=self.join_files,
+                                show_progress=self.show_progress
+                            )
+        finally:
+            batches.put(None)
+            writer.join()
+        if errors:
+            raise errors[0]
+        if images == 0:
             raise EmptyFile('File PDF not have images.')
 
+        if self.join_files and not self.LAST_ITEM_:
+            return []
+        return self.to_compressor(
+                        filename=self.FILE_CBR_CBZ_,
+                        basedir=self.BASE_DIR_,
+                        listCompressorData=[],
+                        join_files=True,
+                        compressor=compressor,
+                        dest=self.CONVERTED_COMICPY_PATH_,
+                        last_item=True
+                    )
+
+    def __start_output(
+        self,
+        filename: str,
+        compressor: str,
+        dest: str
+    ) -> None:
+        """
+        Sets the CBZ or CBR file where the images of a file are written by
+        batches, as `write_content` does with all the images.
+        """
         if self.directory_path is None:
             self.get_base_converted_path(
                     origin=filename,
@@ -292,17 +761,15 @@ class ComicPy:
                 compressor=compressor
             )
 
-        metaFileCompress = self.to_compressor(
-                                filename=self.FILE_CBR_CBZ_,
-                                basedir=self.BASE_DIR_,
-                                listCompressorData=compressFileData.list_data,
-                                join_files=self.join_files,
-                                compressor=compressor,
-                                dest=self.CONVERTED_COMICPY_PATH_,
-                            )
-
-        return metaFileCompress
+        if self.join_files is False:
+            # the batches are added to a new file.
+            if compressor == 'zip':
+                self.ziphandler.reset_names()
+            elif compressor == 'rar':
+                self.rarhandler.reset_names()
 
+    @traced()
+    @conversion
     def process_zip(
         self,
         filename: str,
@@ -322,11 +789,50 @@ class ComicPy:
         Returns:
             list: list of diccionaries with metadata of file/s CBZ.
         """
-        data_metadata = []
+        zipCompressorFileData = self.extract_zip(
+                                    filename=filename,
+                                    password=password,
+                                    resize=resize
+                                )
+        if zipCompressorFileData is None:
+            return None
+
+        return self.write_content(
+                        filename=filename,
+                        compressorFileData=zipCompressorFileData,
+                        compressor='zip',
+                        dest=dest
+                    )
+
+    @traced()
+    @conversion
+    def extract_zip(
+        self,
+        filename: str,
+        password: str = None,
+        resize: Literal['preserve', 'small', 'medium', 'large'] = 'preserve',
+        currentFile: CurrentFile = None
+    ) -> Union[CompressorFileData, None]:
+        """
+        Loads ZIP file and extracts its content, without writing it.
+
+        Args:
+            filename: ZIP file name.
+            password: password of ZIP file.
+            resize: rescaling image.
+            currentFile: `CurrentFile` instance with the data of file, if it
+                         is given the file is not read.
 
+        Returns:
+            CompressorFileData: instance with the content of ZIP file.
+            None: if the file is not valid.
+
+        Raises:
+            EmptyFile: if ZIP file not have valid files.
+        """
         self.__show_progress(file=filename)
 
-        file_raw = self.load_file(filename=filename)
+        file_raw = self.load_file(filename=filename, currentFile=currentFile)
 
         try:
             self.check_file(currentFile=file_raw)
@@ -339,12 +845,15 @@ class ComicPy:
                 compressCurrentFile=file_raw,
                 password=password
             )
-        zipCompressorFileData = self.ziphandler.extract_content(
-                                    currentFileZip=file_raw,
-                                    password=password,
-                                    resizeImage=resize,
-                                    is_join=self.join_files
-                                )
+        with self.contexts.context.keep(
+            nbytes=file_raw.bytes_data.getbuffer().nbytes
+        ):
+            zipCompressorFileData = self.ziphandler.extract_content(
+                                        currentFileZip=file_raw,
+                                        password=password,
+                                        resizeImage=resize,
+                                        is_join=self.join_files
+                                    )
 
         if zipCompressorFileData is None or zipCompressorFileData == -1:
             msg = '\nZIP file not have files with '
@@ -352,44 +861,10 @@ class ComicPy:
             msg += 'valid Extensions: ' + ', '.join(exts) + '\n'
             raise EmptyFile(msg)
 
-        if self.directory_path is None:
-            self.get_base_converted_path(
-                    origin=filename,
-                    dest=dest,
-                    type='f'
-                )
-
-        self.get_cbz_cbr_name(
-                filename=filename,
-                compressor='zip'
-            )
-
-        no_comic_files = []
-        for item in zipCompressorFileData.list_data:
-            if item.is_comic:
-                metaFileCompress = self.to_write(
-                                            listCurrentFiles=[item],
-                                            path=self.CONVERTED_COMICPY_PATH_
-                                        )
-                data_metadata += metaFileCompress
-            else:
-                no_comic_files.append(item)
-
-        if no_comic_files == []:
-            return data_metadata
-        else:
-            list_metaFileCompress = self.to_compressor(
-                                        filename=self.FILE_CBR_CBZ_,
-                                        basedir=self.BASE_DIR_,
-                                        listCompressorData=no_comic_files,
-                                        join_files=self.join_files,
-                                        compressor='zip',
-                                        dest=self.CONVERTED_COMICPY_PATH_
-                                    )
-            data_metadata += list_metaFileCompress
-
-        return data_metadata
+        return zipCompressorFileData
 
+    @traced()
+    @conversion
     def process_rar(
         self,
         filename: str,
@@ -409,11 +884,50 @@ class ComicPy:
         Returns:
             list: list of diccionaries with metadata of file/s CBR.
         """
-        data_metadata = []
+        rarCompressorFileData = self.extract_rar(
+                                    filename=filename,
+                                    password=password,
+                                    resize=resize
+                                )
+        if rarCompressorFileData is None:
+            return None
+
+        return self.write_content(
+                        filename=filename,
+                        compressorFileData=rarCompressorFileData,
+                        compressor='rar',
+                        dest=dest
+                    )
+
+    @traced()
+    @conversion
+    def extract_rar(
+        self,
+        filename: str,
+        password: str = None,
+        resize: Literal['preserve', 'small', 'medium', 'large'] = 'preserve',
+        currentFile: CurrentFile = None
+    ) -> Union[CompressorFileData, None]:
+        """
+        Loads RAR file and extracts its content, without writing it.
 
+        Args:
+            filename: RAR file name.
+            password: password of RAR file.
+            resize: rescaling image.
+            currentFile: `CurrentFile` instance with the data of file, if it
+                         is given the file is not read.
+
+        Returns:
+            CompressorFileData: instance with the content of RAR file.
+            None: if the file is not valid.
+
+        Raises:
+            EmptyFile: if RAR file not have valid files.
+        """
         self.__show_progress(file=filename)
 
-        file_raw = self.load_file(filename=filename)
+        file_raw = self.load_file(filename=filename, currentFile=currentFile)
 
         try:
             self.check_file(currentFile=file_raw)
@@ -427,12 +941,15 @@ class ComicPy:
                 password=password
             )
 
-        rarCompressorFileData = self.rarhandler.extract_content(
-                                    currentFileRar=file_raw,
-                                    password=password,
-                                    resizeImage=resize,
-                                    is_join=self.join_files
-                                )
+        with self.contexts.context.keep(
+            nbytes=file_raw.bytes_data.getbuffer().nbytes
+        ):
+            rarCompressorFileData = self.rarhandler.extract_content(
+                                        currentFileRar=file_raw,
+                                        password=password,
+                                        resizeImage=resize,
+                                        is_join=self.join_files
+                                    )
 
         if rarCompressorFileData is None or rarCompressorFileData == -1:
             msg = '\nRAR file not have files with '
@@ -440,6 +957,36 @@ class ComicPy:
             msg += 'valid Extensions: ' + ', '.join(exts) + '\n'
             raise EmptyFile(msg)
 
+        return rarCompressorFileData
+
+    @traced()
+    @conversion
+    def write_content(
+        self,
+        filename: str,
+        compressorFileData: CompressorFileData,
+        compressor: Literal['rar', 'zip'] = 'zip',
+        dest: str = '.'
+    ) -> List[dict]:
+        """
+        Writes the content extracted from a file. CBR or CBZ files found
+        inside are written as they are, the images are stored in a CBR or CBZ
+        file.
+
+        Args:
+            filename: name of original file.
+            compressorFileData: `CompressorFileData` instance with the
+                                content of file.
+            compressor: type of compressor, 'rar' or 'zip', default is 'zip'.
+            dest: destination path of CBZ or CBR files, default is '.'.
+
+        Returns:
+            list: list of diccionaries with metadata of file/s CBZ or CBR.
+        """
+        self.contexts.context.check_cancelled()
+
+        data_metadata = []
+
         if self.directory_path is None:
             self.get_base_converted_path(
                     origin=filename,
@@ -449,11 +996,11 @@ class ComicPy:
 
         self.get_cbz_cbr_name(
                 filename=filename,
-                compressor='rar'
+                compressor=compressor
             )
 
         no_comic_files = []
-        for item in rarCompressorFileData.list_data:
+        for item in compressorFileData.list_data:
             if item.is_comic:
                 metaFileCompress = self.to_write(
                                             listCurrentFiles=[item],
@@ -471,13 +1018,376 @@ class ComicPy:
                                         basedir=self.BASE_DIR_,
                                         listCompressorData=no_comic_files,
                                         join_files=self.join_files,
-                                        compressor='rar',
+                                        compressor=compressor,
                                         dest=self.CONVERTED_COMICPY_PATH_
                                     )
             data_metadata += list_metaFileCompress
 
         return data_metadata
 
+    @traced()
+    @conversion
+    def process_file(
+        self,
+        filename: str,
+        dest: str = '.',
+        compressor: Literal['rar', 'zip'] = 'zip',
+        password: str = None,
+        resize: Literal['preserve', 'small', 'medium', 'large'] = 'preserve',
+        motor: Literal['pymupdf'] = 'pymupdf'
+    ) -> Union[List[dict], None]:
+        """
+        Process a PDF, CBZ, CBR, ZIP or RAR file, by its extension. ZIP and
+        RAR files keep their compressor.
+
+        Args:
+            filename: file name.
+            dest: destination path of CBZ or CBR files, default is '.'.
+            compressor: type of compressor of PDF files, 'rar' or 'zip'.
+            password: password of ZIP or RAR file.
+            resize: rescaling image.
+            motor: motor to use with PDF files, `pymupdf`.
+
+        Returns:
+            list: list of diccionaries with metadata of file/s CBZ or CBR.
+            None: if the file is not valid.
+        """
+        compressor_file = self.get_compressor_file(
+                                filename=filename,
+                                compressor=compressor
+                            )
+        file_type = self.get_file_type(filename=filename)
+        if file_type == 'pdf':
+            # the images are written as the pages are extracted.
+            return self.write_pdf(
+                            filename=filename,
+                            compressor=compressor_file,
+                            resize=resize,
+                            motor=motor,
+                            dest=dest,
+                            currentFile=self.load_misnamed(
+                                                filename=filename,
+                                                file_type=file_type
+                                            )
+                        )
+
+        data = self.extract_file(
+                        filename=filename,
+                        compressor=compressor_file,
+                        password=password,
+                        resize=resize,
+                        motor=motor
+                    )
+        if data is None:
+            return None
+
+        return self.write_content(
+                        filename=filename,
+                        compressorFileData=data,
+                        compressor=compressor_file,
+                        dest=dest
+                    )
+
+    @traced()
+    @conversion
+    def extract_file(
+        self,
+        filename: str,
+        compressor: Literal['rar', 'zip'] = 'zip',
+        password: str = None,
+        resize: Literal['preserve', 'small', 'medium', 'large'] = 'preserve',
+        motor: Literal['pymupdf'] = 'pymupdf',
+        currentFile: CurrentFile = None
+    ) -> Union[CompressorFileData, None]:
+        """
+        Extracts the content of a PDF, CBZ, CBR, ZIP or RAR file, by its
+        extension.
+
+        Args:
+            filename: file name.
+            compressor: type of compressor of PDF files, 'rar' or 'zip'.
+            password: password of ZIP or RAR file.
+            resize: rescaling image.
+            motor: motor to use with PDF files, `pymupdf`.
+            currentFile: `CurrentFile` instance with the data of file, if it
+                         is given the file is not read.
+
+        Returns:
+            CompressorFileData: instance with the content of file.
+            None: if the file is not valid.
+        """
+        file_type = self.get_file_type(
+                            filename=filename,
+                            currentFile=currentFile
+                        )
+        currentFile = self.load_misnamed(
+                            filename=filename,
+                            file_type=file_type,
+                            currentFile=currentFile
+                        )
+
+        if file_type == 'pdf':
+            return self.extract_pdf(
+                            filename=filename,
+                            compressor=compressor,
+                            resize=resize,
+                            motor=motor,
+                            currentFile=currentFile
+                        )
+        elif file_type == 'zip':
+            return self.extract_zip(
+                            filename=filename,
+                            password=password,
+                            resize=resize,
+                            currentFile=currentFile
+                        )
+        elif file_type == 'rar':
+            return self.extract_rar(
+                            filename=filename,
+                            password=password,
+                            resize=resize,
+                            currentFile=currentFile
+                        )
+        return None
+
+    def load_misnamed(
+        self,
+        filename: str,
+        file_type: Union[str, None],
+        currentFile: CurrentFile = None
+    ) -> Union[CurrentFile, None]:
+        """
+        Loads a file whose content does not match its extension, it is
+        converted as the type of its content.
+
+        Args:
+            filename: file name.
+            file_type: type of content of file, see `get_file_type`.
+            currentFile: `CurrentFile` instance with the data of file, if it
+                         is given the file is not read.
+
+        Returns:
+            CurrentFile: instance with the data of a misnamed file, or
+                         `currentFile`.
+        """
+        name_, extension_ = Paths.splitext(path=str(filename))
+        if file_type is None or \
+                file_type == self.checker.get_extension_type(
+                                    extension=extension_
+                                ):
+            return currentFile
+
+        # misnamed file, it is converted as the type of its content.
+        if currentFile is None:
+            currentFile = self.read(filename=filename)
+        currentFile.extension = '.%s' % file_type
+        if self.show_progress:
+            print('"%s" is a %s file.' % (
+                    Paths.get_basename(str(filename)),
+                    file_type.upper()
+                ))
+        return currentFile
+
+    def get_compressor_file(
+        self,
+        filename: str,
+        compressor: str
+    ) -> str:
+        """
+        Gets the compressor used to write a file, ZIP and RAR files keep
+        their compressor, PDF files use the compressor given.
+        """
+        file_type = self.get_file_type(filename=filename)
+        if file_type in ('zip', 'rar'):
+            return file_type
+        return compressor
+
+    def get_file_type(
+        self,
+        filename: str,
+        currentFile: CurrentFile = None
+    ) -> Union[str, None]:
+        """
+        Gets the type of a PDF, ZIP or RAR file from its first bytes, so a
+        misnamed file, a CBR file that is a ZIP file, etc., is converted by
+        the handler of its content. A file whose content is not detected has
+        the type of its extension, and it is rejected by its handler.
+
+        Args:
+            filename: file name.
+            currentFile: `CurrentFile` instance with the data of file, if it
+                         is given the file is not read.
+
+        Returns:
+            str: type of file, 'pdf', 'zip' or 'rar'.
+            None: if neither the content nor the extension are valid.
+        """
+        if currentFile is not None:
+            file_type = self.checker.detect(
+                                chunk_bytes=currentFile.chunk_bytes
+                            )
+        else:
+            file_type = self.checker.detect_file(filename=str(filename))
+        if file_type not in ('pdf', 'zip', 'rar'):
+            name_, extension_ = Paths.splitext(path=str(filename))
+            file_type = self.checker.get_extension_type(extension=extension_)
+        if file_type not in ('pdf', 'zip', 'rar'):
+            return None
+        return file_type
+
+    @traced()
+    @conversion
+    def process_stream(
+        self,
+        source: Union[bytes, bytearray, memoryview, BinaryIO],
+        sink: BinaryIO,
+        filename: str,
+        password: str = None,
+        resize: Literal['preserve', 'small', 'medium', 'large'] = 'preserve',
+        motor: Literal['pymupdf'] = 'pymupdf'
+    ) -> Union[dict, None]:
+        """
+        Converts a PDF, CBZ, CBR, ZIP or RAR file given as bytes or
+        file-like object, and writes the CBZ file into a writable file-like
+        object, without writing to disk. CBR or CBZ files found inside are
+        stored as they are in the CBZ file.
+
+        Args:
+            source: bytes or readable file-like object with the data of file.
+            sink: writable file-like object, `BytesIO`,
+                  `SpooledTemporaryFile`, socket file given by
+                  `socket.makefile('wb')`, etc. It may be unseekable.
+            filename: name of file, its extension indicates the type of file.
+            password: password of ZIP or RAR file.
+            resize: rescaling image.
+            motor: motor to use with PDF files, `pymupdf`.
+
+        Returns:
+            dict: metadata of CBZ file, 'name', 'size' and 'bytes' written.
+            None: if the file is not valid.
+        """
+        currentFile = self.read_stream(source=source, filename=filename)
+        data = self.extract_file(
+                        filename=filename,
+                        compressor='zip',
+                        password=password,
+                        resize=resize,
+                        motor=motor,
+                        currentFile=currentFile
+                    )
+        if data is None:
+            return None
+
+        return self.write_stream(
+                        filename=filename,
+                        compressorFileData=data,
+                        sink=sink
+                    )
+
+    def process_bytes(
+        self,
+        source: Union[bytes, bytearray, memoryview, BinaryIO],
+        filename: str,
+        password: str = None,
+        resize: Literal['preserve', 'small', 'medium', 'large'] = 'preserve',
+        motor: Literal['pymupdf'] = 'pymupdf'
+    ) -> Union[bytes, None]:
+        """
+        Converts a PDF, CBZ, CBR, ZIP or RAR file given as bytes or
+        file-like object, and returns the data of CBZ file.
+
+        Args:
+            source: bytes or readable file-like object with the data of file.
+            filename: name of file, its extension indicates the type of file.
+            password: password of ZIP or RAR file.
+            resize: rescaling image.
+            motor: motor to use with PDF files, `pymupdf`.
+
+        Returns:
+            bytes: data of CBZ file.
+            None: if the file is not valid.
+        """
+        sink = io.BytesIO()
+        metadata = self.process_stream(
+                        source=source,
+                        sink=sink,
+                        filename=filename,
+                        password=password,
+                        resize=resize,
+                        motor=motor
+                    )
+        if metadata is None:
+            return None
+        return sink.getvalue()
+
+    @traced()
+    @conversion
+    def write_stream(
+        self,
+        filename: str,
+        compressorFileData: CompressorFileData,
+        sink: BinaryIO
+    ) -> dict:
+        """
+        Writes the content extracted from a file as a CBZ file into a
+        writable file-like object.
+
+        Args:
+            filename: name of original file.
+            compressorFileData: `CompressorFileData` instance with the
+                                content of file.
+            sink: writable file-like object.
+
+        Returns:
+            dict: metadata of CBZ file, 'name', 'size' and 'bytes' written.
+        """
+        self.contexts.context.check_cancelled()
+
+        images = self.__drop_near_duplicates(
+                        images=[
+                            item for item in compressorFileData.list_data
+                            if not item.is_comic
+                        ],
+                        output=filename
+                    )
+        list_data = [
+            item for item in compressorFileData.list_data
+            if item.is_comic
+        ] + images
+
+        with self.contexts.context.timer(stage='write') as record, \
+                CBZWriter(sink=sink) as writer:
+            for item in list_data:
+                if item.is_comic:
+                    arcname = '%s%s' % (
+                                Paths.get_basename(path=item.filename),
+                                item.extension
+                            )
+                else:
+                    arcname = item.filename
+                data = item.bytes_data.getvalue()
+                writer.add(arcname=arcname, data=data)
+                record['bytes_in'] += len(data)
+                if not item.is_comic:
+                    # the image is written, its memory is released.
+                    self.contexts.context.release(nbytes=len(data))
+            writer.close()
+            record['bytes_out'] = writer.size
+
+        name_, extension_ = Paths.splitext(
+                    Paths.get_basename(str(filename)).replace(' ', '_')
+                )
+        return {
+            'name': '%s.cbz' % name_,
+            'size': '%.2f %s' % (
+                        writer.size / SizeUnits[self.unit],
+                        self.unit.upper()
+                    ),
+            'bytes': writer.size
+        }
+
+    @traced(arg='directory_path')
+    @conversion
     def process_dir(
         self,
         directory_path: str,
@@ -487,7 +1397,11 @@ class ComicPy:
         compressor: Literal['rar', 'zip'] = 'zip',
         join: bool = False,
         resize: Literal['preserve', 'small', 'medium', 'large'] = 'preserve',
-        motor: Literal['pymupdf'] = 'pymupdf'
+        motor: Literal['pymupdf'] = 'pymupdf',
+        incremental: bool = False,
+        jobs: int = 1,
+        dedupe: Literal['report', 'link'] = None,
+        dedupe_index: str = None
     ) -> Union[List[dict], None]:
         """
         Searches files in the given directory, searches only PDF, CBZ, CBR
@@ -506,11 +1420,37 @@ class ComicPy:
                   otherwise, if `False` they are kept in individual files.
             resize: string for resizing images, default is 'preserve'.
             motor: motor to use, `pymupdf`, default `pymupdf`.
+            incremental: if `True`, files not changed since the last
+                         conversion with the same settings are skipped, using
+                         the manifest stored with the output files. Only for
+                         PDF, CBZ, CBR, ZIP, RAR files. Default is `False`.
+            jobs: number of files converted at the same time, by worker
+                  processes, `None` uses the number of CPUs. With `join`, the
+                  files are extracted in parallel and joined in order. Only
+                  for PDF, CBZ, CBR, ZIP, RAR files. Default is `1`.
+            dedupe: 'report' or 'link' to convert each distinct content only
+                    once, the duplicates are reported and, with 'link',
+                    their outputs are links to the outputs of the first file
+                    with the same content. Only for PDF, CBZ, CBR, ZIP, RAR
+                    files. Default is `None`, all files are converted.
+            dedupe_index: path of index of hashes used by `dedupe`, kept
+                          between runs. Default is
+                          `~/comicpyData/dedupe_index.json`.
 
         Returns:
             list: list of diccionaries with metadata of file/s CBR or CBZ.
             None: if the list of images is empty, the file has no images.
+
+        Raises:
+            ValueError: if `jobs` is less than 1, or `dedupe` is not valid.
         """
+        if jobs is None:
+            jobs = os.cpu_count() or 1
+        if jobs < 1:
+            raise ValueError('"jobs" must be greater than 0.')
+        if dedupe not in (None, 'report', 'link'):
+            raise ValueError('"dedupe" must be "report" or "link".')
+
         compressor = compressor.replace('.', '').lower().strip()
 
         self.directory_path = Paths.get_abs_path(path=directory_path)
@@ -543,7 +1483,11 @@ class ComicPy:
                     join=join,
                     resize=resize,
                     motor=motor,
-                    dest=dest
+                    dest=dest,
+                    incremental=incremental,
+                    jobs=jobs,
+                    dedupe=dedupe,
+                    dedupe_index=dedupe_index
                 )
         except KeyboardInterrupt:
             print('Interrump')
@@ -559,6 +1503,101 @@ class ComicPy:
             print('%s\n' % (e))
             return []
 
+    def classify_dir(
+        self,
+        directory_path: str,
+        workers: int = 8
+    ) -> Dict[str, List[str]]:
+        """
+        Classifies the files of a directory tree by their content, reading
+        only their first bytes in parallel threads, whatever their
+        extensions are.
+
+        Args:
+            directory_path: directory name.
+            workers: number of threads reading headers. Default is `8`.
+
+        Returns:
+            dict: paths sorted alphanumerically by type of file, 'pdf', 'zip',
+                  'rar', 'jpeg', 'png' or 'webp', files of other types are
+                  not included.
+
+        Raises:
+            DirectoryPathNotExists: if directory path not exists.
+        """
+        if not Paths.exists(directory_path):
+            raise DirectoryPathNotExists(dir_path=directory_path)
+        entries = Paths.sort_entries(
+                        entries=list(Paths.scan_files(
+                                        directory=directory_path,
+                                        extensions=None
+                                    ))
+                    )
+        types = self.checker.classify(
+                        filenames=[entry.path for entry in entries],
+                        workers=workers
+                    )
+        results = {}
+        for path, file_type in types.items():
+            if file_type is not None:
+                results.setdefault(file_type, []).append(path)
+        return results
+
+    def scan_dir(
+        self,
+        directory_path: str,
+        extension_filter: str = None,
+        workers: int = 8
+    ) -> List[os.DirEntry]:
+        """
+        Scans a directory tree looking for the inputs of a filter, the files
+        with its extension and the misnamed files whose content is of its
+        type, detected reading their first bytes in parallel threads. A RAR
+        file named `.cbz` is an input of the 'rar' and 'cbr' filters.
+
+        Args:
+            directory_path: directory name.
+            extension_filter: 'rar', 'zip', 'pdf', 'cbz' or 'cbr', `None`
+                              for the inputs of all of them.
+            workers: number of threads reading headers. Default is `8`.
+
+        Returns:
+            list: `os.DirEntry` instances of inputs, sorted alphanumerically.
+        """
+        if extension_filter is None:
+            extensions = set(ComicPy.COMIC_EXTENSIONS)
+        else:
+            extensions = {'.%s' % extension_filter.lower()}
+        file_types = {
+            self.checker.get_extension_type(extension=extension)
+            for extension in extensions
+        }
+        entries = Paths.sort_entries(
+                        entries=list(Paths.scan_files(
+                                        directory=directory_path,
+                                        extensions=None
+                                    ))
+                    )
+        others = [
+            entry for entry in entries
+            if Paths.splitext(entry.name)[1].lower() not in extensions
+        ]
+        types = self.checker.classify(
+                        filenames=[entry.path for entry in others],
+                        workers=workers
+                    )
+        results = []
+        for entry in entries:
+            if entry.path not in types:
+                results.append(entry)
+            elif types[entry.path] in file_types and \
+                    self.checker.get_extension_type(
+                        extension=Paths.splitext(entry.name)[1]
+                    ) != types[entry.path]:
+                # misnamed, the handler is chosen by content.
+                results.append(entry)
+        return results
+
     def __images_dir(
         self,
         directory_path: str,
@@ -592,20 +1631,18 @@ class ComicPy:
 
         self.__show_progress(file=directory_path)
 
-        compressFileDataImages = self.directoryhandler.process_dir(
+        # each directory is written as soon as its images are ready.
+        compressFileDataImages = self.directoryhandler.iter_dir(
                         directoryPath=directory_path,
                         compressor=compressor_type,
                         resizeImage=resize,
                         join=join
                     )
 
-        if compressFileDataImages is None:
-            raise DirectoryEmptyFilesValid(dir_path=directory_path)
-
-        for item in compressFileDataImages:
+        metadataFile = None
+        for item, is_last in compressFileDataImages:
             # print('->', item.filename, directory_path)
-            if item.filename == compressFileDataImages[-1].filename:
-                self.LAST_ITEM_ = True
+            self.LAST_ITEM_ = is_last
 
             self.get_cbz_cbr_name(
                     filename=item.filename,
@@ -625,13 +1662,14 @@ class ComicPy:
             if join is False:
                 data_metadata += metadataFile
 
+        if metadataFile is None:
+            raise DirectoryEmptyFilesValid(dir_path=directory_path)
+
         if join:
             return metadataFile
         else:
             return data_metadata
 
-        return []
-
     def __dir_pdf_rar_zip(
         self,
         directory_path: str,
@@ -641,7 +1679,11 @@ class ComicPy:
         join: str,
         resize: str,
         dest: str = '.',
-        motor: Literal['pymupdf'] = 'pymupdf'
+        motor: Literal['pymupdf'] = 'pymupdf',
+        incremental: bool = False,
+        jobs: int = 1,
+        dedupe: Literal['report', 'link'] = None,
+        dedupe_index: str = None
     ) -> Union[List[dict], None]:
         """
         Manages the workflow for PDF, CBR, CBZ, RAR, ZIP files within a
@@ -658,6 +1700,12 @@ class ComicPy:
             resize: string for resizing images, default is 'preserve'.
             dest: destination path of CBZ or CBR files, default is '.'.
             motor: motor to use, `pymupdf`, default `pymupdf`.
+            incremental: if `True`, skips files not changed since the last
+                         conversion.
+            jobs: number of files converted at the same time.
+            dedupe: 'report' or 'link' to convert each distinct content only
+                    once.
+            dedupe_index: path of index of hashes used by `dedupe`.
 
         Returns
             list: list of diccionaries with metadata of file/s CBR or CBZ.
@@ -685,85 +1733,479 @@ class ComicPy:
         if not Paths.exists(self.directory_path):
             raise DirectoryPathNotExists(dir_path=directory_path)
 
-        list_extension = [
-                            extension_filter.lower(),
-                            extension_filter.upper()
-                        ]
-        filesMatch = Paths.get_files_recursive(
-                            directory=self.directory_path,
-                            extensions=list_extension,
+        entriesMatch = self.scan_dir(
+                            directory_path=self.directory_path,
+                            extension_filter=extension_filter
                         )
 
-        if len(filesMatch) == 0:
+        if len(entriesMatch) == 0:
             raise DirectoryFilterEmptyFiles(
                             dir_path=self.directory_path,
                             filter=extension_filter
                         )
 
-        elif len(filesMatch) > 0:
-            filesMatch.sort()  # sort file names alphanumerically.
-
-            for item_path in filesMatch:
-                # compressFileData = None
-                # fileCurrentData = None
+        elif len(entriesMatch) > 0:
+            # sort file names alphanumerically.
+            entriesMatch = Paths.sort_entries(entries=entriesMatch)
+            # all files, the duplicates are not converted.
+            entriesAll = entriesMatch
+            duplicates = {}
+            if dedupe is not None:
+                # all comic files of the tree are compared, a CBZ file is a
+                # duplicate of a CBR file with the same bytes.
+                entriesComic = self.scan_dir(
+                                    directory_path=self.directory_path
+                                )
+                duplicates = self.__select_originals(
+                                    duplicates=self.find_duplicates(
+                                        entries=entriesComic,
+                                        index_path=dedupe_index
+                                    ),
+                                    entriesComic=entriesComic,
+                                    entries=entriesMatch
+                                )
+                copies = {
+                    entry.path
+                    for entriesCopy in duplicates.values()
+                    for entry in entriesCopy
+                }
+                entriesMatch = [
+                    entry for entry in entriesMatch
+                    if entry.path not in copies
+                ]
 
-                if not Paths.exists(item_path):
-                    pass
+            manifest = None
+            if incremental:
+                manifest = ConversionManifest(
+                                directory=self.CONVERTED_COMICPY_PATH_
+                            )
+                settings = self.__get_settings(
+                                    compressor=compressor_type,
+                                    resize=resize,
+                                    motor=motor,
+                                    join=join
+                                )
+                # joined output is current only if all inputs are.
+                if join and all(
+                    manifest.is_current(entry=entry, settings=settings)
+                    for entry in entriesMatch
+                ):
+                    self.__reset_names_counter_handlers()
+                    return manifest.get_outputs(entry=entriesMatch[-1])
+                if join:
+                    # all inputs are appended again to the joined archive,
+                    # it is removed once, before converting any of them.
+                    for entry in entriesMatch:
+                        manifest.remove_outputs(entry=entry)
+
+            # metadata of outputs by input file.
+            results = {}
+            entriesConverted = []
+            try:
+                entriesPending = []
+                for entry in entriesMatch:
+                    if not Paths.exists(entry.path):
+                        continue
+
+                    if manifest is not None and join is False:
+                        if manifest.is_current(entry=entry, settings=settings):
+                            results[entry.path] = manifest.get_outputs(
+                                                        entry=entry
+                                                    )
+                            continue
+                        manifest.remove_outputs(entry=entry)
+
+                    entriesPending.append(entry)
+
+                if jobs > 1 and len(entriesPending) > 1:
+                    converted = self.__convert_jobs(
+                                        entries=entriesPending,
+                                        jobs=jobs,
+                                        compressor=compressor_type,
+                                        password=password,
+                                        resize=resize,
+                                        motor=motor
+                                    )
                 else:
-                    if item_path == filesMatch[-1]:
-                        self.LAST_ITEM_ = True
+                    converted = self.__convert_serial(
+                                        entries=entriesPending,
+                                        compressor=compressor_type,
+                                        password=password,
+                                        resize=resize,
+                                        motor=motor
+                                    )
+
+                last_failed = False
+                for entry, metadataFiles in converted:
+                    last_failed = metadataFiles is None
+                    if metadataFiles is None:
+                        continue
+                    entriesConverted.append((entry, metadataFiles))
+                    results[entry.path] = metadataFiles
+                    if self.join_files:
+                        if data_metadata == []:
+                            data_metadata += metadataFiles
+                        else:
+                            data_metadata = metadataFiles
+
+                # the joined archive is closed by its last input, if it
+                # failed the archive is closed with the previous inputs.
+                if self.join_files and last_failed and entriesConverted:
+                    entry, metadataFiles = entriesConverted[-1]
+                    data_metadata = self.to_compressor(
+                                        filename=self.FILE_CBR_CBZ_,
+                                        basedir=self.BASE_DIR_,
+                                        listCompressorData=[],
+                                        join_files=True,
+                                        compressor=self.get_compressor_file(
+                                                    filename=entry.path,
+                                                    compressor=compressor_type
+                                                ),
+                                        dest=self.CONVERTED_COMICPY_PATH_
+                                    ) or []
+            finally:
+                if manifest is not None:
+                    for entry, metadataFiles in entriesConverted:
+                        manifest.update(
+                            entry=entry,
+                            settings=settings,
+                            outputs=data_metadata if join else metadataFiles
+                        )
+                    manifest.save()
+
+            self.__handle_duplicates(
+                    duplicates=duplicates,
+                    results=results,
+                    link=dedupe == 'link' and join is False,
+                    inputs={entry.path for entry in entriesAll}
+                )
+
+            if join is False:
+                for entry in entriesAll:
+                    data_metadata += results.get(entry.path, [])
+
+            self.__reset_names_counter_handlers()
+
+            return data_metadata
+
+    def find_duplicates(
+        self,
+        entries: List[os.DirEntry],
+        index_path: str = None
+    ) -> Dict[str, List[os.DirEntry]]:
+        """
+        Finds the files with the same content, see `DuplicateIndex`. The
+        hashes are stored in the index to be used by other runs.
 
+        Args
+            entries: `os.DirEntry` instances of files, sorted, the first file
+                     of each content is the original.
+            index_path: path of index. Default is
+                        `~/comicpyData/dedupe_index.json`.
+
+        Returns
+            dict: duplicates by path of original, only originals with
+                  duplicates.
+        """
+        with span('dedupe', files=len(entries)):
+            index = DuplicateIndex(path=index_path)
+            duplicates = index.find_duplicates(entries=entries)
+            index.save()
+        return duplicates
+
+    def __select_originals(
+        self,
+        duplicates: Dict[str, List[os.DirEntry]],
+        entriesComic: List[os.DirEntry],
+        entries: List[os.DirEntry]
+    ) -> Dict[str, List[os.DirEntry]]:
+        """
+        Chooses the original of each content among the inputs of the filter,
+        the contents without inputs are dropped.
+
+        Args
+            duplicates: duplicates by path of original, found in all the
+                        comic files of the tree.
+            entriesComic: `os.DirEntry` instances of all the comic files.
+            entries: `os.DirEntry` instances of inputs, sorted.
+
+        Returns
+            dict: duplicates by path of the first input of each content.
+        """
+        entriesPath = {entry.path: entry for entry in entriesComic}
+        inputs = {entry.path for entry in entries}
+        results = {}
+        for original, entriesCopy in duplicates.items():
+            group = [entriesPath[original]] + entriesCopy
+            selected = [entry for entry in group if entry.path in inputs]
+            if len(selected) == 0:
+                continue
+            results[selected[0].path] = [
+                entry for entry in group if entry is not selected[0]
+            ]
+        return results
+
+    def __handle_duplicates(
+        self,
+        duplicates: Dict[str, List[os.DirEntry]],
+        results: Dict[str, List[dict]],
+        link: bool,
+        inputs: set = None
+    ) -> None:
+        """
+        Reports the duplicates not converted and, with `link`, links the
+        outputs of the original to the names of outputs of each duplicate
+        that is an input, whose metadata is added to `results`.
+        """
+        for original, entriesCopy in duplicates.items():
+            outputs = results.get(original) or []
+            name_original, _ = Paths.splitext(
+                            Paths.get_basename(original).replace(' ', '_')
+                        )
+            for entry in entriesCopy:
+                print('"%s" is a duplicate of "%s".' % (entry.path, original))
+                if not link or (inputs is not None and
+                                entry.path not in inputs):
+                    continue
+                name_copy, _ = Paths.splitext(
+                            Paths.get_basename(entry.path).replace(' ', '_')
+                        )
+                linked = []
+                for item in outputs:
                     name_, extension_ = Paths.splitext(
-                                                path=str(item_path)
-                                            )
-                    extension = extension_.lower()
+                                Paths.get_basename(item['name'])
+                            )
+                    # only the outputs named after the original file.
+                    if name_ != name_original or name_copy == name_original:
+                        continue
+                    path_link = Paths.build(
+                                    Paths.get_dirname(item['name']),
+                                    name_copy + extension_
+                                )
+                    if Paths.link(source=item['name'], dest=path_link):
+                        linked.append(dict(item, name=path_link))
+                results[entry.path] = linked
+
+    def __convert_serial(
+        self,
+        entries: List[os.DirEntry],
+        compressor: str,
+        password: str,
+        resize: str,
+        motor: str
+    ) -> Iterator[Tuple[os.DirEntry, Union[List[dict], None]]]:
+        """
+        Converts the files one by one, the next files are read ahead while
+        the current one is converted.
 
-                    if extension == '.pdf':
-                        # print('>> DIR PDF')
-                        metadataFiles = self.process_pdf(
-                                                filename=str(item_path),
-                                                compressor=compressor_type,
+        Returns
+            iterator: tuples with the entry of each file and the metadata of
+                      its outputs, in the order of the entries.
+        """
+        self.prefetcher = Prefetcher(
+                            paths=[entry.path for entry in entries],
+                            depth=self.prefetch,
+                            iostats=self.iostats,
+                            context=self.contexts.context
+                        )
+        try:
+            for entry in entries:
+                self.contexts.context.check_cancelled()
+                if entry is entries[-1]:
+                    self.LAST_ITEM_ = True
+
+                # an invalid file is reported and skipped, as by the
+                # worker processes of `__convert_jobs`.
+                try:
+                    with span('file', filename=entry.path), \
+                            profile_file(filename=entry.path):
+                        metadataFiles = self.process_file(
+                                                filename=entry.path,
+                                                compressor=compressor,
+                                                password=password,
                                                 resize=resize,
-                                                motor=motor,
+                                                motor=motor
                                             )
-                    elif extension == '.zip' or extension == '.cbz':
-                        # print('>> DIR ZIP')
-                        metadataFiles = self.process_zip(
-                                            filename=str(item_path),
-                                            password=password,
-                                            resize=resize
+                except ErrorFileBase as e:
+                    print('%s: %s\n' % (entry.path, e))
+                    metadataFiles = None
+                yield entry, metadataFiles
+        finally:
+            self.prefetcher.close()
+            self.prefetcher = None
+
+    def __convert_jobs(
+        self,
+        entries: List[os.DirEntry],
+        jobs: int,
+        compressor: str,
+        password: str,
+        resize: str,
+        motor: str
+    ) -> Iterator[Tuple[os.DirEntry, Union[List[dict], None]]]:
+        """
+        Converts the files in a pool of processes. Without join, each process
+        converts and writes its file; with join, the processes only extract
+        the content and the files are written here, in the order of the
+        entries. At most `2 * jobs` files are in progress, so the results
+        waiting to be written are bounded.
+
+        Returns
+            iterator: tuples with the entry of each file and the metadata of
+                      its outputs, in the order of the entries.
+        """
+        options = self.get_job_options(jobs=jobs)
+        tasks = deque(
+                    {
+                        'filename': entry.path,
+                        'compressor': compressor,
+                        'password': password,
+                        'resize': resize,
+                        'motor': motor,
+                        'join': self.join_files,
+                        'directory_path': self.directory_path,
+                        'base_dir': self.BASE_DIR_,
+                        'converted_path': self.CONVERTED_COMICPY_PATH_,
+                        'options': options,
+                        'trace': get_tracer() is not None
+                    }
+                    for entry in entries
+                )
+
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = deque()
+            try:
+                for entry in entries:
+                    self.contexts.context.check_cancelled()
+                    while tasks and len(futures) < 2 * jobs:
+                        futures.append(
+                            executor.submit(convert_file, tasks.popleft())
+                        )
+                    result = futures.popleft().result()
+                    self.imageshandler.merge_stats(stats=result['stats'])
+                    self.contexts.context.metrics.merge(
+                                            stats=result['metrics']
                                         )
-                    elif extension == '.rar' or extension == '.cbr':
-                        # print('>> DIR RAR')
-                        metadataFiles = self.process_rar(
-                                                filename=str(item_path),
-                                                password=password,
-                                                resize=resize
-                                            )
+                    if result['trace'] and get_tracer() is not None:
+                        get_tracer().add_events(events=result['trace'])
 
-                    if metadataFiles is not None:
-                        if self.join_files:
-                            if data_metadata == []:
-                                data_metadata += metadataFiles
-                            else:
-                                data_metadata = metadataFiles
-                        else:
-                            data_metadata += metadataFiles
+                    if entry is entries[-1]:
+                        self.LAST_ITEM_ = True
 
-            self.__reset_names_counter_handlers()
+                    if result['error'] is not None:
+                        print('%s: %s\n' % (entry.path, result['error']))
+                        yield entry, None
+                    elif self.join_files:
+                        yield entry, self.__write_extracted(
+                                            filename=entry.path,
+                                            data=result['data'],
+                                            compressor=compressor
+                                        )
+                    else:
+                        yield entry, result['metadata']
+            finally:
+                for future in futures:
+                    future.cancel()
 
-            return data_metadata
+    def __write_extracted(
+        self,
+        filename: str,
+        data: Union[CompressorFileData, None],
+        compressor: str
+    ) -> Union[List[dict], None]:
+        """
+        Writes the content of a file extracted by other process. The images of
+        PDF files are renamed, continuing the counter of joined files.
+        """
+        if data is None:
+            return None
+
+        compressor_file = self.get_compressor_file(
+                                filename=filename,
+                                compressor=compressor
+                            )
+        if self.get_file_type(filename=filename) == 'pdf':
+            data = self.pdfphandler.rename_images(pdfFileCompressor=data)
+
+        return self.write_content(
+                        filename=filename,
+                        compressorFileData=data,
+                        compressor=compressor_file
+                    )
+
+    def get_job_options(
+        self,
+        jobs: int = 1
+    ) -> dict:
+        """
+        Returns the arguments used to create the `ComicPy` instances of the
+        worker processes of `process_dir`.
+
+        Args
+            jobs: number of worker processes, the memory limit is divided
+                  between them.
+
+        Returns
+            dict: arguments of constructor.
+        """
+        options = self.imageshandler.get_options()
+        cache = self.imageshandler.cache
+        memory_limit = self.budget.limit
+        if memory_limit is not None:
+            # the limit is shared by the worker processes.
+            memory_limit = max(memory_limit // jobs, 1)
+        return {
+            'unit': self.unit,
+            'exec_path_rar': self.exec_path_rar,
+            'show_progress': self.show_progress,
+            'grayscale': options['grayscale'],
+            'profile': options['profile'],
+            'page_budget': options['page_budget'],
+            'cache': cache is not None,
+            'cache_size': cache.max_size if cache is not None else 0,
+            'cache_path': cache.path if cache is not None else None,
+            'memory_limit': memory_limit,
+            'near_duplicates': options['near_duplicates'],
+            # the spans of workers are sent to this process.
+            'trace': False
+        }
+
+    def __get_settings(
+        self,
+        compressor: str,
+        resize: str,
+        motor: str,
+        join: bool
+    ) -> dict:
+        """
+        Returns the settings that change the output of a conversion, recorded
+        in the manifest of incremental conversions.
+        """
+        return {
+            'compressor': compressor,
+            'resize': resize,
+            'motor': motor,
+            'join': join,
+            'profile': self.imageshandler.profile.key(),
+            'page_budget': self.imageshandler.page_budget,
+            'grayscale': self.imageshandler.grayscale,
+            'near_duplicates': self.imageshandler.near_duplicates
+        }
 
     def __reset_names_counter_handlers(self) -> None:
         """
         Resets CBR or CBZ names and counters of images in handlers and status
         of `ComicPy`.
         """
-        # handlers
-        self.ziphandler.reset_names()
-        self.rarhandler.reset_names()
-        self.pdfphandler.reset_counter()
-        self.directoryhandler.reset_counter()
+        # handlers, only those created.
+        if 'zip' in self.handlers:
+            self.ziphandler.reset_names()
+        if 'rar' in self.handlers:
+            self.rarhandler.reset_names()
+        if 'pdf' in self.handlers:
+            self.pdfphandler.reset_counter()
+        if 'directory' in self.handlers:
+            self.directoryhandler.reset_counter()
         # ComicPy instance
         self.BASE_DIR_ = None
         self.CONVERTED_COMICPY_PATH_ = None
@@ -780,6 +2222,7 @@ class ComicPy:
         basedir: str = None,
         dest: str = None,
         compressor: Literal['rar', 'zip'] = 'zip',
+        last_item: bool = None
     ) -> List[dict]:
         """
         Convert data of list of CompressorFileData to only RAR or ZIP file.
@@ -792,14 +2235,24 @@ class ComicPy:
             basedir: name of directory base to store files CBR or CBZ.
             dest: destine to final file.
             compressor: ['rar', 'zip'], by default `zip`, compressor to use.
+            last_item: `True` if it is the last content of a joined file, by
+                       default `LAST_ITEM_`.
 
         Returns:
             list: list of directories of metadata of file CBR o CBZ.
             None: if the list of images is empty, the file has no images.
         """
+        if last_item is None:
+            last_item = self.LAST_ITEM_
+
         if type(listCompressorData) is not list:
             listCompressorData = [listCompressorData]
 
+        listCompressorData = self.__drop_near_duplicates(
+                                    images=listCompressorData,
+                                    output=filename
+                                )
+
         if compressor == 'zip':
             metadata = self.ziphandler.to_zip(
                                 pathCBZconverted=filename,
@@ -807,7 +2260,7 @@ class ComicPy:
                                 data_list=listCompressorData,
                                 join=join_files,
                                 converted_comicpy_path=dest,
-                                last_item=self.LAST_ITEM_
+                                last_item=last_item
                             )
         elif compressor == 'rar':
             metadata = self.rarhandler.to_rar(
@@ -816,7 +2269,7 @@ class ComicPy:
                                 data_list=listCompressorData,
                                 join=join_files,
                                 converted_comicpy_path=dest,
-                                last_item=self.LAST_ITEM_
+                                last_item=last_item
                             )
 
         if metadata is None:
@@ -827,6 +2280,37 @@ class ComicPy:
 
         return metadata
 
+    def __drop_near_duplicates(
+        self,
+        images: List[ImageComicData],
+        output: str
+    ) -> List[ImageComicData]:
+        """
+        Drops the images near duplicate of pages already written to the
+        output, the hashes are kept in the context of the conversion while
+        the output does not change, so joined files are compared with the
+        pages of the previous files.
+
+        Args
+            images: list of `ImageComicData` instances.
+            output: name of output file.
+
+        Returns
+            List[ImageComicData]: images kept, in the same order.
+        """
+        if self.imageshandler.near_duplicates is None:
+            return images
+        from comicpy.handlers.imageshandler import PageHashes
+        context = self.contexts.context
+        if context.page_hashes is None or \
+                context.page_hashes.output != output:
+            context.page_hashes = PageHashes(output=output)
+        return self.imageshandler.drop_near_duplicates(
+                        images=images,
+                        hashes=context.page_hashes,
+                        context=context
+                    )
+
     def to_write(
         self,
         listCurrentFiles: List[CurrentFile],
@@ -890,31 +2374,128 @@ class ComicPy:
                 info_list.append(infoFileZip)
         return info_list
 
+    def __validating_check_level(
+        self,
+        level: str
+    ) -> None:
+        """
+        Validating level of `check_integrity`.
+
+        Raises:
+            ValueError: if "level" is not valid.
+        """
+        if level not in ComicPy.CHECK_LEVELS:
+            raise ValueError(
+                    '"level" must be one of: %s.' % ', '.join(
+                                                    ComicPy.CHECK_LEVELS
+                                                )
+                )
+
     def check_integrity(
         self,
         filename: str,
         show: bool = True,
+        level: Literal['header', 'structure', 'decode'] = 'header',
+        workers: int = None
     ) -> bool:
         """
-        Checks if the output archive (RAR or ZIP) is valid, looking for its
-        file signatures.
+        Checks if the output archive (RAR or ZIP) is valid, without reading
+        it into memory.
 
         Args:
             filename: ZIP or RAR output file name, given of method `write_cbr`
                       or `write_cbz`.
             show: boolean to print on terminal. Default is `True`.
+            level: 'header' compares the first bytes with the file
+                   signatures, 'structure' also parses the central directory
+                   or the RAR headers and checks the CRC of each member,
+                   'decode' also decodes every image in parallel. Default is
+                   'header'.
+            workers: number of threads decoding images with 'decode', `None`
+                     uses the number of CPUs.
 
         Returns
             bool: boolean if file is stored on right place and can be read.
+            None: if the extension has no signature, or the RAR command is
+                  not installed to check a CBR file.
+
+        Raises:
+            ValueError: if "level" is not valid.
         """
-        fileCompressed = self.read(filename=filename)
-        is_valid = self.checker.check(currenf_file=fileCompressed)
-        name_ = Paths.get_basename(fileCompressed.filename)
+        self.__validating_check_level(level=level)
+        with span('check', cat='check', level=level, filename=filename):
+            is_valid = self.checker.check_header(filename=filename)
+            if is_valid is True and level != 'header':
+                _, extension = Paths.splitext(filename)
+                if extension.lower() in (ValidExtensions.CBR,
+                                         ValidExtensions.RAR):
+                    handler = self.rarhandler
+                else:
+                    handler = self.ziphandler
+                is_valid = handler.verify(
+                                filename=filename,
+                                decode=level == 'decode',
+                                workers=workers
+                            )
+        name_ = Paths.get_basename(filename)
         if show:
             string = 'File "%s" is valid?:  "%s"' % (name_, is_valid)
             print(string)
         return is_valid
 
+    def check_integrity_batch(
+        self,
+        filenames: List[str],
+        show: bool = True,
+        level: Literal['header', 'structure', 'decode'] = 'header',
+        workers: int = None
+    ) -> dict:
+        """
+        Checks the output archives of a batch concurrently, one thread by
+        file, see `check_integrity`.
+
+        Args:
+            filenames: paths of ZIP or RAR output files.
+            show: boolean to print on terminal, in the order of `filenames`.
+                  Default is `True`.
+            level: 'header', 'structure' or 'decode'. Default is 'header'.
+            workers: number of threads checking files, `None` uses the
+                     number of CPUs, they are shared with the decoding of
+                     images.
+
+        Returns
+            dict: result of `check_integrity` by file name.
+
+        Raises:
+            ValueError: if "level" is not valid.
+        """
+        self.__validating_check_level(level=level)
+        filenames = list(filenames)
+        if len(filenames) == 0:
+            return {}
+        workers = workers or os.cpu_count() or 1
+        with ThreadPoolExecutor(
+            max_workers=min(workers, len(filenames))
+        ) as executor:
+            results = executor.map(
+                        lambda filename: self.check_integrity(
+                                filename=filename,
+                                show=False,
+                                level=level,
+                                workers=max(workers // len(filenames), 1)
+                            ),
+                        filenames
+                    )
+            checked = dict(zip(filenames, results))
+        if show:
+            for filename, is_valid in checked.items():
+                string = 'File "%s" is valid?:  "%s"' % (
+                                Paths.get_basename(filename),
+                                is_valid
+                            )
+                print(string)
+        return checked
+
     def get_base_converted_path(
         self,
         origin: str,
@@ -999,6 +2580,191 @@ class ComicPy:
 
         return self.FILE_CBR_CBZ_
 
+    async def aprocess_pdf(
+        self,
+        filename: str,
+        dest: str = '.',
+        compressor: Literal['rar', 'zip'] = 'zip',
+        resize: Literal['preserve', 'small', 'medium', 'large'] = 'preserve',
+        motor: Literal['pymupdf'] = 'pymupdf'
+    ) -> Union[List[dict], None]:
+        """
+        Async version of `process_pdf`, see `run_async`.
+        """
+        return await self.run_async(
+                            self.process_pdf,
+                            filename=filename,
+                            dest=dest,
+                            compressor=compressor,
+                            resize=resize,
+                            motor=motor
+                        )
+
+    async def aprocess_zip(
+        self,
+        filename: str,
+        dest: str = '.',
+        password: str = None,
+        resize: Literal['preserve', 'small', 'medium', 'large'] = 'preserve',
+    ) -> Union[List[dict], None]:
+        """
+        Async version of `process_zip`, see `run_async`.
+        """
+        return await self.run_async(
+                            self.process_zip,
+                            filename=filename,
+                            dest=dest,
+                            password=password,
+                            resize=resize
+                        )
+
+    async def aprocess_rar(
+        self,
+        filename: str,
+        dest: str = '.',
+        password: str = None,
+        resize: Literal['preserve', 'small', 'medium', 'large'] = 'preserve',
+    ) -> Union[List[dict], None]:
+        """
+        Async version of `process_rar`, see `run_async`.
+        """
+        return await self.run_async(
+                            self.process_rar,
+                            filename=filename,
+                            dest=dest,
+                            password=password,
+                            resize=resize
+                        )
+
+    async def aprocess_dir(
+        self,
+        directory_path: str,
+        extension_filter: Literal['rar', 'zip', 'pdf', 'cbz', 'cbr', 'images'],
+        dest: str = '.',
+        password: str = None,
+        compressor: Literal['rar', 'zip'] = 'zip',
+        join: bool = False,
+        resize: Literal['preserve', 'small', 'medium', 'large'] = 'preserve',
+        motor: Literal['pymupdf'] = 'pymupdf',
+        incremental: bool = False,
+        jobs: int = 1,
+        dedupe: Literal['report', 'link'] = None,
+        dedupe_index: str = None
+    ) -> Union[List[dict], None]:
+        """
+        Async version of `process_dir`, see `run_async`.
+        """
+        return await self.run_async(
+                            self.process_dir,
+                            directory_path=directory_path,
+                            extension_filter=extension_filter,
+                            dest=dest,
+                            password=password,
+                            compressor=compressor,
+                            join=join,
+                            resize=resize,
+                            motor=motor,
+                            incremental=incremental,
+                            jobs=jobs,
+                            dedupe=dedupe,
+                            dedupe_index=dedupe_index
+                        )
+
+    async def run_async(
+        self,
+        method: Callable,
+        **kwargs
+    ) -> Any:
+        """
+        Runs a conversion method in a thread, without blocking the event
+        loop, reading, decoding, encoding and writing are done by the thread.
+        At most `concurrency` conversions run at the same time, the others
+        wait their turn.
+
+        If the task is cancelled, the conversion stops at the next page, file
+        or directory, its temporary files are removed and
+        `asyncio.CancelledError` is raised.
+
+        Args
+            method: conversion method, `process_pdf`, `process_dir`, etc.
+            kwargs: arguments of method.
+
+        Returns
+            result of method.
+        """
+        loop = asyncio.get_running_loop()
+        semaphore = self.semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.concurrency)
+            self.semaphores[loop] = semaphore
+
+        async with semaphore:
+            cancel_event = threading.Event()
+            future = loop.run_in_executor(
+                            self.get_async_executor(),
+                            functools.partial(
+                                self.run_cancellable,
+                                method,
+                                cancel_event,
+                                **kwargs
+                            )
+                        )
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                cancel_event.set()
+                # waits for the thread, the slot is free when it stops.
+                await asyncio.wait([future])
+                if not future.cancelled():
+                    future.exception()
+                raise
+
+    def run_cancellable(
+        self,
+        method: Callable,
+        cancel_event: threading.Event,
+        **kwargs
+    ) -> Any:
+        """
+        Runs a conversion method that stops when `cancel_event` is set.
+
+        Raises
+            ConversionCancelled: if the conversion was cancelled.
+        """
+        with self.contexts.enter() as context:
+            context.cancel_event = cancel_event
+            return method(**kwargs)
+
+    def get_async_executor(self) -> ThreadPoolExecutor:
+        """
+        Creates the threads of the async methods the first time they are
+        required.
+        """
+        if self.async_executor is None:
+            self.async_executor = ThreadPoolExecutor(
+                                    max_workers=self.concurrency,
+                                    thread_name_prefix='comicpy-async'
+                                )
+        return self.async_executor
+
+    def close(self) -> None:
+        """
+        Stops the workers used to transcode images and the threads of the
+        async methods, and writes the trace file if tracing is enabled.
+        """
+        self.imageshandler.shutdown()
+        if self.async_executor is not None:
+            self.async_executor.shutdown(wait=True)
+            self.async_executor = None
+        if self.tracer is not None:
+            self.tracer.save()
+
+    def __enter__(self) -> 'ComicPy':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
     def __show_progress(
         self,
         file: str
@@ -1029,3 +2795,64 @@ class ComicPy:
                         type(self).__name__,
                         self.unit
                     )
+
+
+def convert_file(
+    task: dict
+) -> dict:
+    """
+    Converts a file of a directory in a worker process, used by
+    `ComicPy.process_dir` with `jobs`. Without join the file is converted and
+    written, with join only its content is extracted and returned.
+
+    Args
+        task: dictionary with the file name, the arguments of conversion, the
+              output paths of directory and the options of `ComicPy`.
+
+    Returns
+        dict: metadata of outputs, content extracted, error message,
+              statistics of images, metrics of stages and spans recorded,
+              attributed to the file of the task.
+    """
+    result = {
+        'filename': task['filename'],
+        'metadata': None,
+        'data': None,
+        'error': None,
+        'stats': {},
+        'metrics': {},
+        'trace': []
+    }
+    tracer = start_worker_tracing() if task['trace'] else None
+    comic = ComicPy(**task['options'])
+    comic.directory_path = task['directory_path']
+    comic.BASE_DIR_ = task['base_dir']
+    comic.CONVERTED_COMICPY_PATH_ = task['converted_path']
+    comic.join_files = task['join']
+    try:
+        with span('file', filename=task['filename']):
+            if task['join']:
+                result['data'] = comic.extract_file(
+                                        filename=task['filename'],
+                                        compressor=task['compressor'],
+                                        password=task['password'],
+                                        resize=task['resize'],
+                                        motor=task['motor']
+                                    )
+            else:
+                result['metadata'] = comic.process_file(
+                                        filename=task['filename'],
+                                        compressor=task['compressor'],
+                                        password=task['password'],
+                                        resize=task['resize'],
+                                        motor=task['motor']
+                                    )
+    except ErrorFileBase as e:
+        result['error'] = str(e)
+    finally:
+        result['stats'] = comic.imageshandler.stats
+        result['metrics'] = comic.metrics.snapshot()
+        if tracer is not None:
+            result['trace'] = tracer.take()
+        comic.close()
+    return result
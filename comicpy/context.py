@@ -0,0 +1,310 @@
+# -*- coding: utf-8 -*-
+"""
+Conversion contexts.
+
+The state of a conversion (output paths, names of CBR or CBZ files, counters
+of images, etc.) is kept in a `ConversionContext`, one by thread, so one
+`ComicPy` instance and its handlers can run conversions in several threads at
+the same time.
+
+The context of a thread lives while a conversion is running, when the
+outermost conversion ends it is replaced by a new one.
+
+The context owns the bytes of images it acquires from the `MemoryBudget`,
+the bytes not released by the writers are released when it ends. A part of a
+conversion can run in other thread sharing its context, see
+`ConversionContexts.attach`.
+
+The context keeps the `Metrics` of the stages of its conversion, when it ends
+they are kept as the last statistics of the thread and added to the totals.
+"""
+
+from comicpy.exceptionsClasses import ConversionCancelled
+from comicpy.memorybudget import MemoryBudget
+from comicpy.metrics import Metrics
+
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+from uuid import uuid4
+import threading
+import tempfile
+import shutil
+
+from typing import Any, Callable, ContextManager, Iterator
+
+
+class ConversionContext:
+    """
+    Class in charge of keeping the state of a conversion.
+    """
+
+    def __init__(
+        self,
+        budget: MemoryBudget = None
+    ) -> None:
+        """
+        Constructor.
+
+        Args:
+            budget: `MemoryBudget` of the images in flight, `None` has no
+                    limit.
+        """
+        # ComicPy
+        self.directory_path = None
+        self.filename = None
+        self.join_files = False
+        self.BASE_DIR_ = None
+        self.CONVERTED_COMICPY_PATH_ = None
+        self.FILE_CBR_CBZ_ = None
+        self.LAST_ITEM_ = False
+        self.prefetcher = None
+        # PdfHandler and DirectoryHandler
+        self.pdf_number_image = 1
+        self.dir_number_image = 1
+        # ZipHandler
+        self.zip_number_index = 1
+        self.FILE_CBZ_ = None
+        self.FILE_ZIP_ = None
+        self.zip_converted_path = None
+        # RarHandler
+        self.rar_number_index = 1
+        self.FILE_CBR_ = None
+        self.FILE_RAR_ = None
+        self.rar_converted_path = None
+        self.rar_directories = None
+        # ImagesHandler, hashes of the pages written to the current output.
+        self.page_hashes = None
+        # `threading.Event` set to cancel the conversion.
+        self.cancel_event = None
+        self.id = uuid4().hex
+        self.tempdir_ = None
+        self.budget = budget
+        self.metrics = Metrics()
+
+    @property
+    def tempdir(self) -> str:
+        """
+        Temporary directory of the conversion, created the first time it is
+        used, where the RAR files are built.
+        """
+        if self.tempdir_ is None:
+            self.tempdir_ = tempfile.mkdtemp(prefix='comicpy_%s_' % self.id)
+        return self.tempdir_
+
+    def check_cancelled(self) -> None:
+        """
+        Stops the conversion if it was cancelled, called between pages,
+        files and directories.
+
+        Raises
+            ConversionCancelled: if the conversion was cancelled.
+        """
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            raise ConversionCancelled()
+
+    def timer(
+        self,
+        stage: str,
+        bytes_in: int = 0
+    ) -> ContextManager[dict]:
+        """
+        Measures the time of a stage of the conversion, see `Metrics.timer`.
+        """
+        return self.metrics.timer(stage=stage, bytes_in=bytes_in)
+
+    def acquire(
+        self,
+        nbytes: int,
+        wait: bool = True,
+        keep: bool = False
+    ) -> None:
+        """
+        Acquires bytes of images from the budget, waiting while the bytes
+        in flight pass the limit, see `MemoryBudget.acquire`.
+
+        Args
+            nbytes: number of bytes.
+            wait: `False` to acquire the bytes without waiting.
+            keep: `True` for the data of an input file.
+        """
+        if self.budget is not None:
+            self.budget.acquire(
+                nbytes=nbytes,
+                owner=self,
+                wait=wait,
+                keep=keep
+            )
+
+    def release(
+        self,
+        nbytes: int,
+        keep: bool = False
+    ) -> None:
+        """
+        Releases bytes of images written.
+
+        Args
+            nbytes: number of bytes.
+            keep: `True` for the data of an input file.
+        """
+        if self.budget is not None:
+            self.budget.release(nbytes=nbytes, owner=self, keep=keep)
+
+    @contextmanager
+    def keep(
+        self,
+        nbytes: int
+    ) -> Iterator[None]:
+        """
+        Keeps the data of an input file in the budget while its images are
+        extracted.
+
+        Args
+            nbytes: size of the data of file.
+        """
+        self.acquire(nbytes=nbytes, keep=True)
+        try:
+            yield
+        finally:
+            self.release(nbytes=nbytes, keep=True)
+
+    def wait_budget(self) -> None:
+        """
+        Waits while the bytes in flight pass the limit, before producing more
+        images.
+        """
+        if self.budget is not None:
+            self.budget.wait(owner=self)
+
+    def draining(self) -> ContextManager[None]:
+        """
+        Marks the conversion while its images are written as others are
+        produced, see `MemoryBudget.draining`.
+        """
+        if self.budget is None:
+            return nullcontext()
+        return self.budget.draining(owner=self)
+
+    def close(self) -> None:
+        """
+        Removes the temporary directory of the conversion and releases the
+        bytes of its images.
+        """
+        if self.tempdir_ is not None:
+            shutil.rmtree(self.tempdir_, ignore_errors=True)
+            self.tempdir_ = None
+        if self.budget is not None:
+            self.budget.release_all(owner=self)
+
+
+class ConversionContexts(threading.local):
+    """
+    Class in charge of keeping the context of each thread.
+    """
+
+    def __init__(
+        self,
+        budget: MemoryBudget = None,
+        metrics: Metrics = None
+    ) -> None:
+        """
+        Constructor, called once by thread.
+
+        Args:
+            budget: `MemoryBudget` shared by the contexts, `None` has no
+                    limit.
+            metrics: `Metrics` with the totals of the contexts.
+        """
+        self.budget = budget
+        self.metrics = metrics
+        self.context = ConversionContext(budget=budget)
+        self.depth = 0
+        # metrics of the last conversion of the thread.
+        self.last_stats = None
+
+    @contextmanager
+    def enter(self) -> Iterator[ConversionContext]:
+        """
+        Runs a conversion in the context of the current thread. Nested
+        conversions share the context, a new context is created when the
+        outermost conversion ends.
+
+        Returns
+            ConversionContext: context of the conversion.
+        """
+        self.depth += 1
+        try:
+            yield self.context
+        finally:
+            self.depth -= 1
+            if self.depth == 0:
+                self.context.close()
+                self.last_stats = self.context.metrics
+                if self.metrics is not None:
+                    self.metrics.merge(stats=self.last_stats.snapshot())
+                self.context = ConversionContext(budget=self.budget)
+
+    @contextmanager
+    def attach(
+        self,
+        context: ConversionContext
+    ) -> Iterator[ConversionContext]:
+        """
+        Runs in the current thread a part of a conversion of other thread,
+        sharing its context. The context is not closed when it ends, the
+        conversion of the other thread closes it.
+
+        Args
+            context: context of the conversion.
+
+        Returns
+            ConversionContext: context of the conversion.
+        """
+        previous = self.context
+        self.context = context
+        self.depth += 1
+        try:
+            yield context
+        finally:
+            self.depth -= 1
+            self.context = previous
+
+
+class ContextAttribute:
+    """
+    Attribute of an instance kept in the context of the current thread, the
+    instance must have a `contexts` attribute with a `ConversionContexts`
+    instance.
+    """
+
+    def __init__(
+        self,
+        name: str
+    ) -> None:
+        """
+        Constructor.
+
+        Args:
+            name: name of the attribute in `ConversionContext`.
+        """
+        self.name = name
+
+    def __get__(self, instance: Any, owner: type = None) -> Any:
+        if instance is None:
+            return self
+        return getattr(instance.contexts.context, self.name)
+
+    def __set__(self, instance: Any, value: Any) -> None:
+        setattr(instance.contexts.context, self.name, value)
+
+
+def conversion(method: Callable) -> Callable:
+    """
+    Decorator of the methods that run a conversion, they run in the context
+    of the current thread.
+    """
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.contexts.enter():
+            return method(self, *args, **kwargs)
+    return wrapper
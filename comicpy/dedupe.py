@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+"""
+Index of duplicate input files, used by `process_dir` to convert each
+distinct content only once.
+
+The files are grouped by size, the files of the same size by a partial hash
+of their first and last bytes, and only the files with the same partial hash
+by a full hash, so most files are never read completely. The hashes are
+stored with the size and modification time of each file, by default in
+`~/comicpyData/dedupe_index.json`, and they are used again by other runs
+while the file is not changed.
+"""
+
+from comicpy.utils import Paths
+
+from hashlib import blake2b
+import tempfile
+import json
+import os
+
+from typing import Callable, Dict, List
+
+
+class DuplicateIndex:
+    """
+    Class in charge of grouping files by content and keeping their hashes.
+    """
+    FILENAME = 'dedupe_index.json'
+    VERSION = 1
+    # bytes read from the start and from the end of file by the partial hash.
+    PARTIAL_SIZE = 64 * 1024
+
+    def __init__(
+        self,
+        path: str = None
+    ) -> None:
+        """
+        Constructor.
+
+        Args:
+            path: path of index file, default is
+                  `~/comicpyData/dedupe_index.json`.
+        """
+        if path is None:
+            path = Paths.build(Paths.ROOT_PATH, DuplicateIndex.FILENAME)
+        self.path = path
+        self.records = {}
+        self.stats = {'partial': 0, 'full': 0, 'reused': 0}
+        self.load()
+
+    def load(self) -> None:
+        """
+        Loads the records of index, an invalid index is ignored.
+        """
+        try:
+            with open(self.path, 'r', encoding='utf-8') as file:
+                content = json.load(file)
+            if content.get('version') == DuplicateIndex.VERSION:
+                self.records = content['files']
+        except (OSError, ValueError, KeyError, AttributeError):
+            self.records = {}
+
+    def save(self) -> None:
+        """
+        Saves the records of index, the records of files removed are
+        dropped.
+        """
+        self.records = {
+            path: record
+            for path, record in self.records.items()
+            if Paths.exists(path)
+        }
+        directory = Paths.get_dirname(self.path)
+        Paths.check_and_create(path=directory)
+        # unique temporary file, other threads or runs can save at once.
+        descriptor, path_temp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(descriptor, 'w', encoding='utf-8') as file:
+                json.dump(
+                    {'version': DuplicateIndex.VERSION, 'files': self.records},
+                    file
+                )
+            os.replace(path_temp, self.path)
+        except BaseException:
+            Paths.remove(path=path_temp)
+            raise
+
+    def get_record(
+        self,
+        entry: os.DirEntry
+    ) -> dict:
+        """
+        Returns the record of a file, a new one if the file changed since its
+        hashes were calculated.
+        """
+        path = Paths.get_abs_path(entry.path)
+        stat = entry.stat()
+        record = self.records.get(path)
+        if record is None or record['size'] != stat.st_size or \
+                record['mtime'] != stat.st_mtime_ns:
+            record = {
+                'size': stat.st_size,
+                'mtime': stat.st_mtime_ns,
+                'partial': None,
+                'hash': None
+            }
+            self.records[path] = record
+        return record
+
+    def get_partial_hash(
+        self,
+        entry: os.DirEntry
+    ) -> str:
+        """
+        Returns the hash of the first and last `PARTIAL_SIZE` bytes of a
+        file.
+        """
+        record = self.get_record(entry=entry)
+        if record['partial'] is not None:
+            self.stats['reused'] += 1
+            return record['partial']
+
+        hash_ = blake2b(digest_size=20)
+        with open(entry.path, 'rb') as file:
+            hash_.update(file.read(DuplicateIndex.PARTIAL_SIZE))
+            if record['size'] > 2 * DuplicateIndex.PARTIAL_SIZE:
+                file.seek(-DuplicateIndex.PARTIAL_SIZE, os.SEEK_END)
+                hash_.update(file.read(DuplicateIndex.PARTIAL_SIZE))
+            elif record['size'] > DuplicateIndex.PARTIAL_SIZE:
+                hash_.update(file.read())
+        record['partial'] = hash_.hexdigest()
+        self.stats['partial'] += 1
+        return record['partial']
+
+    def get_full_hash(
+        self,
+        entry: os.DirEntry
+    ) -> str:
+        """
+        Returns the hash of the whole file, read by chunks.
+        """
+        record = self.get_record(entry=entry)
+        if record['hash'] is not None:
+            self.stats['reused'] += 1
+            return record['hash']
+        record['hash'] = Paths.get_hash(path=entry.path)
+        self.stats['full'] += 1
+        return record['hash']
+
+    def split(
+        self,
+        entries: List[os.DirEntry],
+        key: Callable[[os.DirEntry], str]
+    ) -> List[List[os.DirEntry]]:
+        """
+        Splits entries into groups with the same key, keeping their order.
+        """
+        groups = {}
+        for entry in entries:
+            groups.setdefault(key(entry), []).append(entry)
+        return list(groups.values())
+
+    def group(
+        self,
+        entries: List[os.DirEntry]
+    ) -> List[List[os.DirEntry]]:
+        """
+        Groups files with the same content, by size, then by partial hash,
+        then by full hash.
+
+        Args
+            entries: `os.DirEntry` instances of files.
+
+        Returns
+            list: groups of entries with the same content, in the order of
+                  their first entry, the entries of each group keep their
+                  order.
+        """
+        position = {entry.path: index for index, entry in enumerate(entries)}
+        groups = []
+        for same_size in self.split(
+            entries=entries,
+            key=lambda entry: entry.stat().st_size
+        ):
+            if len(same_size) == 1:
+                groups.append(same_size)
+                continue
+            for same_partial in self.split(
+                entries=same_size,
+                key=self.get_partial_hash
+            ):
+                if len(same_partial) == 1:
+                    groups.append(same_partial)
+                    continue
+                groups += self.split(
+                            entries=same_partial,
+                            key=self.get_full_hash
+                        )
+        groups.sort(key=lambda group: position[group[0].path])
+        return groups
+
+    def find_duplicates(
+        self,
+        entries: List[os.DirEntry]
+    ) -> Dict[str, List[os.DirEntry]]:
+        """
+        Finds the duplicates of files, the first entry of each content is the
+        original.
+
+        Args
+            entries: `os.DirEntry` instances of files.
+
+        Returns
+            dict: duplicates by path of original, only originals with
+                  duplicates.
+        """
+        return {
+            group[0].path: group[1:]
+            for group in self.group(entries=entries)
+            if len(group) > 1
+        }
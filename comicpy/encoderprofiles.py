@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+"""
+Encoder profiles used to save the images.
+
+Profiles availables.
+* 'original' :  quality 100, same result as previous versions (default).
+* 'high'     :  quality 95, full chroma, progressive and optimized.
+* 'balanced' :  quality 85, progressive and optimized.
+* 'small'    :  quality 75, max PNG compression, keeps WEBP images.
+* 'fast'     :  quality 90, lowest PNG compression, no optimization.
+"""
+
+from comicpy.exceptionsClasses import InvalidEncoderProfile
+
+from typing import Union
+
+
+class EncoderProfile:
+    """
+    Class in charge of keeping the options of the encoders of images.
+    """
+    # lowest quality used to fit a page into the size budget.
+    MIN_QUALITY = 20
+
+    def __init__(
+        self,
+        name: str,
+        quality: int = 100,
+        subsampling: int = None,
+        progressive: bool = False,
+        optimize: bool = False,
+        compress_level: int = 6,
+        keep_webp: bool = False
+    ) -> None:
+        """
+        Constructor.
+
+        Args:
+            name: name of profile.
+            quality: quality of JPEG and WEBP images, 1 to 100.
+            subsampling: chroma subsampling of JPEG images, `0` (4:4:4),
+                         `1` (4:2:2), `2` (4:2:0), `None` uses the default of
+                         Pillow.
+            progressive: `True` to save progressive JPEG images.
+            optimize: `True` to optimize the encoding, slower but smaller.
+            compress_level: compression level of PNG images, 0 to 9.
+            keep_webp: `True` to keep WEBP images, otherwise, they are
+                       converted to JPEG.
+        """
+        self.name = name
+        self.quality = quality
+        self.subsampling = subsampling
+        self.progressive = progressive
+        self.optimize = optimize
+        self.compress_level = compress_level
+        self.keep_webp = keep_webp
+
+    def save_options(
+        self,
+        format: str,
+        quality: int = None
+    ) -> dict:
+        """
+        Returns the arguments of `PIL.Image.save` for the format given.
+
+        Args
+            format: format of image, 'jpeg', 'png' or 'webp'.
+            quality: quality to use instead of the quality of profile.
+
+        Returns
+            dict: options of the encoder.
+        """
+        format = format.lower()
+        if quality is None:
+            quality = self.quality
+
+        if format == 'png':
+            return {
+                'optimize': self.optimize,
+                'compress_level': self.compress_level
+            }
+        elif format == 'webp':
+            return {
+                'quality': quality,
+                'method': 6 if self.optimize else 4
+            }
+
+        options = {
+            'quality': quality,
+            'progressive': self.progressive,
+            'optimize': self.optimize
+        }
+        if self.subsampling is not None:
+            options['subsampling'] = self.subsampling
+        return options
+
+    def is_lossy(
+        self,
+        format: str
+    ) -> bool:
+        """
+        Returns `True` if the quality of format can be reduced.
+        """
+        return format.lower() in ('jpeg', 'webp')
+
+    def key(self) -> str:
+        """
+        Returns a string that identifies the options of the profile.
+        """
+        return '%s:q%s:s%s:p%d:o%d:c%s:w%d' % (
+                    self.name,
+                    self.quality,
+                    self.subsampling,
+                    self.progressive,
+                    self.optimize,
+                    self.compress_level,
+                    self.keep_webp
+                )
+
+    def __str__(self) -> str:
+        return self.__repr__()
+
+    def __repr__(self) -> str:
+        return '<[EncoderProfile: "%s", Quality: "%s"]>' % (
+                        self.name,
+                        self.quality
+                    )
+
+
+EncoderProfiles = {
+    'original': EncoderProfile(
+                    name='original',
+                    quality=100
+                ),
+    'high': EncoderProfile(
+                    name='high',
+                    quality=95,
+                    subsampling=0,
+                    progressive=True,
+                    optimize=True
+                ),
+    'balanced': EncoderProfile(
+                    name='balanced',
+                    quality=85,
+                    progressive=True,
+                    optimize=True
+                ),
+    'small': EncoderProfile(
+                    name='small',
+                    quality=75,
+                    progressive=True,
+                    optimize=True,
+                    compress_level=9,
+                    keep_webp=True
+                ),
+    'fast': EncoderProfile(
+                    name='fast',
+                    quality=90,
+                    compress_level=1
+                ),
+}
+
+
+def get_profile(
+    profile: Union[str, EncoderProfile]
+) -> EncoderProfile:
+    """
+    Returns the encoder profile by its name.
+
+    Args
+        profile: name of profile or `EncoderProfile` instance.
+
+    Returns
+        EncoderProfile: profile.
+
+    Raises
+        InvalidEncoderProfile: if the name of profile is not valid.
+    """
+    if isinstance(profile, EncoderProfile):
+        return profile
+    try:
+        return EncoderProfiles[profile.lower()]
+    except (KeyError, AttributeError):
+        raise InvalidEncoderProfile(profiles=list(EncoderProfiles.keys()))
@@ -111,3 +111,27 @@ class InvalidCompressor(ErrorFileBase):
     ) -> None:
         message = 'Compressor must be "rar" or "zip".'
         super().__init__(message)
+
+
+class ConversionCancelled(BaseException):
+    """
+    Raised inside a conversion when it is cancelled. Like
+    `KeyboardInterrupt`, it is not caught by `except Exception`.
+    """
+    def __init__(
+        self,
+        message: str = 'Conversion cancelled.'
+    ) -> None:
+        super().__init__(message)
+
+
+class InvalidEncoderProfile(Exception):
+    def __init__(
+        self,
+        profiles: list
+    ) -> None:
+        message = 'Encoder profile is not valid.\n'
+        message += 'Availables: %s.\n' % (
+                        ', '.join('"%s"' % i for i in profiles)
+                    )
+        super().__init__(message)
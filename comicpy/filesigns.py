@@ -2,37 +2,50 @@
 """
 Signing of files of interest.
 
+Each type of file has one or more signatures, each one is a tuple of parts
+`(offset, bytes)` that must be found in the first bytes of file, so the type
+is detected reading only `HEADER_SIZE` bytes.
+
 The `CBZ` and `CBR` archives have the same file signatures as `ZIP` and `RAR`
 respectively.
 """
 
-hexSignsDict = {
-    'pdf': {
-        'hexsigns': [
-            '25 50 44 46',
-            '25 50 44 46 2D'
-        ],
-        'byteoffet': 0
-    },
-    'zip': {
-        'hexsigns': [
-            '50 4B 53 70 58',
-            '50 4B 03 04 14 00 01 00',
-            '63 00 00 00 00 00',
-            '50 4B 07 08',
-            '50 4B 4C 49 54 45',
-            '57 69 6E 5A 69 70',
-            '50 4B 03 04',
-            '50 4B 05 06'
-        ],
-        'byteoffet': 0
-    },
-    'rar': {
-        'hexsigns': [
-            '52 61 72 21 1A 07 00',    # RAR version 4
-            '52 61 72 21 1A 07 01 00'  # RAR version 5
-        ],
-        'byteoffet': 0
-    }
+# bytes read from the start of file to detect its type.
+HEADER_SIZE = 16
+
+fileSigns = {
+    'pdf': [
+        ((0, b'%PDF-'),)
+    ],
+    'zip': [
+        ((0, b'PK\x03\x04'),),      # local file header
+        ((0, b'PK\x05\x06'),),      # empty archive
+        ((0, b'PK\x07\x08'),)       # spanned archive
+    ],
+    'rar': [
+        ((0, b'Rar!\x1a\x07\x00'),),        # RAR version 4
+        ((0, b'Rar!\x1a\x07\x01\x00'),)     # RAR version 5
+    ],
+    'jpeg': [
+        ((0, b'\xff\xd8\xff'),)
+    ],
+    'png': [
+        ((0, b'\x89PNG\r\n\x1a\n'),)
+    ],
+    'webp': [
+        ((0, b'RIFF'), (8, b'WEBP'))
+    ]
+}
 
+# type of file by extension.
+extensionsTypes = {
+    'pdf': 'pdf',
+    'zip': 'zip',
+    'cbz': 'zip',
+    'rar': 'rar',
+    'cbr': 'rar',
+    'jpeg': 'jpeg',
+    'jpg': 'jpeg',
+    'png': 'png',
+    'webp': 'webp'
 }
@@ -1,10 +1,40 @@
 # -*- coding: utf-8 -*-
 """
 handlers
+
+The handlers are imported when they are used, each one imports its backend:
+PyMuPDF for PDF files, rarfile and pyzipper for RAR and ZIP files.
 """
 
-from comicpy.handlers.directoryhandler import DirectoryHandler
-from comicpy.handlers.pdfhandler import PdfHandler
-from comicpy.handlers.ziphandler import ZipHandler
-from comicpy.handlers.rarhandler import RarHandler
-from comicpy.handlers.imageshandler import ImagesHandler
+import importlib
+
+from typing import Any, List
+
+
+# module of each handler.
+_LAZY_NAMES = {
+    'DirectoryHandler': 'comicpy.handlers.directoryhandler',
+    'PdfHandler': 'comicpy.handlers.pdfhandler',
+    'ZipHandler': 'comicpy.handlers.ziphandler',
+    'RarHandler': 'comicpy.handlers.rarhandler',
+    'ImagesHandler': 'comicpy.handlers.imageshandler'
+}
+
+__all__ = list(_LAZY_NAMES)
+
+
+def __getattr__(name: str) -> Any:
+    """
+    Imports a handler on first use.
+    """
+    if name not in _LAZY_NAMES:
+        raise AttributeError(
+            "module 'comicpy.handlers' has no attribute '%s'" % name
+        )
+    value = getattr(importlib.import_module(_LAZY_NAMES[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
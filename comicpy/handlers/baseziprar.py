@@ -6,24 +6,35 @@ Base class for ZIP and RAR handlers.
 from comicpy.handlers.imageshandler import ImagesHandler
 from comicpy.valid_extensions import ValidExtensions
 from comicpy.utils import Paths
+from comicpy.context import ConversionContexts
 from comicpy.exceptionsClasses import BadPassword
+from comicpy.tracing import span, traced
 
 from comicpy.models import (
     CurrentFile,
     CompressorFileData
 )
 
-from rarfile import RarFile
-from rarfile import BadRarFile
 from pyzipper import AESZipFile
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ThreadPoolExecutor,
+    wait
+)
+import zipfile
 import io
+import os
 
 from typing import (
+    TYPE_CHECKING,
     Union,
     TypeVar,
     Literal
 )
 
+if TYPE_CHECKING:
+    from rarfile import RarFile
+
 
 class BaseZipRarHandler:
     """
@@ -34,6 +45,7 @@ class BaseZipRarHandler:
         """
         """
         self.imageshandler = ImagesHandler()
+        self.contexts = ConversionContexts()
 
     def reset_counter(self) -> None:
         """
@@ -43,7 +55,7 @@ class BaseZipRarHandler:
 
     def read_file(
         self,
-        instanceCompress: Union[RarFile, AESZipFile],
+        instanceCompress: Union['RarFile', AESZipFile],
         itemFile: bytes,
         password: str = None,
     ) -> Union[bytes, None]:
@@ -59,23 +71,34 @@ class BaseZipRarHandler:
             bytes: data of file.
         """
         try:
-            if isinstance(instanceCompress, AESZipFile):
-                return instanceCompress.read(itemFile)
-            elif isinstance(instanceCompress, RarFile):
-                return instanceCompress.read(
-                                        itemFile,
-                                        pwd=password
-                                    )
+            with self.contexts.context.timer(stage='extract') as record, \
+                    span('read_file', cat='archive', item=itemFile):
+                if isinstance(instanceCompress, AESZipFile):
+                    data = instanceCompress.read(itemFile)
+                else:
+                    # `rarfile` is imported only for RAR files.
+                    from rarfile import BadRarFile
+                    # RAR members are read by the unrar command.
+                    try:
+                        with span('unrar', cat='subprocess'):
+                            data = instanceCompress.read(
+                                                    itemFile,
+                                                    pwd=password
+                                                )
+                    except BadRarFile as e:
+                        # print('Incorrect password file RAR.')
+                        return -1
+                record['bytes_in'] = \
+                    instanceCompress.getinfo(itemFile).compress_size
+                record['bytes_out'] = len(data)
+            return data
         except RuntimeError as e:
             # print('Incorrect password file ZIP.')
             return None
-        except BadRarFile as e:
-            # print('Incorrect password file RAR.')
-            return -1
 
     def exists_valid_files(
         self,
-        instanceCompress: Union[RarFile, AESZipFile],
+        instanceCompress: Union['RarFile', AESZipFile],
     ) -> bool:
         """
         Checks that the RAR or ZIP file has valid files.
@@ -100,9 +123,58 @@ class BaseZipRarHandler:
         else:
             return False
 
+    @traced(cat='archive')
+    def decode_members(
+        self,
+        instanceCompress: Union['RarFile', zipfile.ZipFile],
+        workers: int = None
+    ) -> bool:
+        """
+        Reads every member of the RAR or ZIP file, which checks its CRC, and
+        decodes the images in parallel. Each member is read while the
+        previous images are decoded, at most two images by worker are kept
+        in memory.
+
+        Args
+            instanceCompress: `RarFile` or `ZipFile` instance.
+            workers: number of threads decoding images, `None` uses the
+                     number of CPUs.
+
+        Returns
+            bool: `True` if all members are read and all images decoded,
+                  otherwise, `False`.
+        """
+        workers = workers or os.cpu_count() or 1
+        images_Extensions = tuple(self.validextentions.get_images_extensions())
+        pending = set()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            try:
+                for item in instanceCompress.infolist():
+                    if item.is_dir():
+                        continue
+                    data = instanceCompress.read(item)
+                    if not item.filename.lower().endswith(images_Extensions):
+                        continue
+                    pending.add(executor.submit(
+                                    self.imageshandler.is_decodable,
+                                    data
+                                ))
+                    if len(pending) >= workers * 2:
+                        done, pending = wait(
+                                            pending,
+                                            return_when=FIRST_COMPLETED
+                                        )
+                        if not all(future.result() for future in done):
+                            return False
+                return all(future.result() for future in pending)
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    @traced(cat='archive')
     def iterateFiles(
         self,
-        instanceCompress: Union[RarFile, AESZipFile],
+        instanceCompress: Union['RarFile', AESZipFile],
         type_compress: str,
         join: bool,
         password: str = None,
@@ -126,6 +198,9 @@ class BaseZipRarHandler:
         """
         images_Extensions = self.validextentions.get_images_extensions()
         listContentData = []
+        # positions of images in `listContentData` and their arguments.
+        images_positions = []
+        images_arguments = []
         # imagesCollector = {}
         directory_name = None
 
@@ -139,7 +214,10 @@ class BaseZipRarHandler:
         #     self.reset_counter()
 
         items = 0
+        # bytes of the images read, released when they are transcoded.
+        raw_bytes = 0
         for item in instanceCompress.namelist():
+            self.contexts.context.check_cancelled()
             directory_name = Paths.get_dirname(item).replace(' ', '_')
             name_file = Paths.get_basename(item)
             # print(name_file, directory_name)
@@ -209,19 +287,30 @@ class BaseZipRarHandler:
                 if rawDataFile is None:
                     raise BadPassword
                 else:
-                    image_comic = self.imageshandler.new_image(
-                                            name_image=file_name,
-                                            currentImage=rawDataFile,
-                                            extension=extension_[1:].upper(),
-                                            sizeImage=resize,
-                                            unit=self.unit
-                                        )
-
-                    listContentData.append(image_comic)
+                    self.contexts.context.acquire(nbytes=len(rawDataFile))
+                    raw_bytes += len(rawDataFile)
+                    images_positions.append(len(listContentData))
+                    images_arguments.append({
+                            'name_image': file_name,
+                            'currentImage': rawDataFile,
+                            'extension': extension_[1:].upper(),
+                            'sizeImage': resize,
+                            'unit': self.unit
+                        })
+                    listContentData.append(None)
 
         if len(listContentData) == 0:
             return None
 
+        images_comic = self.imageshandler.new_images(
+                                images=images_arguments,
+                                context=self.contexts.context
+                            )
+        del images_arguments
+        self.contexts.context.release(nbytes=raw_bytes)
+        for position, image_comic in zip(images_positions, images_comic):
+            listContentData[position] = image_comic
+
         fileContainerCompressor = CompressorFileData(
                                 filename=directory_name,
                                 list_data=listContentData,
@@ -254,8 +343,14 @@ class BaseZipRarHandler:
             dict: compressor file information. Keys `'name'`, `'size'`.
         """
         path_file = currentFileInstance.path
-        with open(path_file, 'wb') as file:
-            file.write(currentFileInstance.bytes_data.getvalue())
+        data = currentFileInstance.bytes_data.getvalue()
+        with self.contexts.context.timer(
+            stage='write',
+            bytes_in=len(data)
+        ) as record:
+            with open(path_file, 'wb') as file:
+                file.write(data)
+            record['bytes_out'] = len(data)
 
         return {
                 'name': path_file,
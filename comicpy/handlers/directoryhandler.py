@@ -7,12 +7,17 @@ recursively within directories, sorted alphanumerically.
 from comicpy.handlers.imageshandler import ImagesHandler
 from comicpy.valid_extensions import ValidExtensions
 from comicpy.utils import Paths
+from comicpy.prefetcher import Prefetcher, IOStats
+from comicpy.context import ConversionContexts, ContextAttribute
 
 from comicpy.models import (
     CompressorFileData
 )
 
 from typing import (
+    Iterator,
+    List,
+    Tuple,
     TypeVar,
     Union,
     Literal
@@ -25,20 +30,41 @@ class DirectoryHandler:
     Respecting the alphanumeric order of the images.
     Rescaling the images if indicated.
     """
+    # state of the conversion of the current thread.
+    number_image = ContextAttribute('dir_number_image')
 
     def __init__(
         self,
         unit: Literal['b', 'kb', 'mb', 'gb'] = 'mb',
+        imageshandler: ImagesHandler = None,
+        prefetch: int = 2,
+        iostats: IOStats = None,
+        contexts: ConversionContexts = None
     ) -> None:
         """
         Constructor.
 
         Args:
             unit: indicate unit of measure using to represent file size.
+            imageshandler: `ImagesHandler` instance used to transcode images,
+                           by default a new one without parallelism.
+            prefetch: number of images read ahead in background threads.
+                      Default is `2`.
+            iostats: `IOStats` instance to keep the statistics of reads, by
+                     default a new one.
+            contexts: `ConversionContexts` instance with the state of the
+                      conversions, shared with `ComicPy`, by default a new
+                      one.
         """
         self.unit = unit
-        self.imageshandler = ImagesHandler()
-        self.number_image = 1
+        if imageshandler is None:
+            imageshandler = ImagesHandler()
+        self.imageshandler = imageshandler
+        self.prefetch = prefetch
+        self.iostats = iostats if iostats is not None else IOStats()
+        if contexts is None:
+            contexts = ConversionContexts()
+        self.contexts = contexts
         self.separator = Paths.get_separator()
 
     def reset_counter(self) -> None:
@@ -69,11 +95,14 @@ class DirectoryHandler:
         compressor: str,
         join: bool,
         resizeImage: Literal['preserve', 'small', 'medium', 'large'] = 'preserve',
-    ) -> Union[CompressorFileData, None]:
+    ) -> Union[List[CompressorFileData], None]:
         """
         Takes a directory path, search for images and return of
         `CompressorFileData` with data of images.
 
+        Keeps all images in memory, `iter_dir` gives the images of each
+        directory as soon as they are ready.
+
         Args:
             directoryPath: directory path.
             compressor: type of compressor to use.
@@ -83,6 +112,60 @@ class DirectoryHandler:
         Returns:
             CompressorFileData`: instance with all images in directories.
         """
+        listImagesData = []
+        listCompressorFileData = []
+        for imagesDirectoryCompress, is_last in self.iter_dir(
+                                                directoryPath=directoryPath,
+                                                compressor=compressor,
+                                                join=join,
+                                                resizeImage=resizeImage
+                                            ):
+            if join is False:
+                listCompressorFileData.append(imagesDirectoryCompress)
+            else:
+                listImagesData += imagesDirectoryCompress.list_data
+                name_directory = imagesDirectoryCompress.filename
+
+        if join and len(listImagesData) > 0:
+            imagesDirectoryCompress = CompressorFileData(
+                                        filename=name_directory,
+                                        list_data=listImagesData,
+                                        type=compressor,
+                                        unit=self.unit
+                                    )
+            listCompressorFileData.append(imagesDirectoryCompress)
+
+        if len(listCompressorFileData) == 0:
+            return None
+        return listCompressorFileData
+
+    def iter_dir(
+        self,
+        directoryPath: str,
+        compressor: str,
+        join: bool,
+        resizeImage: Literal['preserve', 'small', 'medium', 'large'] = 'preserve',
+    ) -> Iterator[Tuple[CompressorFileData, bool]]:
+        """
+        Takes a directory path, search for images and gives a
+        `CompressorFileData` with the images of each directory, as soon as
+        they are ready. Only the images of one directory are kept in memory.
+
+        With `join`, all instances have the name of the base directory and
+        the images are numbered continuously, so they can be written into the
+        same file.
+
+        Args:
+            directoryPath: directory path.
+            compressor: type of compressor to use.
+            join: bool if the directories are merged into one.
+            resizeImage: new size of the images.
+
+        Returns:
+            iterator: tuples with `CompressorFileData` instance with the
+                      images of a directory and `True` if it is the last
+                      directory.
+        """
 
         imagesExtensions = [
             ValidExtensions.JPEG,
@@ -106,10 +189,46 @@ class DirectoryHandler:
 
         # print(filesDict, basenameDirectory)
 
-        listImagesData = []
-        listCompressorFileData = []
+        # images of next directories are read while the current one is
+        # transcoded.
+        prefetcher = Prefetcher(
+                        paths=[
+                            image
+                            for listImagePath in filesDict.values()
+                            for image in listImagePath
+                        ],
+                        depth=self.prefetch,
+                        iostats=self.iostats,
+                        reader=self.read,
+                        context=self.contexts.context
+                    )
+        with prefetcher:
+            yield from self.iter_images(
+                            filesDict=filesDict,
+                            prefetcher=prefetcher,
+                            basenameDirectory=basenameDirectory,
+                            compressor=compressor,
+                            join=join,
+                            resizeImage=resizeImage
+                        )
+
+    def iter_images(
+        self,
+        filesDict: dict,
+        prefetcher: Prefetcher,
+        basenameDirectory: str,
+        compressor: str,
+        join: bool,
+        resizeImage: str
+    ) -> Iterator[Tuple[CompressorFileData, bool]]:
+        """
+        Transcodes the images grouped by directory, read by the prefetcher.
+        Used by `iter_dir`.
+        """
         name_directory = None
+        keys = list(filesDict.keys())
         for key, listImagePath in filesDict.items():
+            self.contexts.context.check_cancelled()
             # print(listImagePath)
             if join is False:
                 self.reset_counter()
@@ -117,11 +236,16 @@ class DirectoryHandler:
             else:
                 name_directory = basenameDirectory.replace(' ', '_')
 
-            images_directory = []
+            images_arguments = []
+            raw_bytes = 0
             for image in listImagePath:
                 file_name = image.name
                 path_image = str(image)
-                dataImage = self.read(filename=path_image)
+                with self.contexts.context.timer(stage='read') as record:
+                    dataImage = prefetcher.get(path=path_image)
+                    record['bytes_in'] = record['bytes_out'] = len(dataImage)
+                self.contexts.context.acquire(nbytes=len(dataImage))
+                raw_bytes += len(dataImage)
                 # print(basenameDirectory, path_image)
 
                 name_, extension_ = Paths.splitext(path=file_name)
@@ -131,42 +255,33 @@ class DirectoryHandler:
                                     extension_.lower()
                                 )
 
-                image_comic = self.imageshandler.new_image(
-                                        name_image=name_image,
-                                        currentImage=dataImage,
-                                        extension=extension_[1:].upper(),
-                                        sizeImage=resizeImage,
-                                        unit=self.unit
-                                    )
-                image_comic.original_name = file_name
-
-                images_directory.append(image_comic)
+                images_arguments.append({
+                        'name_image': name_image,
+                        'currentImage': dataImage,
+                        'extension': extension_[1:].upper(),
+                        'sizeImage': resizeImage,
+                        'unit': self.unit
+                    })
 
                 self.number_image += 1
 
-            if join is False:
-                imagesDirectoryCompress = CompressorFileData(
-                                        filename=name_directory,
-                                        list_data=images_directory,
-                                        type=compressor,
-                                        unit=self.unit
-                                    )
-                listCompressorFileData.append(imagesDirectoryCompress)
-            else:
-                listImagesData += images_directory
+            images_directory = self.imageshandler.new_images(
+                                            images=images_arguments,
+                                            context=self.contexts.context
+                                        )
+            # raw data of images is not needed anymore.
+            del images_arguments
+            self.contexts.context.release(nbytes=raw_bytes)
+            for image, image_comic in zip(listImagePath, images_directory):
+                image_comic.original_name = image.name
 
-        if join:
             imagesDirectoryCompress = CompressorFileData(
-                                        filename=name_directory,
-                                        list_data=listImagesData,
-                                        type=compressor,
-                                        unit=self.unit
-                                    )
-            listCompressorFileData.append(imagesDirectoryCompress)
-
-        if len(listCompressorFileData) == 0:
-            return None
-        return listCompressorFileData
+                                    filename=name_directory,
+                                    list_data=images_directory,
+                                    type=compressor,
+                                    unit=self.unit
+                                )
+            yield imagesDirectoryCompress, key == keys[-1]
 
     def files_by_level(
         self,
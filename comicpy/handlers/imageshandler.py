@@ -8,21 +8,167 @@ Options for resize images.
 * 'small'     :  800 x 1200.
 * 'medium'    :  1000 x 1500.
 * 'large'     :  1200 x 1800.
+
+Images can be transcoded in parallel using a pool of workers.
+* 'thread'   :  threads, Pillow releases the GIL when decoding, resizing and
+                encoding.
+* 'process'  :  processes, for heavier workloads. The data of images is
+                exchanged through shared memory segments.
+
+Black and white images (mode 'L' or '1', or RGB images whose channels are
+equal within a tolerance) are kept in grayscale, one channel instead of three.
+The check uses NumPy if it is installed.
+
+Images are saved with the options of an encoder profile, see
+`comicpy.encoderprofiles`. With a size budget, JPEG and WEBP images are saved
+with the highest quality that fits the budget.
+
+With a `TranscodeCache`, images already transcoded with the same parameters
+are loaded from the cache instead of being transcoded again.
+
+The images transcoded are acquired from the memory budget of the conversion
+(`ConversionContext.acquire`) without waiting, they replace the images
+extracted, whose producers wait while the bytes in flight pass the limit.
+
+With a near duplicates distance, the difference hash (dHash) of each image is
+calculated from its transcoded data, also for the images loaded from the
+cache, and the pages whose hash is within the
+distance of a page already written to the same output are dropped, see
+`PageHashes`.
 """
 
 
 from comicpy.models import ImageComicData
 
+from comicpy.encoderprofiles import (
+    EncoderProfile,
+    get_profile
+)
+
+from comicpy.cache import TranscodeCache
+
+from comicpy.handlers.sharedbuffers import (
+    SharedBuffers,
+    ensure_tracker,
+    read_buffer,
+    write_buffer
+)
+
 from comicpy.valid_extensions import ValidExtensions
+from comicpy.context import ConversionContext
+from comicpy.tracing import get_tracer, start_worker_tracing, traced
 
-from PIL import Image
+from PIL import (
+    Image,
+    ImageChops
+)
 import io
+import os
+from threading import Lock
+from collections import deque
+from time import perf_counter
+from concurrent.futures import (
+    ThreadPoolExecutor,
+    ProcessPoolExecutor,
+    wait
+)
+
+from typing import TypeVar, Union, Literal, List, Tuple
+
+# `numpy` is optional, it is imported on first use.
+numpy = None
+numpy_imported = False
+
+
+def get_numpy():
+    """
+    Returns the module `numpy`, `None` if it is not installed.
+    """
+    global numpy, numpy_imported
+    if not numpy_imported:
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        numpy_imported = True
+    return numpy
 
-from typing import TypeVar, Union, Literal
 
 ImageInstancePIL = TypeVar("ImageInstancePIL")
 
 
+class PageHashes:
+    """
+    Class in charge of keeping the difference hashes of the pages written to
+    an output, the distances to a new hash are calculated at once with NumPy
+    if it is installed.
+    """
+
+    def __init__(
+        self,
+        output: str = None
+    ) -> None:
+        """
+        Constructor.
+
+        Args:
+            output: name of output file of the pages.
+        """
+        self.output = output
+        self.hashes = []
+        # hashes as an array of `numpy.uint64`, grown by `add`.
+        self.numpy = get_numpy()
+        self.array = None
+
+    def distance(
+        self,
+        dhash: int
+    ) -> Union[int, None]:
+        """
+        Returns the smallest Hamming distance between a hash and the hashes
+        kept.
+
+        Args
+            dhash: difference hash of 64 bits.
+
+        Returns
+            int: number of different bits.
+            None: if there are no hashes.
+        """
+        count = len(self.hashes)
+        if count == 0:
+            return None
+        numpy = self.numpy
+        if numpy is None:
+            return min(bin(dhash ^ other).count('1') for other in self.hashes)
+
+        different = numpy.bitwise_xor(
+                        self.array[:count],
+                        numpy.uint64(dhash)
+                    )
+        bits = numpy.unpackbits(different.view(numpy.uint8))
+        return int(bits.reshape(count, 64).sum(axis=1).min())
+
+    def add(
+        self,
+        dhash: int
+    ) -> None:
+        """
+        Keeps the hash of a page written.
+        """
+        numpy = self.numpy
+        count = len(self.hashes)
+        self.hashes.append(dhash)
+        if numpy is None:
+            return
+        if self.array is None or count == len(self.array):
+            array = numpy.zeros(max(64, 2 * count), dtype=numpy.uint64)
+            if self.array is not None:
+                array[:count] = self.array
+            self.array = array
+        self.array[count] = dhash
+
+
 class ImagesHandler:
     """
     Class dealing with image issues, such as resizing.
@@ -39,6 +185,461 @@ class ImagesHandler:
         'medium': (1000, 1500),
         'large': (1200, 1800),
     }
+    backends = ('thread', 'process')
+    grayscaleModes = ('1', 'L', 'LA')
+    # rows of pixels compared at once by the grayscale check.
+    grayscaleRows = 256
+    # the difference hash compares the columns of a grayscale thumbnail of
+    # `hashSize + 1` x `hashSize` pixels, 64 bits.
+    hashSize = 8
+
+    def __init__(
+        self,
+        workers: int = 1,
+        backend: Literal['thread', 'process'] = 'thread',
+        grayscale: bool = True,
+        grayscale_tolerance: int = 6,
+        profile: Union[str, EncoderProfile] = 'original',
+        page_budget: int = None,
+        cache: TranscodeCache = None,
+        near_duplicates: int = None,
+    ) -> None:
+        """
+        Constructor.
+
+        Args:
+            workers: number of workers used to transcode images, `None` uses
+                     the number of CPUs. Default is `1`, no parallelism.
+            backend: type of workers, 'thread' or 'process'. Default is
+                     'thread'.
+            grayscale: `True` to keep black and white images in grayscale,
+                       otherwise all images are converted to RGB. Default is
+                       `True`.
+            grayscale_tolerance: maximum difference between the channels of
+                                 a RGB image to consider it grayscale.
+                                 Default is `6`.
+            profile: name of encoder profile or `EncoderProfile` instance.
+                     Default is 'original'.
+            page_budget: maximum size in bytes of each image, `None` has no
+                         limit. Default is `None`.
+            cache: `TranscodeCache` instance, `None` to not use cache.
+                   Default is `None`.
+            near_duplicates: maximum Hamming distance, from 0 to 64 bits,
+                             between the difference hashes of two pages of
+                             an output to drop the second one, `None` keeps
+                             all pages. Default is `None`.
+
+        Raises:
+            ValueError: if `backend`, `workers` or `near_duplicates` are not
+                        valid.
+            InvalidEncoderProfile: if `profile` is not valid.
+        """
+        if backend not in ImagesHandler.backends:
+            raise ValueError(
+                    'Backend must be %s.' % ', '.join(ImagesHandler.backends)
+                )
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers < 1:
+            raise ValueError('Workers must be greater than 0.')
+        if near_duplicates is not None and \
+                not 0 <= near_duplicates <= ImagesHandler.hashSize ** 2:
+            raise ValueError(
+                    'Near duplicates distance must be between 0 and %d.' %
+                    ImagesHandler.hashSize ** 2
+                )
+        self.workers = workers
+        self.backend = backend
+        self.grayscale = grayscale
+        self.grayscale_tolerance = grayscale_tolerance
+        self.profile = get_profile(profile=profile)
+        self.page_budget = page_budget
+        self.cache = cache
+        self.near_duplicates = near_duplicates
+        self.executor = None
+        self.lock = Lock()
+        self.reset_stats()
+
+    def get_options(self) -> dict:
+        """
+        Returns the options used to transcode images, passed to the workers
+        processes.
+
+        Returns
+            dict: arguments of the constructor, except the workers and the
+                  cache, used by the main process.
+        """
+        return {
+            'grayscale': self.grayscale,
+            'grayscale_tolerance': self.grayscale_tolerance,
+            'profile': self.profile,
+            'page_budget': self.page_budget,
+            'near_duplicates': self.near_duplicates
+        }
+
+    def reset_stats(self) -> None:
+        """
+        Resets the statistics of transcoded images.
+        """
+        self.stats = {
+            'images': 0,
+            'grayscale': 0,
+            'decoded_bytes_saved': 0,
+            'cached': 0,
+            'near_duplicates': 0
+        }
+
+    def update_stats(
+        self,
+        images: List[ImageComicData]
+    ) -> None:
+        """
+        Adds transcoded images to the statistics.
+
+        Args
+            images: list of `ImageComicData` instances.
+        """
+        with self.lock:
+            for image_comic in images:
+                self.stats['images'] += 1
+                if image_comic.cached:
+                    self.stats['cached'] += 1
+                if image_comic.mode in ImagesHandler.grayscaleModes:
+                    self.stats['grayscale'] += 1
+                    self.stats['decoded_bytes_saved'] += \
+                        image_comic.decoded_bytes_saved
+
+    def merge_stats(
+        self,
+        stats: dict
+    ) -> None:
+        """
+        Adds the statistics of other `ImagesHandler` instance, used to
+        collect the statistics of files converted by other processes.
+
+        Args
+            stats: statistics of other instance.
+        """
+        with self.lock:
+            for key, value in stats.items():
+                self.stats[key] = self.stats.get(key, 0) + value
+
+    def report(self) -> str:
+        """
+        Returns a summary of the grayscale images and the memory of decoded
+        pixels saved by keeping them in a single channel, it is not the size
+        saved in the output files.
+
+        Returns
+            str: summary of the statistics.
+        """
+        report = 'Grayscale images: %d/%d, ' \
+            'decoded pixel memory saved: %.2f MB' % (
+                self.stats['grayscale'],
+                self.stats['images'],
+                self.stats['decoded_bytes_saved'] / 10**6
+            )
+        if self.cache is not None:
+            report += '\nCached images: %d/%d' % (
+                    self.stats['cached'],
+                    self.stats['images']
+                )
+        if self.near_duplicates is not None:
+            report += '\nNear duplicate pages dropped: %d' % (
+                    self.stats['near_duplicates']
+                )
+        return report
+
+    def get_executor(self) -> Union[ThreadPoolExecutor, ProcessPoolExecutor]:
+        """
+        Creates the pool of workers the first time it is required.
+
+        Returns
+            ThreadPoolExecutor or ProcessPoolExecutor: pool of workers.
+        """
+        if self.executor is None:
+            if self.backend == 'process':
+                ensure_tracker()
+                self.executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self.executor = ThreadPoolExecutor(
+                                    max_workers=self.workers,
+                                    thread_name_prefix='comicpy-image'
+                                )
+        return self.executor
+
+    def shutdown(self) -> None:
+        """
+        Stops the pool of workers, if it was created.
+        """
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+
+    def new_images(
+        self,
+        images: List[dict],
+        context: ConversionContext = None
+    ) -> List[ImageComicData]:
+        """
+        Transcodes a list of images using the pool of workers.
+
+        Args
+            images: list of dictionaries with the arguments of `new_image`.
+            context: context of the conversion, the images are acquired from
+                     its memory budget. Default is `None`, no budget.
+
+        Returns
+            List[ImageComicData]: instances with data of images, in the same
+                                  order of `images`.
+        """
+        if len(images) == 0:
+            return []
+
+        if self.workers == 1 or len(images) == 1:
+            results = []
+            for kwargs in images:
+                image_comic = self.new_image(**kwargs)
+                self.acquire(image_comic=image_comic, context=context)
+                results.append(image_comic)
+        elif self.backend == 'process':
+            results = self.new_images_shared(
+                                executor=self.get_executor(),
+                                images=images
+                            )
+            for image_comic in results:
+                self.acquire(image_comic=image_comic, context=context)
+        else:
+            results = self.new_images_threads(
+                                executor=self.get_executor(),
+                                images=images,
+                                context=context
+                            )
+        self.update_stats(images=results)
+        return results
+
+    def new_images_threads(
+        self,
+        executor: ThreadPoolExecutor,
+        images: List[dict],
+        context: ConversionContext = None
+    ) -> List[ImageComicData]:
+        """
+        Transcodes a list of images in worker threads, keeping at most two
+        images by worker in progress.
+
+        Args
+            executor: pool of worker threads.
+            images: list of dictionaries with the arguments of `new_image`.
+            context: context of the conversion.
+
+        Returns
+            List[ImageComicData]: instances with data of images, in the same
+                                  order of `images`.
+        """
+        results = []
+        futures = deque()
+        try:
+            for kwargs in images:
+                futures.append(executor.submit(self.new_image, **kwargs))
+                if len(futures) < self.workers * 2:
+                    continue
+                image_comic = futures.popleft().result()
+                self.acquire(image_comic=image_comic, context=context)
+                results.append(image_comic)
+            while futures:
+                image_comic = futures.popleft().result()
+                self.acquire(image_comic=image_comic, context=context)
+                results.append(image_comic)
+        finally:
+            for future in futures:
+                future.cancel()
+        return results
+
+    def acquire(
+        self,
+        image_comic: ImageComicData,
+        context: ConversionContext = None
+    ) -> None:
+        """
+        Acquires the size of a transcoded image from the memory budget of
+        the conversion, and adds the times of its transcoding to the metrics
+        of the conversion.
+        """
+        if context is None:
+            return
+        for stage, (seconds, bytes_in, bytes_out) in \
+                image_comic.timings.items():
+            context.metrics.add(
+                    stage=stage,
+                    seconds=seconds,
+                    bytes_in=bytes_in,
+                    bytes_out=bytes_out
+                )
+        context.acquire(
+            nbytes=image_comic.bytes_data.getbuffer().nbytes,
+            wait=False
+        )
+
+    def get_pixel_bytes(
+        self,
+        image: ImageInstancePIL
+    ) -> int:
+        """
+        Returns the size in bytes of the pixel data of a decoded image.
+        """
+        width, height = image.size
+        return width * height * len(image.getbands())
+
+    def new_images_shared(
+        self,
+        executor: ProcessPoolExecutor,
+        images: List[dict],
+    ) -> List[ImageComicData]:
+        """
+        Transcodes a list of images in worker processes, the data of the
+        images travels in shared memory segments, in and out of the workers.
+
+        Args
+            executor: pool of worker processes.
+            images: list of dictionaries with the arguments of `new_image`.
+
+        Returns
+            List[ImageComicData]: instances with data of images, in the same
+                                  order of `images`.
+        """
+        options = self.get_options()
+        results = [self.load_cached(**kwargs) for kwargs in images]
+        with SharedBuffers() as buffers:
+            tasks = []
+            for kwargs, image_comic in zip(images, results):
+                if image_comic is not None:
+                    continue
+                task = dict(kwargs)
+                task['options'] = options
+                task['currentImage'] = buffers.put(data=kwargs['currentImage'])
+                task['output'] = buffers.new_name()
+                task['trace'] = get_tracer() is not None
+                tasks.append(task)
+
+            futures = [
+                executor.submit(transcode_image, task) for task in tasks
+            ]
+            try:
+                misses = iter(zip(tasks, futures))
+                for index, kwargs in enumerate(images):
+                    if results[index] is not None:
+                        continue
+                    task, future = next(misses)
+                    image_comic, events = future.result()
+                    if events:
+                        get_tracer().add_events(events=events)
+                    data = buffers.take(
+                                    name=task['output'],
+                                    size=image_comic.size
+                                )
+                    image_comic.bytes_data = io.BytesIO(data)
+                    image_comic.size = image_comic.get_size()
+                    self.store_cached(image_comic=image_comic, **kwargs)
+                    results[index] = image_comic
+                return results
+            finally:
+                # the workers must finish before removing the segments.
+                for future in futures:
+                    future.cancel()
+                wait(futures)
+
+    def get_cache_key(
+        self,
+        currentImage: bytes,
+        extension: str,
+        sizeImage: str = 'preserve',
+        **kwargs
+    ) -> str:
+        """
+        Returns the key of an image in the cache, built from its data and
+        the parameters used to transcode it.
+        """
+        return self.cache.key(
+                    currentImage,
+                    extension,
+                    sizeImage,
+                    self.profile.key(),
+                    self.page_budget,
+                    self.grayscale,
+                    self.grayscale_tolerance
+                )
+
+    def load_cached(
+        self,
+        name_image: str,
+        currentImage: Union[bytes, ImageInstancePIL],
+        unit: str,
+        **kwargs
+    ) -> Union[ImageComicData, None]:
+        """
+        Loads an image from the cache.
+
+        Args
+            name_image: name of image.
+            currentImage: data of original image.
+            unit: unit of measure data.
+            kwargs: other arguments of `new_image`.
+
+        Returns
+            ImageComicData: `ImageComicData` instance with data of image.
+            None: if cache is not used or the image is not in the cache.
+        """
+        if self.cache is None or type(currentImage) is not bytes:
+            return None
+        entry = self.cache.get(
+                    key=self.get_cache_key(currentImage=currentImage, **kwargs)
+                )
+        if entry is None:
+            return None
+        data, mode = entry
+        image_comic = ImageComicData(
+                        filename=self.get_name(name_image=name_image),
+                        bytes_data=io.BytesIO(data),
+                        unit=unit
+                    )
+        image_comic.mode = mode
+        image_comic.cached = True
+        return image_comic
+
+    def store_cached(
+        self,
+        image_comic: ImageComicData,
+        currentImage: Union[bytes, ImageInstancePIL],
+        **kwargs
+    ) -> None:
+        """
+        Stores a transcoded image in the cache.
+
+        Args
+            image_comic: `ImageComicData` instance with data of image.
+            currentImage: data of original image.
+            kwargs: other arguments of `new_image`.
+        """
+        if self.cache is None or type(currentImage) is not bytes:
+            return
+        self.cache.put(
+            key=self.get_cache_key(currentImage=currentImage, **kwargs),
+            data=image_comic.bytes_data.getvalue(),
+            mode=image_comic.mode
+        )
+
+    def get_name(
+        self,
+        name_image: str
+    ) -> str:
+        """
+        Returns name of the new image, WEBP images are renamed to JPEG if
+        the profile does not keep them.
+        """
+        if '.webp' in name_image.lower() and not self.profile.keep_webp:
+            name_image = name_image.replace(".webp", ".jpeg")
+        return name_image
 
     def get_size(
         self,
@@ -74,12 +675,233 @@ class ImagesHandler:
         try:
             if extension_img == 'JPG' or extension_img == 'JP2':
                 extension_img = 'JPEG'
-            elif extension_img == 'WEBP':
+            elif extension_img == 'WEBP' and not self.profile.keep_webp:
                 extension_img = 'JPEG'
             return ImagesHandler.validFormats[extension_img]
         except KeyError:
             return ImagesHandler.validFormats['JPEG']
 
+    def is_grayscale(
+        self,
+        image: ImageInstancePIL
+    ) -> bool:
+        """
+        Checks if the image has a single channel of color, its mode is
+        grayscale or the channels R, G, B are equal within the tolerance.
+
+        Args
+            image: `PIL` instance.
+
+        Returns
+            bool: `True` if image is grayscale, otherwise, `False`.
+        """
+        if image.mode in ImagesHandler.grayscaleModes:
+            return True
+
+        imageRGB = image.convert('RGB')
+        tolerance = self.grayscale_tolerance
+        numpy = get_numpy()
+
+        if numpy is None:
+            red, green, blue = imageRGB.split()
+            return all(
+                ImageChops.difference(a, b).getextrema()[1] <= tolerance
+                for a, b in ((red, green), (green, blue))
+            )
+
+        pixels = numpy.asarray(imageRGB)
+        # compares blocks of rows, color images stop at the first block.
+        for row in range(0, pixels.shape[0], ImagesHandler.grayscaleRows):
+            block = pixels[row: row + ImagesHandler.grayscaleRows]
+            block = block.astype(numpy.int16)
+            if (numpy.abs(block[..., 0] - block[..., 1]) > tolerance).any():
+                return False
+            if (numpy.abs(block[..., 1] - block[..., 2]) > tolerance).any():
+                return False
+        return True
+
+    def is_decodable(
+        self,
+        data: bytes
+    ) -> bool:
+        """
+        Checks if the data of an image can be decoded completely.
+
+        Args
+            data: raw data of image.
+
+        Returns
+            bool: `True` if image is decoded, otherwise, `False`, the image
+                  is corrupt or truncated.
+        """
+        try:
+            with Image.open(io.BytesIO(data)) as image:
+                image.load()
+            return True
+        except (OSError, SyntaxError, ValueError):
+            return False
+
+    def get_dhash(
+        self,
+        image: ImageInstancePIL
+    ) -> int:
+        """
+        Calculates the difference hash of an image, each bit is `1` if a pixel
+        of the grayscale thumbnail is brighter than the pixel on its left.
+        Pages with a few different pixels (a scan, a watermark, other
+        quality) have hashes with a few different bits.
+
+        Args
+            image: `PIL` instance.
+
+        Returns
+            int: hash of 64 bits.
+        """
+        size = ImagesHandler.hashSize
+        thumbnail = image.resize(
+                        (size + 1, size),
+                        resample=Image.Resampling.BOX
+                    ).convert('L')
+        numpy = get_numpy()
+
+        if numpy is None:
+            pixels = thumbnail.tobytes()
+            dhash = 0
+            for row in range(size):
+                for column in range(size):
+                    index = row * (size + 1) + column
+                    dhash = (dhash << 1) | \
+                        (pixels[index + 1] > pixels[index])
+            return dhash
+
+        pixels = numpy.asarray(thumbnail, dtype=numpy.int16)
+        bits = pixels[:, 1:] > pixels[:, :-1]
+        return int.from_bytes(numpy.packbits(bits).tobytes(), 'big')
+
+    def get_dhash_data(
+        self,
+        data: bytes
+    ) -> int:
+        """
+        Calculates the difference hash of the data of an image, JPEG images
+        are decoded at a reduced scale.
+        """
+        with Image.open(io.BytesIO(data)) as image:
+            image.draft('L', (ImagesHandler.hashSize * 8,) * 2)
+            return self.get_dhash(image=image)
+
+    def set_dhash(
+        self,
+        image_comic: ImageComicData
+    ) -> None:
+        """
+        Sets the difference hash of a transcoded image, if near duplicates are
+        dropped. It is calculated from the data written, the same for the
+        images transcoded and the images loaded from the cache.
+
+        Args
+            image_comic: `ImageComicData` instance with data of image.
+        """
+        if self.near_duplicates is None or image_comic.dhash is not None:
+            return
+        image_comic.dhash = self.get_dhash_data(
+                                data=image_comic.bytes_data.getvalue()
+                            )
+
+    def drop_near_duplicates(
+        self,
+        images: List[ImageComicData],
+        hashes: PageHashes,
+        context: ConversionContext = None
+    ) -> List[ImageComicData]:
+        """
+        Drops the images whose difference hash is within the near duplicates
+        distance of an image kept, the hashes of the images kept are added to
+        `hashes`.
+
+        Args
+            images: list of `ImageComicData` instances, in the order of
+                    pages.
+            hashes: `PageHashes` instance with the hashes of the pages
+                    already written to the output.
+            context: context of the conversion, the bytes of the images
+                     dropped are released from its memory budget.
+
+        Returns
+            List[ImageComicData]: images kept, in the same order.
+        """
+        if self.near_duplicates is None:
+            return images
+
+        results = []
+        dropped = 0
+        for image_comic in images:
+            self.set_dhash(image_comic=image_comic)
+            distance = hashes.distance(dhash=image_comic.dhash)
+            if distance is not None and distance <= self.near_duplicates:
+                dropped += 1
+                if context is not None:
+                    context.release(
+                        nbytes=image_comic.bytes_data.getbuffer().nbytes
+                    )
+                continue
+            hashes.add(dhash=image_comic.dhash)
+            results.append(image_comic)
+
+        with self.lock:
+            self.stats['near_duplicates'] += dropped
+        return results
+
+    def fit_budget(
+        self,
+        image: ImageInstancePIL,
+        format_image: str
+    ) -> io.BytesIO:
+        """
+        Searches the highest quality whose image fits in the size budget, by
+        binary search between the minimum quality and the quality of the
+        profile. If none fits, the minimum quality is used.
+
+        Args
+            image: `PIL` instance, resized.
+            format_image: format of image, 'jpeg' or 'webp'.
+
+        Returns
+            io.BytesIO: data of image.
+        """
+        low = EncoderProfile.MIN_QUALITY
+        high = self.profile.quality - 1
+        best = None
+        while low <= high:
+            quality = (low + high) // 2
+            imageIO = io.BytesIO()
+            image.save(
+                imageIO,
+                format=format_image,
+                **self.profile.save_options(
+                                    format=format_image,
+                                    quality=quality
+                                )
+            )
+            if imageIO.getbuffer().nbytes <= self.page_budget:
+                best = imageIO
+                low = quality + 1
+            else:
+                high = quality - 1
+
+        if best is None:
+            best = io.BytesIO()
+            image.save(
+                best,
+                format=format_image,
+                **self.profile.save_options(
+                                    format=format_image,
+                                    quality=EncoderProfile.MIN_QUALITY
+                                )
+            )
+        return best
+
+    @traced(cat='image', arg='name_image')
     def new_image(
         self,
         name_image: str,
@@ -103,36 +925,129 @@ class ImagesHandler:
             ImageComicData: `ImageComicData` instance with data of image.
         """
         # print(name_image, extension, type(currentImage))
+        image_comic = self.load_cached(
+                            name_image=name_image,
+                            currentImage=currentImage,
+                            extension=extension,
+                            unit=unit,
+                            sizeImage=sizeImage
+                        )
+        if image_comic is not None:
+            self.set_dhash(image_comic=image_comic)
+            return image_comic
+
+        originalImage = currentImage
         size_tuple = self.get_size(size=sizeImage)
         newImageIO = io.BytesIO()
+        timings = {}
 
+        start = perf_counter()
+        bytes_in = 0
         if type(currentImage) is bytes:
+            bytes_in = len(currentImage)
             currentImage = Image.open(io.BytesIO(currentImage))
 
-        # force image color, RGB.
-        currentImage = currentImage.convert('RGB')
+        # grayscale images keep a single channel, others are forced to RGB.
+        if self.grayscale and self.is_grayscale(image=currentImage):
+            currentImage = currentImage.convert('L')
+        else:
+            currentImage = currentImage.convert('RGB')
+        timings['decode'] = (
+            perf_counter() - start,
+            bytes_in,
+            self.get_pixel_bytes(image=currentImage)
+        )
 
         if size_tuple is not None:
+            start = perf_counter()
             imageResized = currentImage.resize(
                                     size_tuple,
                                     resample=Image.Resampling.LANCZOS
                                 )
+            timings['resize'] = (
+                perf_counter() - start,
+                timings['decode'][2],
+                self.get_pixel_bytes(image=imageResized)
+            )
         else:
             imageResized = currentImage
 
-        if '.webp' in name_image.lower():
-            name_image = name_image.replace(".webp", ".jpeg")
+        name_image = self.get_name(name_image=name_image)
 
+        start = perf_counter()
+        format_image = self.get_format(extension_img=extension)
         imageResized.save(
                 newImageIO,
-                format=self.get_format(extension_img=extension),
-                # quality=90
-                quality=100
+                format=format_image,
+                **self.profile.save_options(format=format_image)
             )
 
+        if self.page_budget is not None and \
+                newImageIO.getbuffer().nbytes > self.page_budget and \
+                self.profile.is_lossy(format=format_image):
+            newImageIO = self.fit_budget(
+                                image=imageResized,
+                                format_image=format_image
+                            )
+        timings['encode'] = (
+            perf_counter() - start,
+            self.get_pixel_bytes(image=imageResized),
+            newImageIO.getbuffer().nbytes
+        )
+
         image_comic = ImageComicData(
                         filename=name_image,
                         bytes_data=newImageIO,
                         unit=unit
                     )
+        image_comic.timings = timings
+        image_comic.mode = imageResized.mode
+        self.set_dhash(image_comic=image_comic)
+        if imageResized.mode == 'L':
+            # two channels of decoded pixels less than RGB.
+            width, height = imageResized.size
+            image_comic.decoded_bytes_saved = width * height * 2
+
+        self.store_cached(
+            image_comic=image_comic,
+            currentImage=originalImage,
+            extension=extension,
+            sizeImage=sizeImage
+        )
         return image_comic
+
+
+def transcode_image(
+    task: dict
+) -> Tuple[ImageComicData, List[dict]]:
+    """
+    Transcodes an image in a worker process. The original data is read from a
+    shared memory segment and the new data is written into other segment.
+
+    Args
+        task: arguments of `ImagesHandler.new_image`, `currentImage` is a
+              tuple with the name and size of the segment, `output` is the
+              name of the segment for the new data, `options` are the
+              arguments of `ImagesHandler`, `trace` is `True` to record the
+              spans of the worker.
+
+    Returns
+        Tuple[ImageComicData, List[dict]]: `ImageComicData` instance without
+                                           data, its `size` attribute is the
+                                           size in bytes of the new data, and
+                                           the spans recorded.
+    """
+    kwargs = dict(task)
+    output = kwargs.pop('output')
+    options = kwargs.pop('options')
+    tracer = start_worker_tracing() if kwargs.pop('trace') else None
+    kwargs['currentImage'] = read_buffer(*kwargs['currentImage'])
+
+    image_comic = ImagesHandler(**options).new_image(**kwargs)
+    image_comic.size = write_buffer(
+                            name=output,
+                            data=image_comic.bytes_data.getbuffer()
+                        )
+    image_comic.bytes_data = None
+    events = tracer.take() if tracer is not None else []
+    return image_comic, events
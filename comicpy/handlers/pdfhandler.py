@@ -7,6 +7,8 @@ from comicpy.handlers.imageshandler import ImagesHandler
 from comicpy.handlers.pdfhandler_thread import ThreadImage
 
 from comicpy.utils import Paths
+from comicpy.context import ConversionContexts, ContextAttribute
+from comicpy.tracing import span, traced
 
 from comicpy.models import (
     ImageComicData,
@@ -17,15 +19,20 @@ from comicpy.models import (
 
 
 from typing import (
+    Callable,
     List,
     Union,
     Literal
 )
 
 import re
-from queue import Queue
+from time import perf_counter
 
-import fitz
+try:
+    import pymupdf as fitz
+except ImportError:
+    # releases of PyMuPDF without the `pymupdf` name.
+    import fitz
 
 import logging
 
@@ -34,20 +41,33 @@ class PdfHandler:
     """
     Class in charge of extract images from PDF file.
     """
+    # state of the conversion of the current thread.
+    number_image = ContextAttribute('pdf_number_image')
 
     def __init__(
         self,
         unit: Literal['b', 'kb', 'mb', 'gb'] = 'mb',
+        imageshandler: ImagesHandler = None,
+        contexts: ConversionContexts = None
     ) -> None:
         """
         Constructor.
 
         Args:
             unit: indicate unit of measure using to represent file size.
+            imageshandler: `ImagesHandler` instance used to transcode images,
+                           by default a new one without parallelism.
+            contexts: `ConversionContexts` instance with the state of the
+                      conversions, shared with `ComicPy`, by default a new
+                      one.
         """
         self.unit = unit
-        self.imageshandler = ImagesHandler()
-        self.number_image = 1
+        if imageshandler is None:
+            imageshandler = ImagesHandler()
+        self.imageshandler = imageshandler
+        if contexts is None:
+            contexts = ConversionContexts()
+        self.contexts = contexts
         # handle log messages PyMuPDF.
         self.logger = logging.getLogger("pymupdf")
         self.logger.setLevel(logging.ERROR)
@@ -86,7 +106,6 @@ class PdfHandler:
         if is_join is False:
             self.reset_counter()
 
-
         listImageComicData = self.to_pymupdf(
                                         filePDF=currentFilePDF,
                                         resize=resizeImage,
@@ -104,12 +123,63 @@ class PdfHandler:
                             )
         return pdfFileCompressor
 
+    def stream_pdf(
+        self,
+        currentFilePDF: CurrentFile,
+        compressor: str,
+        write: Callable[[CompressorFileData], None],
+        is_join: bool = False,
+        resizeImage: Literal['preserve', 'small', 'medium', 'large'] = 'preserve',
+        motor: Literal['pymupdf'] = 'pymupdf',
+        show_progress: bool = False
+    ) -> int:
+        """
+        Takes the bytes from a PDF file and gives its images to `write` by
+        batches of pages, as soon as they are transcoded.
+
+        Args:
+            currentFilePDF: Instance of `CurrentFile` with the data of the PDF
+                            file.
+            compressor: type of compressor to use, RAR or ZIP.
+            write: function called with a `CompressorFileData` instance with
+                   the images of each batch of pages.
+            resizeImage: rescaling image.
+            motor: motor to use, `pymupdf` default `pymupdf`.
+
+        Returns:
+            int: number of images of the PDF file.
+        """
+        if is_join is False:
+            self.reset_counter()
+
+        images = 0
+
+        def write_batch(listImageComicData: List[ImageComicData]) -> None:
+            nonlocal images
+            images += len(listImageComicData)
+            write(CompressorFileData(
+                    filename=currentFilePDF.name.replace(' ', '_'),
+                    list_data=listImageComicData,
+                    type=compressor,
+                    unit=self.unit
+                ))
+
+        self.to_pymupdf(
+                filePDF=currentFilePDF,
+                resize=resizeImage,
+                show_progress=show_progress,
+                write=write_batch
+            )
+        return images
+
+    @traced(cat='pdf')
     def to_pymupdf(
         self,
         filePDF: CurrentFile,
         resize: str,
         n_threads: int = 4,
         show_progress: bool = False,
+        write: Callable[[List[ImageComicData]], None] = None
     ) -> Union[List[ImageComicData], list]:
         """
         Gets images of the pages of a PDF file using PyMuPDF.
@@ -118,6 +188,9 @@ class PdfHandler:
         images.
         The images are ordered using their name and numbering as a reference,
         in case of multiple images on a single page.
+        With `write`, the pages are transcoded by batches of one page by
+        worker of `ImagesHandler`, each batch is given to `write` before the
+        next one is extracted.
 
         Args:
             filePDF: Instance of `CurrentFile` with the PDF file data.
@@ -126,75 +199,114 @@ class PdfHandler:
                        default 4.
             show_progress: boolean to show the progress of the current PDF file,
                            default False.
+            write: function called with the images of each batch of pages,
+                   default `None`, all the images are returned.
 
         Returns:
             List[ImageComicData]: list of `ImageComicData` instances with the
-                                  page image data.
+                                  page image data, empty with `write`.
         """
+        context = self.contexts.context
         data = []
+        raw_images = []
         uniques_hash = set()
-        queue_images = Queue()
+        # bytes of the images extracted, and time extracting them.
+        extracted = 0
+        seconds = 0.0
 
         # minimum images per chunk of the image list, it is arbitrary
         minimum_images_by_page = 24
 
+        start = perf_counter()
 ### PYMUPDF
-        pdf_file = fitz.open("pdf", filePDF.bytes_data)
-        # print(pdf_file.page_count, "\n")
-        n_pages = pdf_file.page_count
+        with fitz.open("pdf", filePDF.bytes_data) as pdf_file:
+            # print(pdf_file.page_count, "\n")
+            n_pages = pdf_file.page_count
 
 
 #### THREADs
-        for page in pdf_file.pages():
-            if show_progress:
-                print(f"\r>>> Page: {page.number + 1}/{n_pages}", end="", flush=True)
-
-            threads_list = []
-            # sorts the images by number in the names.
-            images = sorted(
-                        page.get_images(),
-                        key=lambda x: self.get_number_image(name=x[7])
-                    )
-
-            # determines the number of images per chunk of the list,
-            # used by the threads.
-
-            n_images = len(images) // n_threads
-
-            if n_images < minimum_images_by_page:
-                th = ThreadImage(
-                            pagesgenerator=images,
-                            uniques_hash=uniques_hash,
-                            queue=queue_images,
-                            pdfDocument=pdf_file,
-                            to_image_instance_method=self.to_image_instance,
-                            resize=resize
-                        )
-                threads_list.append(th)
-                th.start()
-                th.join()
-            else:
-                for i in range(0, len(images) + 1, n_images):
-                    chunk = images[i: i + n_images]
-
-                    th = ThreadImage(
-                                pagesgenerator=chunk,
-                                uniques_hash=uniques_hash,
-                                queue=queue_images,
-                                pdfDocument=pdf_file,
-                                to_image_instance_method=self.to_image_instance,
-                                resize=resize
+            batch_pages = n_pages
+            if write is not None:
+                batch_pages = self.imageshandler.workers
+
+            for page in pdf_file.pages():
+                with span('page', cat='pdf', page=page.number + 1):
+                    context.check_cancelled()
+                    if show_progress:
+                        print(f"\r>>> Page: {page.number + 1}/{n_pages}", end="", flush=True)
+
+                    threads_list = []
+                    # sorts the images by number in the names.
+                    images = sorted(
+                                page.get_images(),
+                                key=lambda x: self.get_number_image(name=x[7])
                             )
-                    threads_list.append(th)
-                    th.start()
-
-                    # print(">>> threads_list", len(threads_list))
-                    for t in threads_list:
-                        t.join()
 
-        list_images_unique = list(queue_images.queue)
-        data = list_images_unique
+                    # determines the number of images per chunk of the list,
+                    # used by the threads.
+
+                    n_images = len(images) // n_threads
+
+                    if n_images < minimum_images_by_page:
+                        chunks = [images]
+                    else:
+                        chunks = [
+                            images[i: i + n_images]
+                            for i in range(0, len(images), n_images)
+                        ]
+
+                    for chunk in chunks:
+                        th = ThreadImage(
+                                    pagesgenerator=chunk,
+                                    pdfDocument=pdf_file
+                                )
+                        threads_list.append(th)
+                        th.start()
+
+                    # duplicate images are discarded keeping the order of the page.
+                    for th in threads_list:
+                        th.join()
+                        for raw_image in th.raw_images:
+                            if raw_image.md5 in uniques_hash:
+                                continue
+                            uniques_hash.add(raw_image.md5)
+                            raw_images.append(raw_image)
 #### THREADs
+                if (page.number + 1) % batch_pages and \
+                        page.number + 1 < n_pages:
+                    continue
+
+                seconds += perf_counter() - start
+                raw_bytes = sum(
+                    len(raw_image.data) for raw_image in raw_images
+                )
+                extracted += raw_bytes
+                # the images extracted are replaced by the images transcoded.
+                context.acquire(nbytes=raw_bytes, wait=False)
+                images_comic = self.to_image_instances(
+                                    rawimages=raw_images,
+                                    resize=resize
+                                )
+                raw_images = []
+                context.release(nbytes=raw_bytes)
+                if write is None:
+                    data += images_comic
+                elif images_comic:
+                    write(images_comic)
+                    # the next batch is extracted when the bytes in flight
+                    # are under the limit.
+                    context.wait_budget()
+                start = perf_counter()
+
+        # MuPDF keeps the images decoded in its store, up to 256 MB, even
+        # after the document is closed, they are not used again.
+        fitz.TOOLS.store_shrink(100)
+        context.metrics.add(
+                stage='extract',
+                seconds=seconds,
+                bytes_in=filePDF.bytes_data.getbuffer().nbytes,
+                bytes_out=extracted
+            )
         if show_progress:
             print('\n')
         return data
@@ -215,34 +327,78 @@ class PdfHandler:
         res = re.search(r"(\d+)", name)
         return int(res.group(1))
 
-    def to_image_instance(
+    def to_image_instances(
         self,
-        rawimage: RawImage,
+        rawimages: List[RawImage],
         resize: str,
-    ) -> ImageComicData:
+    ) -> List[ImageComicData]:
         """
-        Creates an image instance with new dimensions and names, preserving the
-        data.
+        Creates image instances with new dimensions and names, preserving the
+        data and the order of the images.
 
         Args
-            rawimage: `RawImage` instance.
+            rawimages: list of `RawImage` instances.
             resize: string of new size of image.
 
         Returns
-            ImageComicData: instance with byte data, new name.
+            List[ImageComicData]: instances with byte data, new name.
+        """
+        images_arguments = []
+        for rawimage in rawimages:
+            images_arguments.append({
+                    'name_image': self.get_name_image(
+                                        extension=rawimage.extension
+                                    ),
+                    'currentImage': rawimage.data,
+                    'extension': rawimage.extension.upper(),
+                    'sizeImage': resize,
+                    'unit': self.unit
+                })
+
+        return self.imageshandler.new_images(
+                            images=images_arguments,
+                            context=self.contexts.context
+                        )
+
+    def get_name_image(
+        self,
+        extension: str
+    ) -> str:
+        """
+        Gets the name of the next image and increments the counter.
+
+        Args
+            extension: extension of image.
+
+        Returns
+            str: name of image, `Image0001.jpeg`.
         """
         name_image = 'Image%s.%s' % (
                             str(self.number_image).zfill(4),
-                            rawimage.extension.lower()
+                            extension.lower()
                         )
-        # print(rawimage)
-        image_comic = self.imageshandler.new_image(
-                                name_image=name_image,
-                                currentImage=rawimage.data,
-                                extension=rawimage.extension.upper(),
-                                sizeImage=resize,
-                                unit=self.unit
-                            )
-
         self.number_image += 1
-        return image_comic
+        return name_image
+
+    def rename_images(
+        self,
+        pdfFileCompressor: CompressorFileData
+    ) -> CompressorFileData:
+        """
+        Renames the images of a PDF file extracted by other process,
+        continuing the counter, so the names are unique when the files are
+        joined.
+
+        Args
+            pdfFileCompressor: `CompressorFileData` instance with images.
+
+        Returns
+            CompressorFileData: same instance with the images renamed.
+        """
+        for image_comic in pdfFileCompressor.list_data:
+            name_, extension_ = Paths.splitext(image_comic.filename)
+            image_comic.filename = self.get_name_image(
+                                        extension=extension_[1:]
+                                    )
+            image_comic.get_extension()
+        return pdfFileCompressor
@@ -1,8 +1,8 @@
 # -*- coding: utf-8 -*-
 """
-Class in charge of getting the images from the page and converting them.
+Class in charge of getting the images from the page.
 
-Used by PdfHandler.
+Used by PdfHandler, the images are converted later by `ImagesHandler`.
 """
 
 from comicpy.models import RawImage
@@ -10,10 +10,9 @@ from comicpy.models import RawImage
 
 from threading import Thread
 
-from typing import Callable, TypeVar
+from typing import TypeVar
 
 
-Queue = TypeVar("Queue")
 Document = TypeVar("fitz.Document")
 
 
@@ -22,28 +21,20 @@ class ThreadImage(Thread):
     def __init__(
         self,
         pagesgenerator: list,
-        queue: Queue,
-        uniques_hash: set,
         pdfDocument: Document,
-        resize: str,
-        to_image_instance_method: Callable[RawImage, str],
         daemon: bool = True
     ) -> None:
         """
         """
         Thread.__init__(self, daemon=daemon)
         self.pagesgenerator = pagesgenerator
-        self.queue = queue
-        self.uniques_hash = uniques_hash
         self.pdfDocument = pdfDocument
-        self.to_image_instance_method = to_image_instance_method
-        self.resize = resize
+        self.raw_images = []
 
     def run(self) -> None:
         """
-        Obtains the images and converts them.
+        Obtains the images, keeping them in `raw_images` attribute.
         """
-        raw_images= []
         for item in self.pagesgenerator:
             name = item[7]
             xref_image = item[0]
@@ -59,18 +50,4 @@ class ThreadImage(Thread):
             raw_image.extension = imagen_data["ext"]
             raw_image.get_md5()
 
-            raw_images.append(raw_image)
-
-        for raw_image in raw_images:
-            if raw_image.md5 in self.uniques_hash:
-                continue
-
-            # print(raw_image)
-            self.uniques_hash.add(raw_image.md5)
-
-            image_comic = self.to_image_instance_method(
-                                            rawimage=raw_image,
-                                            resize=self.resize,
-                                        )
-
-            self.queue.put(image_comic)
+            self.raw_images.append(raw_image)
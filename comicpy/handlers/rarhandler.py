@@ -2,13 +2,14 @@
 """
 Handler related to files RAR.
 
-Temporary data written in TEMP directory.
+Temporary data written in TEMP directory, in a directory of each conversion.
 
 Rar executable path must be in `PATH` environment variable.
 """
 
 from comicpy.handlers.imageshandler import ImagesHandler
 from comicpy.utils import Paths
+from comicpy.context import ConversionContexts, ContextAttribute
 
 from comicpy.models import (
     CurrentFile,
@@ -20,10 +21,11 @@ from comicpy.handlers.baseziprar import BaseZipRarHandler
 from comicpy.valid_extensions import ValidExtensions
 
 from comicpy.exceptionsClasses import BadPassword
+from comicpy.tracing import span, traced
 
 # from uuid import uuid1
 import subprocess
-import tempfile
+import os
 import shutil
 import rarfile
 from rarfile import (
@@ -39,28 +41,43 @@ class RarHandler(BaseZipRarHandler):
     Class in charge of extract images, rename file RAR, create RAR file, write
     data into RAR file.
     """
+    # state of the conversion of the current thread.
+    number_index = ContextAttribute('rar_number_index')
+    FILE_CBR_ = ContextAttribute('FILE_CBR_')
+    FILE_RAR_ = ContextAttribute('FILE_RAR_')
+    CONVERTED_COMICPY_PATH_ = ContextAttribute('rar_converted_path')
+    # directories of images not archived yet, with the bytes of images.
+    DIRECTORIES_ = ContextAttribute('rar_directories')
+    # temporary directory of the conversion.
+    TEMPDIR = ContextAttribute('tempdir')
 
     def __init__(
         self,
         unit: Literal['b', 'kb', 'mb', 'gb'] = 'mb',
+        imageshandler: ImagesHandler = None,
+        contexts: ConversionContexts = None
     ) -> None:
         """
         Constructor.
 
         Args:
             unit: indicate unit of measure using to represent file size.
+            imageshandler: `ImagesHandler` instance used to transcode images,
+                           by default a new one without parallelism.
+            contexts: `ConversionContexts` instance with the state of the
+                      conversions, shared with `ComicPy`, by default a new
+                      one.
         """
         self.unit = unit
-        self.TEMPDIR = tempfile.gettempdir()
         self.type = 'rar'
-        self.imageshandler = ImagesHandler()
+        if imageshandler is None:
+            imageshandler = ImagesHandler()
+        self.imageshandler = imageshandler
         self.validextentions = ValidExtensions()
         self.url_page = 'https://www.rarlab.com/download.htm'
-        self.number_index = 1
-
-        self.FILE_CBR_ = None
-        self.FILE_RAR_ = None
-        self.CONVERTED_COMICPY_PATH_ = None
+        if contexts is None:
+            contexts = ConversionContexts()
+        self.contexts = contexts
 
     def reset_names(self) -> None:
         """
@@ -69,6 +86,7 @@ class RarHandler(BaseZipRarHandler):
         self.FILE_CBR_ = None
         self.FILE_RAR_ = None
         self.CONVERTED_COMICPY_PATH_ = None
+        self.DIRECTORIES_ = None
 
     def testRar(
         self,
@@ -96,6 +114,41 @@ class RarHandler(BaseZipRarHandler):
         except PasswordRequired:
             return True
 
+    def verify(
+        self,
+        filename: str,
+        decode: bool = False,
+        workers: int = None
+    ) -> Union[bool, None]:
+        """
+        Checks the structure of a RAR or CBR file: its headers are parsed and
+        the CRC of each member is checked by the RAR command.
+
+        Args:
+            filename: path of RAR or CBR file.
+            decode: `True` to also decode every image in parallel.
+            workers: number of threads decoding images, `None` uses the
+                     number of CPUs.
+
+        Returns:
+            bool: `True` if file is valid, otherwise, `False`.
+            None: if the RAR command is not installed.
+        """
+        try:
+            with rarfile.RarFile(file=filename, mode='r') as rarFile:
+                if decode:
+                    return super().decode_members(
+                                        instanceCompress=rarFile,
+                                        workers=workers
+                                    )
+                with span('unrar', cat='subprocess'):
+                    rarFile.testrar()
+                return True
+        except RarCannotExec:
+            return None
+        except Exception:
+            return False
+
     def extract_content(
         self,
         currentFileRar: CurrentFile,
@@ -153,6 +206,7 @@ class RarHandler(BaseZipRarHandler):
         except Exception as e:
             return None
 
+    @traced(cat='writer', arg='pathCBRconverted')
     def to_rar(
         self,
         join: bool,
@@ -208,7 +262,11 @@ class RarHandler(BaseZipRarHandler):
 
         ITEM_DIR_ = None
         first_directory = False
-        to_rar_directory = {}
+        # bytes of images of each directory, given to the RAR command, with
+        # join they are archived when the last item is written.
+        if self.DIRECTORIES_ is None:
+            self.DIRECTORIES_ = {}
+        bytes_directory = self.DIRECTORIES_
         metadata_rar = []
 
         for data in data_list:
@@ -242,16 +300,28 @@ class RarHandler(BaseZipRarHandler):
 
             file_path_ = Paths.build(DIRECTORY_FILES_, item_filename)
 
-            with open(file_path_, 'wb') as fileImage:
-                fileImage.write(item_data)
-
-            if DIRECTORY_FILES_ not in to_rar_directory:
-                to_rar_directory[DIRECTORY_FILES_] = ITEM_DIR_
-
-        # print(to_rar_directory, DIRECTORY_BASE_, DIR_RAR_FILES)
+            with self.contexts.context.timer(
+                stage='write',
+                bytes_in=len(item_data)
+            ) as record:
+                with open(file_path_, 'wb') as fileImage:
+                    fileImage.write(item_data)
+                record['bytes_out'] = len(item_data)
+            # the image is written, its memory is released.
+            self.contexts.context.release(nbytes=len(item_data))
+
+            if DIRECTORY_FILES_ not in bytes_directory:
+                bytes_directory[DIRECTORY_FILES_] = 0
+            bytes_directory[DIRECTORY_FILES_] += len(item_data)
+
+        if join and not last_item:
+            return metadata_rar
+        self.DIRECTORIES_ = None
+
+        # print(DIRECTORY_BASE_, DIR_RAR_FILES)
         # print(converted_comicpy_path, CONVERTED_COMICPY_PATH_)
 
-        for name_dir, rar_name in to_rar_directory.items():
+        for name_dir in bytes_directory:
             # print(name_dir, rar_name, pathCBRconverted)
 
             self.FILE_RAR_ = Paths.build(
@@ -271,12 +341,21 @@ class RarHandler(BaseZipRarHandler):
                                     directory_rar_temp_
                                 )
 
-            process = subprocess.run(
-                args=command.split(),
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                shell=False
-            )
+            size = os.path.getsize(self.FILE_RAR_) \
+                if Paths.exists(self.FILE_RAR_) else 0
+            with self.contexts.context.timer(
+                stage='rar',
+                bytes_in=bytes_directory[name_dir]
+            ) as record, span('rar', cat='subprocess'):
+                process = subprocess.run(
+                    args=command.split(),
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    shell=False
+                )
+                if Paths.exists(self.FILE_RAR_):
+                    record['bytes_out'] = \
+                        os.path.getsize(self.FILE_RAR_) - size
 
             # print('--> retuncode: ', process.returncode)
 
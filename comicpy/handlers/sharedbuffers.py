@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""
+Transport of image data between processes using shared memory segments.
+
+The data of the images is written into `multiprocessing.shared_memory`
+segments, the worker processes only receive the name and size of the
+segments, so the data of the images is never pickled.
+
+Used by `ImagesHandler` with the 'process' backend.
+"""
+
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from uuid import uuid4
+
+from typing import List, Tuple
+
+
+class SharedBuffers:
+    """
+    Class in charge of the lifecycle of the shared memory segments used by a
+    batch of images. All segments still alive are removed when the batch
+    ends, even if an error occurs.
+    """
+    PREFIX = 'comicpy_'
+
+    def __init__(self) -> None:
+        """
+        Constructor.
+        """
+        self.names: List[str] = []
+
+    def new_name(self) -> str:
+        """
+        Reserves a name for a segment, it can be created by a worker process.
+
+        Returns
+            str: name of segment.
+        """
+        name = '%s%s' % (SharedBuffers.PREFIX, uuid4().hex[:20])
+        self.names.append(name)
+        return name
+
+    def put(
+        self,
+        data: bytes
+    ) -> Tuple[str, int]:
+        """
+        Creates a segment with the data given.
+
+        Args
+            data: raw data.
+
+        Returns
+            tuple: name and size of segment.
+        """
+        name = self.new_name()
+        write_buffer(name=name, data=data)
+        return name, len(data)
+
+    def take(
+        self,
+        name: str,
+        size: int
+    ) -> bytes:
+        """
+        Reads the data of a segment and removes it.
+
+        Args
+            name: name of segment.
+            size: size of data.
+
+        Returns
+            bytes: raw data.
+        """
+        segment = SharedMemory(name=name)
+        try:
+            data = bytes(segment.buf[:size])
+        finally:
+            segment.close()
+            segment.unlink()
+        self.names.remove(name)
+        return data
+
+    def release(self) -> None:
+        """
+        Removes all segments that are still alive.
+        """
+        for name in self.names:
+            try:
+                segment = SharedMemory(name=name)
+            except FileNotFoundError:
+                continue
+            segment.close()
+            segment.unlink()
+        self.names = []
+
+    def __enter__(self) -> 'SharedBuffers':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.release()
+
+
+def ensure_tracker() -> None:
+    """
+    Starts the resource tracker before the worker processes, so parent and
+    workers share it and the segments left by a dead process are removed.
+    """
+    resource_tracker.ensure_running()
+
+
+def read_buffer(
+    name: str,
+    size: int
+) -> bytes:
+    """
+    Reads the data of a segment created by other process.
+
+    Args
+        name: name of segment.
+        size: size of data.
+
+    Returns
+        bytes: raw data.
+    """
+    segment = SharedMemory(name=name)
+    try:
+        return bytes(segment.buf[:size])
+    finally:
+        segment.close()
+
+
+def write_buffer(
+    name: str,
+    data: bytes
+) -> int:
+    """
+    Creates a segment with given name and writes the data.
+
+    Args
+        name: name of segment.
+        data: raw data.
+
+    Returns
+        int: size of data.
+    """
+    size = len(data)
+    # segments of size zero are not allowed.
+    segment = SharedMemory(name=name, create=True, size=max(size, 1))
+    try:
+        segment.buf[:size] = data
+    finally:
+        segment.close()
+    return size
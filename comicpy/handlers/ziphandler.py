@@ -5,6 +5,7 @@ Handler related to files ZIP.
 
 from comicpy.handlers.imageshandler import ImagesHandler
 from comicpy.utils import Paths
+from comicpy.context import ConversionContexts, ContextAttribute
 
 from comicpy.models import (
     CurrentFile,
@@ -15,9 +16,12 @@ from comicpy.handlers.baseziprar import BaseZipRarHandler
 from comicpy.valid_extensions import ValidExtensions
 
 from comicpy.exceptionsClasses import BadPassword
+from comicpy.tracing import traced
 
 import pyzipper
 import zipfile
+import os
+from time import perf_counter
 
 # from uuid import uuid1
 # import tempfile
@@ -33,26 +37,38 @@ class ZipHandler(BaseZipRarHandler):
     Class in charge of extract images, rename file ZIP, create ZIP file, write
     data into ZIP file.
     """
+    # state of the conversion of the current thread.
+    number_index = ContextAttribute('zip_number_index')
+    FILE_CBZ_ = ContextAttribute('FILE_CBZ_')
+    FILE_ZIP_ = ContextAttribute('FILE_ZIP_')
+    CONVERTED_COMICPY_PATH_ = ContextAttribute('zip_converted_path')
 
     def __init__(
         self,
         unit: Literal['b', 'kb', 'mb', 'gb'] = 'mb',
+        imageshandler: ImagesHandler = None,
+        contexts: ConversionContexts = None
     ) -> None:
         """
         Constructor.
 
         Args:
             unit: indicate unit of measure using to represent file size.
+            imageshandler: `ImagesHandler` instance used to transcode images,
+                           by default a new one without parallelism.
+            contexts: `ConversionContexts` instance with the state of the
+                      conversions, shared with `ComicPy`, by default a new
+                      one.
         """
         self.unit = unit
         self.type = 'zip'
-        self.imageshandler = ImagesHandler()
+        if imageshandler is None:
+            imageshandler = ImagesHandler()
+        self.imageshandler = imageshandler
         self.validextentions = ValidExtensions()
-        self.number_index = 1
-
-        self.FILE_CBZ_ = None
-        self.FILE_ZIP_ = None
-        self.CONVERTED_COMICPY_PATH_ = None
+        if contexts is None:
+            contexts = ConversionContexts()
+        self.contexts = contexts
 
         warnings.filterwarnings("ignore", category=UserWarning)
 
@@ -87,6 +103,36 @@ class ZipHandler(BaseZipRarHandler):
         except RuntimeError:
             return True
 
+    def verify(
+        self,
+        filename: str,
+        decode: bool = False,
+        workers: int = None
+    ) -> bool:
+        """
+        Checks the structure of a ZIP or CBZ file: its central directory is
+        parsed and the CRC of each member is checked, reading them in chunks.
+
+        Args:
+            filename: path of ZIP or CBZ file.
+            decode: `True` to also decode every image in parallel.
+            workers: number of threads decoding images, `None` uses the
+                     number of CPUs.
+
+        Returns:
+            bool: `True` if file is valid, otherwise, `False`.
+        """
+        try:
+            with zipfile.ZipFile(filename, mode='r') as fileZip:
+                if decode:
+                    return super().decode_members(
+                                        instanceCompress=fileZip,
+                                        workers=workers
+                                    )
+                return fileZip.testzip() is None
+        except Exception:
+            return False
+
     def rename_zip_cbz(
         self,
         currentFileZip: CurrentFile
@@ -160,6 +206,7 @@ class ZipHandler(BaseZipRarHandler):
         except Exception:
             return None
 
+    @traced(cat='writer', arg='pathCBZconverted')
     def to_zip(
         self,
         join: bool,
@@ -210,47 +257,54 @@ class ZipHandler(BaseZipRarHandler):
         # DELETE THIS
         # print(self.FILE_CBZ_, self.FILE_ZIP_)
 
-        for item in data_list:
-            # names_dir = Paths.get_dirname(item.filename)
-            # name_item = Paths.get_basename(item.filename)
-            # print('-> ', name_item)
-            if join is True:
-                if first_directory is False:
-                    ITEM_DIR_ = Paths.get_dirname_level(
-                                                item.filename,
-                                                level=-1
-                                            )
-                first_directory = True
-            else:
-                ITEM_DIR_ = Paths.get_dirname_level(
-                                            item.filename,
-                                            level=-1
-                                        )
-
-            if ITEM_DIR_ == '.':
-                ITEM_DIR_ = name_
-
-            ITEM_DIR_ = ITEM_DIR_.replace(' ', '_')
-
-            # print(pathCBZconverted, ITEM_DIR_, self.CONVERTED_COMICPY_PATH_)
-
+        if data_list != []:
             self.FILE_CBZ_ = pathCBZconverted
 
+            # with join the ZIP file grows, only the bytes added are counted.
+            size = os.path.getsize(self.FILE_CBZ_) \
+                if Paths.exists(self.FILE_CBZ_) else 0
+            bytes_in = 0
+            start = perf_counter()
+            # the ZIP file is opened once for all the items, instead of
+            # reopening it in append mode by item.
             with zipfile.ZipFile(
                 file=self.FILE_CBZ_, mode='a',
                 compression=zipfile.ZIP_DEFLATED,
                 allowZip64=False
             ) as zip_file:
+                for item in data_list:
+                    if join is True:
+                        if first_directory is False:
+                            ITEM_DIR_ = Paths.get_dirname_level(
+                                                item.filename,
+                                                level=-1
+                                            )
+                        first_directory = True
+                    else:
+                        ITEM_DIR_ = Paths.get_dirname_level(
+                                            item.filename,
+                                            level=-1
+                                        )
 
-                directory_path = item.filename
-
-                info_file_zip = zipfile.ZipInfo(filename=directory_path)
-                info_file_zip.compress_type = zipfile.ZIP_DEFLATED
-
-                zip_file.writestr(
-                        zinfo_or_arcname=item.filename,
-                        data=item.bytes_data.getvalue()
-                    )
+                    if ITEM_DIR_ == '.':
+                        ITEM_DIR_ = name_
+
+                    ITEM_DIR_ = ITEM_DIR_.replace(' ', '_')
+
+                    data = item.bytes_data.getvalue()
+                    zip_file.writestr(
+                            zinfo_or_arcname=item.filename,
+                            data=data
+                        )
+                    bytes_in += len(data)
+                    # the image is written, its memory is released.
+                    self.contexts.context.release(nbytes=len(data))
+            self.contexts.context.metrics.add(
+                    stage='write',
+                    seconds=perf_counter() - start,
+                    bytes_in=bytes_in,
+                    bytes_out=os.path.getsize(self.FILE_CBZ_) - size
+                )
 
         if join:
             if last_item:
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+"""
+Manifest of converted files, used by incremental conversions of directories.
+
+The manifest is stored next to the output files, in
+`Converted_comicpy/<directory>/.comicpy_manifest.json`, it records the size,
+modification time, hash and conversion settings of each input file, and the
+output files generated. Inputs not changed since the last conversion are
+skipped.
+"""
+
+from comicpy.utils import Paths
+
+import json
+import os
+
+from typing import List, Union
+
+
+class ConversionManifest:
+    """
+    Class in charge of loading, checking and saving the records of converted
+    files.
+    """
+    FILENAME = '.comicpy_manifest.json'
+    VERSION = 1
+
+    def __init__(
+        self,
+        directory: str
+    ) -> None:
+        """
+        Constructor.
+
+        Args:
+            directory: output directory, where the manifest is stored.
+        """
+        self.path = Paths.build(directory, ConversionManifest.FILENAME)
+        self.records = {}
+        self.load()
+
+    def load(self) -> None:
+        """
+        Loads the records of manifest, an invalid manifest is ignored.
+        """
+        try:
+            with open(self.path, 'r', encoding='utf-8') as file:
+                content = json.load(file)
+            if content.get('version') == ConversionManifest.VERSION:
+                self.records = content['files']
+        except (OSError, ValueError, KeyError, AttributeError):
+            self.records = {}
+
+    def save(self) -> None:
+        """
+        Saves the records of manifest.
+        """
+        path_temp = '%s.tmp' % self.path
+        with open(path_temp, 'w', encoding='utf-8') as file:
+            json.dump(
+                {'version': ConversionManifest.VERSION, 'files': self.records},
+                file,
+                indent=1
+            )
+        os.replace(path_temp, self.path)
+
+    def is_current(
+        self,
+        entry: os.DirEntry,
+        settings: dict
+    ) -> bool:
+        """
+        Checks if an input file was converted with the same settings and was
+        not changed since then. The hash is only calculated if the size is
+        the same but the modification time changed.
+
+        Args
+            entry: `os.DirEntry` of input file.
+            settings: conversion settings.
+
+        Returns
+            bool: `True` if the outputs of the file are current.
+        """
+        record = self.records.get(Paths.get_abs_path(entry.path))
+        if record is None or record['settings'] != settings:
+            return False
+
+        outputs_exists = all(
+                Paths.exists(item['name'])
+                for item in record['outputs']
+            )
+        if not outputs_exists:
+            return False
+
+        stat = entry.stat()
+        if stat.st_size != record['size']:
+            return False
+        if stat.st_mtime_ns == record['mtime']:
+            return True
+
+        if Paths.get_hash(path=entry.path) == record['hash']:
+            record['mtime'] = stat.st_mtime_ns
+            return True
+        return False
+
+    def get_outputs(
+        self,
+        entry: os.DirEntry
+    ) -> Union[List[dict], None]:
+        """
+        Returns the metadata of the outputs of an input file.
+        """
+        record = self.records.get(Paths.get_abs_path(entry.path))
+        if record is None:
+            return None
+        return record['outputs']
+
+    def remove_outputs(
+        self,
+        entry: os.DirEntry
+    ) -> None:
+        """
+        Removes the outputs of a previous conversion of an input file, the
+        archives are opened in append mode and they are regenerated.
+        """
+        outputs = self.get_outputs(entry=entry)
+        if outputs is None:
+            return
+        for item in outputs:
+            Paths.remove(path=item['name'])
+        del self.records[Paths.get_abs_path(entry.path)]
+
+    def update(
+        self,
+        entry: os.DirEntry,
+        settings: dict,
+        outputs: List[dict]
+    ) -> None:
+        """
+        Records the conversion of an input file.
+
+        Args
+            entry: `os.DirEntry` of input file.
+            settings: conversion settings.
+            outputs: list of dictionaries with metadata of output files.
+        """
+        stat = entry.stat()
+        self.records[Paths.get_abs_path(entry.path)] = {
+            'size': stat.st_size,
+            'mtime': stat.st_mtime_ns,
+            'hash': Paths.get_hash(path=entry.path),
+            'settings': settings,
+            'outputs': outputs
+        }
@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+"""
+Budget of memory of the images in flight.
+
+The data of the input files, the images extracted from them and the images
+transcoded (`ImageComicData.bytes_data`) are kept in memory until they are
+written. The producers (PDF extraction, reading of RAR and ZIP files, reading
+of directories) acquire their size from a `MemoryBudget` shared by the
+conversions of the process, and wait when the bytes in flight pass the limit;
+the writers release them as the images are written.
+
+The bytes are acquired by the conversion that produced them (its
+`ConversionContext`). The data of an input file is kept until its images are
+extracted, it is not released by the writers.
+
+A conversion whose images are written while the next ones are produced (see
+`draining`), waits while its own images are written, so it passes the limit
+by one batch of images at most. Other conversions keep all their images until
+they write them, so to avoid deadlocks the oldest conversion holding bytes
+never waits for them, the other conversions wait until it releases its bytes.
+"""
+
+from contextlib import contextmanager
+from threading import Condition
+from time import perf_counter
+
+from typing import Any, Dict, Iterator
+
+
+class MemoryBudget:
+    """
+    Class in charge of limiting the bytes of images in flight, shared by the
+    conversions of a process.
+    """
+
+    def __init__(
+        self,
+        limit: int = None
+    ) -> None:
+        """
+        Constructor.
+
+        Args:
+            limit: maximum number of bytes in flight, `None` has no limit,
+                   only the statistics are kept. Default is `None`.
+
+        Raises:
+            ValueError: if `limit` is less than 1.
+        """
+        if limit is not None and limit < 1:
+            raise ValueError('"limit" must be greater than 0.')
+        self.limit = limit
+        self.condition = Condition()
+        # bytes held by owner, in the order they acquired their first bytes.
+        self.holders: Dict[Any, int] = {}
+        # bytes of the input files held by owner, not released by writers.
+        self.kept: Dict[Any, int] = {}
+        # owners whose images are written while they produce others, with
+        # the bytes they held, not kept, when they started.
+        self.drainers: Dict[Any, int] = {}
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        """
+        Resets the statistics, the bytes in flight are kept.
+        """
+        with self.condition:
+            self.stats = {
+                'current': sum(self.holders.values()),
+                'peak': sum(self.holders.values()),
+                'waits': 0,
+                'wait_time': 0.0
+            }
+
+    def can_acquire(
+        self,
+        nbytes: int,
+        owner: Any
+    ) -> bool:
+        """
+        Checks if an owner can acquire bytes without waiting, it must be
+        called holding the lock.
+        """
+        if self.limit is None:
+            return True
+        if self.stats['current'] + nbytes <= self.limit:
+            return True
+        if self.holders and next(iter(self.holders)) is not owner:
+            return False
+        # the oldest holder always finishes, if its images are being written
+        # it waits for them.
+        if owner in self.drainers:
+            return self.get_pending(owner=owner) <= self.drainers[owner]
+        return True
+
+    def get_pending(
+        self,
+        owner: Any
+    ) -> int:
+        """
+        Returns the bytes of an owner released by the writers, it must be
+        called holding the lock.
+        """
+        return self.holders.get(owner, 0) - self.kept.get(owner, 0)
+
+    def wait_for(
+        self,
+        nbytes: int,
+        owner: Any
+    ) -> None:
+        """
+        Waits until an owner can acquire bytes, it must be called holding
+        the lock.
+        """
+        if self.can_acquire(nbytes=nbytes, owner=owner):
+            return
+        start = perf_counter()
+        self.condition.wait_for(
+            lambda: self.can_acquire(nbytes=nbytes, owner=owner)
+        )
+        self.stats['waits'] += 1
+        self.stats['wait_time'] += perf_counter() - start
+
+    def wait(
+        self,
+        owner: Any
+    ) -> None:
+        """
+        Waits while the bytes in flight pass the limit, before an owner
+        produces more images.
+
+        Args
+            owner: owner of bytes, the context of the conversion.
+        """
+        with self.condition:
+            self.wait_for(nbytes=0, owner=owner)
+
+    def acquire(
+        self,
+        nbytes: int,
+        owner: Any,
+        wait: bool = True,
+        keep: bool = False
+    ) -> None:
+        """
+        Acquires bytes for an owner, waiting while the bytes in flight pass
+        the limit.
+
+        Args
+            nbytes: number of bytes.
+            owner: owner of bytes, the context of the conversion.
+            wait: `False` to acquire the bytes without waiting, used for
+                  bytes that are already in memory. Default is `True`.
+            keep: `True` for the data of an input file, it is not released
+                  by the writers. Default is `False`.
+        """
+        with self.condition:
+            if wait:
+                self.wait_for(nbytes=nbytes, owner=owner)
+            self.holders[owner] = self.holders.get(owner, 0) + nbytes
+            if keep:
+                self.kept[owner] = self.kept.get(owner, 0) + nbytes
+            self.stats['current'] += nbytes
+            self.stats['peak'] = max(self.stats['peak'], self.stats['current'])
+
+    def release(
+        self,
+        nbytes: int,
+        owner: Any,
+        keep: bool = False
+    ) -> None:
+        """
+        Releases bytes of an owner, at most the bytes it holds.
+
+        Args
+            nbytes: number of bytes.
+            owner: owner of bytes, the context of the conversion.
+            keep: `True` for the data of an input file. Default is `False`.
+        """
+        with self.condition:
+            held = self.holders.get(owner, 0)
+            nbytes = min(nbytes, held)
+            if nbytes <= 0:
+                return
+            if held == nbytes:
+                del self.holders[owner]
+                self.kept.pop(owner, None)
+            else:
+                self.holders[owner] = held - nbytes
+                if keep and owner in self.kept:
+                    self.kept[owner] = max(self.kept[owner] - nbytes, 0)
+            self.stats['current'] -= nbytes
+            self.condition.notify_all()
+
+    @contextmanager
+    def draining(
+        self,
+        owner: Any
+    ) -> Iterator[None]:
+        """
+        Marks an owner whose images are written while it produces others, it
+        waits while its images are written instead of passing the limit.
+
+        Args
+            owner: owner of bytes, the context of the conversion.
+        """
+        with self.condition:
+            self.drainers[owner] = self.get_pending(owner=owner)
+        try:
+            yield
+        finally:
+            with self.condition:
+                self.drainers.pop(owner, None)
+                self.condition.notify_all()
+
+    def release_all(
+        self,
+        owner: Any
+    ) -> None:
+        """
+        Releases all the bytes of an owner, when its conversion ends.
+
+        Args
+            owner: owner of bytes, the context of the conversion.
+        """
+        with self.condition:
+            nbytes = self.holders.get(owner, 0)
+        self.release(nbytes=nbytes, owner=owner)
+
+    def report(self) -> str:
+        """
+        Returns a summary of the bytes in flight and the time waiting.
+
+        Returns
+            str: summary of the statistics.
+        """
+        return 'Memory in flight: current %.2f MB, peak %.2f MB, ' \
+            'waits: %d, waiting: %.2f s' % (
+                self.stats['current'] / 10**6,
+                self.stats['peak'] / 10**6,
+                self.stats['waits'],
+                self.stats['wait_time']
+            )
@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+"""
+Timing of the stages of conversions.
+
+Each conversion measures the time, the calls and the bytes in and out of its
+stages, in a `Metrics` instance of its `ConversionContext`:
+
+* 'read'        :  reading of input files and images of directories.
+* 'check'       :  check of file signature.
+* 'protection'  :  test of password protection of RAR and ZIP files.
+* 'extract'     :  extraction of images of PDF files, reading of members of
+                   RAR and ZIP files.
+* 'decode'      :  decoding and color conversion of images.
+* 'resize'      :  resizing of images.
+* 'encode'      :  encoding of images.
+* 'write'       :  writing of CBZ files, of images before the RAR command and
+                   of CBR, CBZ files found inside archives.
+* 'rar'         :  RAR command.
+
+When a conversion ends, its metrics are kept as `ComicPy.last_stats`, by
+thread, and added to the totals of the instance, `ComicPy.metrics`, which
+can be exported in the Prometheus text format.
+"""
+
+from contextlib import contextmanager
+from threading import Lock
+from time import perf_counter
+import os
+
+from typing import Dict, Iterator
+
+
+class Metrics:
+    """
+    Class in charge of keeping the time, calls and bytes in and out by stage
+    of conversions.
+    """
+    STAGES = (
+        'read',
+        'check',
+        'protection',
+        'extract',
+        'decode',
+        'resize',
+        'encode',
+        'write',
+        'rar'
+    )
+    # key, name and help of metrics in the Prometheus text format.
+    PROMETHEUS = (
+        ('calls', 'comicpy_stage_calls_total', 'Calls of stage.'),
+        ('seconds', 'comicpy_stage_seconds_total', 'Time in stage.'),
+        ('bytes_in', 'comicpy_stage_bytes_in_total', 'Bytes read by stage.'),
+        ('bytes_out', 'comicpy_stage_bytes_out_total',
+            'Bytes produced by stage.')
+    )
+
+    def __init__(self) -> None:
+        """
+        Constructor.
+        """
+        self.lock = Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Resets the metrics.
+        """
+        with self.lock:
+            self.stages: Dict[str, dict] = {}
+
+    def add(
+        self,
+        stage: str,
+        seconds: float = 0.0,
+        bytes_in: int = 0,
+        bytes_out: int = 0,
+        calls: int = 1
+    ) -> None:
+        """
+        Adds a measure of a stage.
+
+        Args
+            stage: name of stage.
+            seconds: time in stage.
+            bytes_in: bytes read by stage.
+            bytes_out: bytes produced by stage.
+            calls: number of calls.
+        """
+        with self.lock:
+            values = self.stages.setdefault(stage, {
+                            'calls': 0,
+                            'seconds': 0.0,
+                            'bytes_in': 0,
+                            'bytes_out': 0
+                        })
+            values['calls'] += calls
+            values['seconds'] += seconds
+            values['bytes_in'] += bytes_in
+            values['bytes_out'] += bytes_out
+
+    @contextmanager
+    def timer(
+        self,
+        stage: str,
+        bytes_in: int = 0
+    ) -> Iterator[dict]:
+        """
+        Measures the time of a stage, the bytes can be set in the dictionary
+        given.
+
+        Args
+            stage: name of stage.
+            bytes_in: bytes read by stage.
+
+        Returns
+            dict: 'bytes_in' and 'bytes_out' of stage.
+        """
+        record = {'bytes_in': bytes_in, 'bytes_out': 0}
+        start = perf_counter()
+        try:
+            yield record
+        finally:
+            self.add(
+                stage=stage,
+                seconds=perf_counter() - start,
+                bytes_in=record['bytes_in'],
+                bytes_out=record['bytes_out']
+            )
+
+    def merge(
+        self,
+        stats: Dict[str, dict]
+    ) -> None:
+        """
+        Adds the metrics of other instance, given by `snapshot`.
+
+        Args
+            stats: metrics by stage.
+        """
+        for stage, values in stats.items():
+            self.add(stage=stage, **values)
+
+    def snapshot(self) -> Dict[str, dict]:
+        """
+        Returns a copy of the metrics, in the order of `STAGES`.
+
+        Returns
+            dict: dictionaries with 'calls', 'seconds', 'bytes_in' and
+                  'bytes_out', by stage.
+        """
+        with self.lock:
+            stages = sorted(
+                    self.stages,
+                    key=lambda stage: (
+                        Metrics.STAGES.index(stage)
+                        if stage in Metrics.STAGES else len(Metrics.STAGES),
+                        stage
+                    )
+                )
+            return {stage: dict(self.stages[stage]) for stage in stages}
+
+    def report(self) -> str:
+        """
+        Returns a summary of the time and bytes by stage.
+
+        Returns
+            str: summary of the metrics.
+        """
+        lines = []
+        for stage, values in self.snapshot().items():
+            lines.append(
+                '%-10s %6d calls %9.3f s  in: %.2f MB  out: %.2f MB' % (
+                    stage,
+                    values['calls'],
+                    values['seconds'],
+                    values['bytes_in'] / 10**6,
+                    values['bytes_out'] / 10**6
+                )
+            )
+        return '\n'.join(lines)
+
+    def to_prometheus(self) -> str:
+        """
+        Returns the metrics in the Prometheus text format.
+
+        Returns
+            str: metrics as text.
+        """
+        stats = self.snapshot()
+        lines = []
+        for key, name, text in Metrics.PROMETHEUS:
+            lines.append('# HELP %s %s' % (name, text))
+            lines.append('# TYPE %s counter' % name)
+            for stage, values in stats.items():
+                lines.append(
+                    '%s{stage="%s"} %s' % (name, stage, values[key])
+                )
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(
+        self,
+        path: str
+    ) -> None:
+        """
+        Writes the metrics in the Prometheus text format. The file is
+        replaced at once, it can be read by the textfile collector of
+        `node_exporter`.
+
+        Args
+            path: path of file.
+        """
+        temp_path = '%s.%d.tmp' % (path, os.getpid())
+        with open(temp_path, 'w') as file:
+            file.write(self.to_prometheus())
+        os.replace(temp_path, path)
@@ -198,6 +198,16 @@ class ImageComicData(FileBaseClass):
         self.is_comic = False
         self.unit = unit
         self.original_name = None
+        # color mode of image and memory of decoded pixels saved if it is
+        # grayscale.
+        self.mode = None
+        self.decoded_bytes_saved = 0
+        # `True` if the data was loaded from the cache of transcoded images.
+        self.cached = False
+        # time, bytes in and out by stage of transcoding.
+        self.timings = {}
+        # difference hash of image, used to drop near duplicate pages.
+        self.dhash = None
         self.size = super().get_size()
         super().get_extension()
 
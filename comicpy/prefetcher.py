@@ -0,0 +1,248 @@
+# -*- coding: utf-8 -*-
+"""
+Read-ahead of input files and images.
+
+While a file or image is decoded and encoded, the next ones are read by
+background threads into a bounded buffer, so the disk and the CPU work at the
+same time. The time waiting for the reads and the time working between them
+are measured.
+
+The data read ahead is kept in the memory budget of the conversion that
+requests it (see `ConversionContext.keep`) until it is requested.
+"""
+
+from concurrent.futures import ThreadPoolExecutor, Future
+from collections import deque
+from threading import Lock
+from time import perf_counter
+
+from comicpy.tracing import span
+
+from typing import Any, Callable, Deque, List, Tuple
+
+
+class IOStats:
+    """
+    Class in charge of keeping the statistics of the reads: files and bytes
+    read, time reading, time waiting for reads and time working between
+    them.
+    """
+
+    def __init__(self) -> None:
+        """
+        Constructor.
+        """
+        self.lock = Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Resets the statistics.
+        """
+        self.stats = {
+            'files': 0,
+            'bytes': 0,
+            'read': 0.0,
+            'io_wait': 0.0,
+            'cpu': 0.0
+        }
+
+    def add(
+        self,
+        **values: float
+    ) -> None:
+        """
+        Adds values to the statistics.
+
+        Args
+            values: values by name of statistic.
+        """
+        with self.lock:
+            for key, value in values.items():
+                self.stats[key] += value
+
+    def report(self) -> str:
+        """
+        Returns a summary of the time waiting for reads and the time working.
+
+        Returns
+            str: summary of the statistics.
+        """
+        return 'Read: %d files, %.2f MB in %.2f s, ' \
+            'waiting I/O: %.2f s, working: %.2f s' % (
+                self.stats['files'],
+                self.stats['bytes'] / 10**6,
+                self.stats['read'],
+                self.stats['io_wait'],
+                self.stats['cpu']
+            )
+
+
+def read_file(
+    path: str
+) -> bytes:
+    """
+    Reads the data of a file.
+    """
+    with open(path, 'rb') as file:
+        return file.read()
+
+
+class Prefetcher:
+    """
+    Class in charge of reading the next files of a list in background
+    threads, keeping at most `depth` files read or in progress.
+
+    The files must be requested with `get` in the order of the list, files
+    skipped are discarded. With `depth` `0` the files are read when they are
+    requested, only the statistics are kept.
+    """
+
+    def __init__(
+        self,
+        paths: List[str],
+        depth: int = 2,
+        iostats: IOStats = None,
+        reader: Callable[[str], bytes] = read_file,
+        context: Any = None
+    ) -> None:
+        """
+        Constructor.
+
+        Args:
+            paths: paths of files, in the order they are requested.
+            depth: number of files read ahead. Default is `2`.
+            iostats: `IOStats` instance to keep the statistics, by default a
+                     new one.
+            reader: function used to read a file.
+            context: `ConversionContext` of the conversion, the data read is
+                     kept in its memory budget until it is requested.
+        """
+        if depth < 0:
+            raise ValueError('"depth" must be greater or equal than 0.')
+        self.depth = depth
+        self.iostats = iostats if iostats is not None else IOStats()
+        self.reader = reader
+        self.context = context
+        self.pending: Deque[str] = deque(str(path) for path in paths)
+        self.window: Deque[Tuple[str, Future]] = deque()
+        self.executor = None
+        if depth > 0:
+            self.executor = ThreadPoolExecutor(
+                                max_workers=depth,
+                                thread_name_prefix='comicpy-prefetch'
+                            )
+        # end of the last request, the time after it is working time.
+        self.last = None
+        self.fill()
+
+    def read(
+        self,
+        path: str
+    ) -> bytes:
+        """
+        Reads a file and adds the read to the statistics.
+        """
+        start = perf_counter()
+        with span('prefetch', cat='io', path=path):
+            data = self.reader(path)
+        self.iostats.add(
+                files=1,
+                bytes=len(data),
+                read=perf_counter() - start
+            )
+        if self.context is not None:
+            # already in memory, it is accounted without waiting.
+            self.context.acquire(nbytes=len(data), wait=False, keep=True)
+        return data
+
+    def discard(
+        self,
+        future: Future
+    ) -> None:
+        """
+        Discards a read not requested, releasing its data from the budget
+        when the read ends.
+        """
+        def release(future: Future) -> None:
+            if future.cancelled() or future.exception() is not None:
+                return
+            self.context.release(nbytes=len(future.result()), keep=True)
+
+        if not future.cancel() and self.context is not None:
+            future.add_done_callback(release)
+
+    def fill(self) -> None:
+        """
+        Starts the reads of the next files, until the buffer is full.
+        """
+        if self.executor is None:
+            return
+        while self.pending and len(self.window) < self.depth:
+            path = self.pending.popleft()
+            self.window.append((path, self.executor.submit(self.read, path)))
+
+    def get(
+        self,
+        path: str
+    ) -> bytes:
+        """
+        Returns the data of a file, waiting for its read if it is not ready.
+        Files of the list before it are discarded.
+
+        Args
+            path: path of file.
+
+        Returns
+            bytes: data of file.
+        """
+        path = str(path)
+        start = perf_counter()
+        if self.last is not None:
+            self.iostats.add(cpu=start - self.last)
+
+        future = None
+        while self.window:
+            path_, future_ = self.window.popleft()
+            if path_ == path:
+                future = future_
+                break
+            self.discard(future=future_)
+
+        if future is None and path in self.pending:
+            while self.pending.popleft() != path:
+                continue
+
+        try:
+            if future is not None:
+                data = future.result()
+            else:
+                data = self.read(path)
+        finally:
+            self.fill()
+            self.last = perf_counter()
+            self.iostats.add(io_wait=self.last - start)
+        if self.context is not None:
+            self.context.release(nbytes=len(data), keep=True)
+        return data
+
+    def close(self) -> None:
+        """
+        Cancels the pending reads and stops the threads.
+        """
+        if self.last is not None:
+            self.iostats.add(cpu=perf_counter() - self.last)
+            self.last = None
+        self.pending.clear()
+        for path, future in self.window:
+            self.discard(future=future)
+        self.window.clear()
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+
+    def __enter__(self) -> 'Prefetcher':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
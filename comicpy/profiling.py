@@ -0,0 +1,260 @@
+# -*- coding: utf-8 -*-
+"""
+Profiling of conversions, used by `--profiler` in the CLI.
+
+* 'cpu'  :  `cProfile` of the run, written as a `.pstats` file, with a
+            summary of the functions with more cumulative time.
+* 'mem'  :  `tracemalloc` of the run, with the peak of memory allocated by
+            each file converted and the sites with more memory allocated
+            when the run ends, the snapshot is written to a file, it can be
+            read with `tracemalloc.Snapshot.load`.
+
+Only the thread or process that runs the conversions is profiled, the
+threads and processes of `workers` and `jobs` are not; with their defaults
+the whole conversion runs in it.
+"""
+
+from contextlib import contextmanager, nullcontext
+import tracemalloc
+import cProfile
+import pstats
+import io
+
+from typing import ContextManager, Dict, Iterator, Union
+
+
+class CPUProfiler:
+    """
+    Class in charge of the `cProfile` of a run.
+    """
+    MODE = 'cpu'
+    EXTENSION = '.pstats'
+
+    def __init__(
+        self,
+        path: str = None,
+        top: int = 20
+    ) -> None:
+        """
+        Constructor.
+
+        Args:
+            path: path of `.pstats` file, `None` does not write it.
+            top: number of functions of summary. Default is 20.
+        """
+        self.path = path
+        self.top = top
+        self.profile = cProfile.Profile()
+
+    def start(self) -> None:
+        """
+        Starts profiling.
+        """
+        self.profile.enable()
+
+    def stop(self) -> None:
+        """
+        Stops profiling and writes the `.pstats` file.
+        """
+        self.profile.disable()
+        if self.path is not None:
+            self.profile.dump_stats(self.path)
+
+    def file(
+        self,
+        filename: str
+    ) -> ContextManager[None]:
+        """
+        The time of files is not measured apart, see `MemoryProfiler.file`.
+        """
+        return nullcontext()
+
+    def report(self) -> str:
+        """
+        Returns the functions with more cumulative time.
+
+        Returns
+            str: summary of the profile.
+        """
+        text = io.StringIO()
+        stats = pstats.Stats(self.profile, stream=text)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.top)
+        return text.getvalue().strip('\n')
+
+
+class MemoryProfiler:
+    """
+    Class in charge of the `tracemalloc` of a run.
+    """
+    MODE = 'mem'
+    EXTENSION = '.tracemalloc'
+
+    def __init__(
+        self,
+        path: str = None,
+        top: int = 20,
+        frames: int = 1
+    ) -> None:
+        """
+        Constructor.
+
+        Args:
+            path: path of snapshot file, `None` does not write it.
+            top: number of allocation sites of summary. Default is 20.
+            frames: number of frames kept by allocation. Default is 1.
+        """
+        self.path = path
+        self.top = top
+        self.frames = frames
+        # peak of memory allocated by file, in bytes.
+        self.files: Dict[str, int] = {}
+        self.peak = 0
+        self.snapshot = None
+
+    def start(self) -> None:
+        """
+        Starts tracing the allocations.
+        """
+        tracemalloc.start(self.frames)
+
+    def stop(self) -> None:
+        """
+        Takes the snapshot of the allocations, stops tracing them and writes
+        the snapshot file.
+        """
+        self.snapshot = tracemalloc.take_snapshot().filter_traces([
+                            tracemalloc.Filter(False, tracemalloc.__file__)
+                        ])
+        self.peak = max(self.peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        if self.path is not None:
+            self.snapshot.dump(self.path)
+
+    @contextmanager
+    def file(
+        self,
+        filename: str
+    ) -> Iterator[None]:
+        """
+        Measures the peak of memory allocated while a file is converted,
+        over the memory allocated before it.
+
+        Args
+            filename: path of file.
+        """
+        if not tracemalloc.is_tracing():
+            yield
+            return
+        current, peak = tracemalloc.get_traced_memory()
+        self.peak = max(self.peak, peak)
+        tracemalloc.reset_peak()
+        try:
+            yield
+        finally:
+            peak = tracemalloc.get_traced_memory()[1]
+            self.peak = max(self.peak, peak)
+            self.files[filename] = max(
+                                self.files.get(filename, 0),
+                                peak - current
+                            )
+
+    def report(self) -> str:
+        """
+        Returns the peak of memory by file and the sites with more memory
+        allocated when the run ended.
+
+        Returns
+            str: summary of the allocations.
+        """
+        lines = ['Peak of memory allocated: %.2f MB' % (self.peak / 10**6)]
+        for filename, peak in self.files.items():
+            lines.append('%10.2f MB  %s' % (peak / 10**6, filename))
+        if self.snapshot is not None:
+            lines.append('Top allocation sites:')
+            stats = self.snapshot.statistics('lineno')
+            for stat in stats[:self.top]:
+                frame = stat.traceback[0]
+                lines.append(
+                    '%10.2f MB %8d blocks  %s:%d' % (
+                        stat.size / 10**6,
+                        stat.count,
+                        frame.filename,
+                        frame.lineno
+                    )
+                )
+        return '\n'.join(lines)
+
+
+PROFILERS = {
+    CPUProfiler.MODE: CPUProfiler,
+    MemoryProfiler.MODE: MemoryProfiler
+}
+
+
+profiler_ = None
+
+
+def get_profiler() -> Union[CPUProfiler, MemoryProfiler, None]:
+    """
+    Returns the profiler running, `None` if profiling is not enabled.
+    """
+    return profiler_
+
+
+def start_profiling(
+    mode: str,
+    path: str = None,
+    top: int = 20
+) -> Union[CPUProfiler, MemoryProfiler]:
+    """
+    Starts profiling the process.
+
+    Args
+        mode: 'cpu' or 'mem'.
+        path: path of profile file, `None` does not write it.
+        top: number of lines of summary. Default is 20.
+
+    Returns
+        CPUProfiler, MemoryProfiler: profiler running.
+
+    Raises
+        ValueError: if `mode` is not valid or a profiler is running.
+    """
+    global profiler_
+    if mode not in PROFILERS:
+        raise ValueError(
+            '"mode" must be one of: %s.' % ', '.join(PROFILERS)
+        )
+    if profiler_ is not None:
+        raise ValueError('A profiler is already running.')
+    profiler_ = PROFILERS[mode](path=path, top=top)
+    profiler_.start()
+    return profiler_
+
+
+def stop_profiling() -> Union[CPUProfiler, MemoryProfiler, None]:
+    """
+    Stops the profiler running and writes its file.
+
+    Returns
+        CPUProfiler, MemoryProfiler: profiler stopped.
+        None: if profiling is not enabled.
+    """
+    global profiler_
+    profiler = profiler_
+    profiler_ = None
+    if profiler is not None:
+        profiler.stop()
+    return profiler
+
+
+def profile_file(
+    filename: str
+) -> ContextManager[None]:
+    """
+    Measures a file converted if profiling is enabled, see
+    `MemoryProfiler.file`.
+    """
+    if profiler_ is None:
+        return nullcontext()
+    return profiler_.file(filename=filename)
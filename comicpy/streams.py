@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+"""
+Writing of CBZ files into file-like objects.
+
+The in-memory API of `ComicPy` (`process_stream`, `process_bytes`) writes
+the CBZ file into a writable object given by the user, a socket, a
+`SpooledTemporaryFile`, a `BytesIO`, a pipe, etc., without writing it to
+disk.
+
+The CBZ file is written as a stream, each member is written once, with its
+sizes in a data descriptor after the data, and the central directory is
+written at the end, so the output can go to stdout or a pipe.
+"""
+
+import zipfile
+import select
+import errno
+
+from typing import BinaryIO
+
+
+class SinkWriter:
+    """
+    Class in charge of writing into a file-like object and counting the
+    bytes written.
+
+    It does not expose `tell` or `seek`, so `zipfile` writes the sizes of
+    each member after its data (data descriptors) and never goes back,
+    the object given may be unseekable.
+    """
+
+    def __init__(
+        self,
+        sink: BinaryIO
+    ) -> None:
+        """
+        Constructor.
+
+        Args:
+            sink: writable file-like object.
+        """
+        self.sink = sink
+        self.size = 0
+
+    def write(
+        self,
+        data: bytes
+    ) -> int:
+        """
+        Writes data into the file-like object.
+
+        Args
+            data: bytes to write.
+
+        Returns
+            int: number of bytes written.
+
+        Raises
+            BlockingIOError: if the file-like object is non-blocking, would
+                             block and it can not be waited for, its
+                             `characters_written` has the bytes written.
+        """
+        view = memoryview(data)
+        # raw streams and sockets may write only part of the data.
+        while view:
+            written = self.sink.write(view)
+            if written is None:
+                # non-blocking raw stream, it would block.
+                self.wait_writable(written=len(data) - len(view))
+                continue
+            self.size += written
+            view = view[written:]
+        return len(data)
+
+    def wait_writable(
+        self,
+        written: int
+    ) -> None:
+        """
+        Waits until the file-like object is writable.
+
+        Args
+            written: bytes of the current data already written.
+
+        Raises
+            BlockingIOError: if the file-like object has no file descriptor
+                             to wait for.
+        """
+        try:
+            fileno = self.sink.fileno()
+        except (AttributeError, OSError, ValueError):
+            raise BlockingIOError(
+                errno.EAGAIN,
+                'Sink would block and it can not be waited for.',
+                written
+            ) from None
+        select.select([], [fileno], [])
+
+    def flush(self) -> None:
+        """
+        Flushes the file-like object, if it can be flushed.
+        """
+        flush = getattr(self.sink, 'flush', None)
+        if flush is not None:
+            flush()
+
+
+class CBZWriter:
+    """
+    Class in charge of writing a CBZ file as a stream into a file-like
+    object, keeping one `ZipFile` open until it is closed.
+    """
+
+    def __init__(
+        self,
+        sink: BinaryIO
+    ) -> None:
+        """
+        Constructor.
+
+        Args:
+            sink: writable file-like object, it may be unseekable.
+        """
+        self.writer = SinkWriter(sink=sink)
+        self.zip_file = zipfile.ZipFile(
+                            file=self.writer,
+                            mode='w',
+                            compression=zipfile.ZIP_DEFLATED
+                        )
+
+    @property
+    def size(self) -> int:
+        """
+        Number of bytes written.
+        """
+        return self.writer.size
+
+    def add(
+        self,
+        arcname: str,
+        data: bytes
+    ) -> None:
+        """
+        Writes a member into the CBZ file and flushes it, so readers of a
+        pipe receive it without waiting for the end of file.
+
+        Args
+            arcname: name of member.
+            data: data of member.
+        """
+        self.zip_file.writestr(zinfo_or_arcname=arcname, data=data)
+        self.writer.flush()
+
+    def close(self) -> None:
+        """
+        Writes the central directory and flushes the file-like object, the
+        file-like object is not closed.
+        """
+        if self.zip_file is not None:
+            self.zip_file.close()
+            self.zip_file = None
+            self.writer.flush()
+
+    def __enter__(self) -> 'CBZWriter':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
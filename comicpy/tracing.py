@@ -0,0 +1,278 @@
+# -*- coding: utf-8 -*-
+"""
+Tracing of conversions in the Chrome Trace Event format.
+
+With tracing enabled, by `ComicPy(trace='trace.json')` or the environment
+variable `COMICPY_TRACE=trace.json`, the conversions record spans of each
+file, page of PDF files and handler call (`to_pymupdf`, `iterateFiles`,
+`new_image`, `to_zip`, `to_rar`, RAR command, etc.), with the thread and the
+process that ran them. The file written can be loaded in Perfetto or
+`chrome://tracing` to see how the threads, the processes and the writer
+overlap.
+
+The tracer is shared by the process. The worker processes record their
+spans and return them with their results.
+"""
+
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+import threading
+import atexit
+import json
+import time
+import os
+
+from typing import Any, Callable, ContextManager, Dict, Iterator, List, Union
+
+
+TRACE_ENV = 'COMICPY_TRACE'
+
+
+class Tracer:
+    """
+    Class in charge of recording spans and writing them in the Chrome Trace
+    Event format.
+    """
+
+    def __init__(
+        self,
+        path: str = None
+    ) -> None:
+        """
+        Constructor.
+
+        Args:
+            path: path of trace file, `None` only records the spans, used by
+                  the worker processes.
+        """
+        self.path = path
+        self.lock = threading.Lock()
+        self.events: List[dict] = []
+        # names of threads, by process and thread id.
+        self.threads: Dict[tuple, str] = {}
+
+    @contextmanager
+    def span(
+        self,
+        name: str,
+        cat: str = 'comicpy',
+        **args: Any
+    ) -> Iterator[dict]:
+        """
+        Records a span, the arguments can be completed in the dictionary
+        given.
+
+        Args
+            name: name of span.
+            cat: category of span.
+            args: arguments shown with the span.
+
+        Returns
+            dict: arguments of span.
+        """
+        # wall clock, shared by the worker processes.
+        start = time.time_ns()
+        try:
+            yield args
+        finally:
+            self.add(
+                name=name,
+                cat=cat,
+                start=start,
+                end=time.time_ns(),
+                args=args
+            )
+
+    def add(
+        self,
+        name: str,
+        cat: str,
+        start: int,
+        end: int,
+        args: dict = None
+    ) -> None:
+        """
+        Adds a span of the current thread, times in nanoseconds.
+        """
+        thread = threading.current_thread()
+        pid = os.getpid()
+        event = {
+            'name': name,
+            'cat': cat,
+            'ph': 'X',
+            'ts': start / 1000,
+            'dur': (end - start) / 1000,
+            'pid': pid,
+            'tid': thread.ident,
+            'args': {key: str(value) for key, value in (args or {}).items()}
+        }
+        with self.lock:
+            self.events.append(event)
+            self.threads.setdefault((pid, thread.ident), thread.name)
+
+    def take(self) -> List[dict]:
+        """
+        Returns the spans recorded and the names of their threads, removing
+        them, used to send the spans of worker processes.
+        """
+        with self.lock:
+            events = self.events + self.thread_events()
+            self.events = []
+            self.threads = {}
+        return events
+
+    def add_events(
+        self,
+        events: List[dict]
+    ) -> None:
+        """
+        Adds spans recorded by other process.
+        """
+        with self.lock:
+            self.events.extend(events)
+
+    def thread_events(self) -> List[dict]:
+        """
+        Returns the metadata events with the names of threads, it must be
+        called holding the lock.
+        """
+        return [
+            {
+                'name': 'thread_name',
+                'ph': 'M',
+                'pid': pid,
+                'tid': tid,
+                'args': {'name': name}
+            }
+            for (pid, tid), name in self.threads.items()
+        ]
+
+    def save(
+        self,
+        path: str = None
+    ) -> Union[str, None]:
+        """
+        Writes the spans recorded in the Chrome Trace Event format.
+
+        Args
+            path: path of trace file, by default `path` of instance.
+
+        Returns
+            str: path of trace file.
+            None: if there is no path.
+        """
+        path = path if path is not None else self.path
+        if path is None:
+            return None
+        with self.lock:
+            trace = {
+                'traceEvents': self.events + self.thread_events(),
+                'displayTimeUnit': 'ms'
+            }
+        with open(path, 'w') as file:
+            json.dump(trace, file)
+        return path
+
+
+tracer_ = None
+
+
+def get_tracer() -> Union[Tracer, None]:
+    """
+    Returns the tracer of the process, `None` if tracing is not enabled.
+    """
+    return tracer_
+
+
+def start_tracing(
+    path: str = None
+) -> Tracer:
+    """
+    Enables tracing in the process. The trace file is written when the
+    process exits, or by `Tracer.save`.
+
+    Args
+        path: path of trace file, `None` only records the spans.
+
+    Returns
+        Tracer: tracer of the process, the same if it was enabled with the
+                same path.
+    """
+    global tracer_
+    if tracer_ is not None and tracer_.path == path:
+        return tracer_
+    if tracer_ is not None:
+        tracer_.save()
+    tracer_ = Tracer(path=path)
+    if path is not None:
+        atexit.register(tracer_.save)
+    return tracer_
+
+
+def start_worker_tracing() -> Tracer:
+    """
+    Enables tracing in a worker process, the spans are only recorded, they
+    are sent with the results. A tracer inherited from the parent process
+    is discarded, without writing it.
+
+    Returns
+        Tracer: tracer of the worker process.
+    """
+    global tracer_
+    if tracer_ is None or tracer_.path is not None:
+        tracer_ = Tracer(path=None)
+    return tracer_
+
+
+def stop_tracing() -> None:
+    """
+    Writes the trace file and disables tracing.
+    """
+    global tracer_
+    if tracer_ is not None:
+        tracer_.save()
+        atexit.unregister(tracer_.save)
+        tracer_ = None
+
+
+def span(
+    name: str,
+    cat: str = 'comicpy',
+    **args: Any
+) -> ContextManager[dict]:
+    """
+    Records a span if tracing is enabled, see `Tracer.span`.
+    """
+    if tracer_ is None:
+        return nullcontext(args)
+    return tracer_.span(name, cat=cat, **args)
+
+
+def traced(
+    cat: str = 'comicpy',
+    name: str = None,
+    arg: str = 'filename'
+) -> Callable:
+    """
+    Decorator of methods recorded as spans when tracing is enabled.
+
+    Args
+        cat: category of span.
+        name: name of span, by default the name of method.
+        arg: name of keyword argument shown with the span. Default is
+             'filename'.
+    """
+    def decorator(method: Callable) -> Callable:
+        span_name = name if name is not None else method.__name__
+
+        @wraps(method)
+        def wrapper(*args, **kwargs):
+            if tracer_ is None:
+                return method(*args, **kwargs)
+            args_span = {}
+            if arg in kwargs:
+                args_span[arg] = kwargs[arg]
+            with tracer_.span(span_name, cat=cat, **args_span):
+                return method(*args, **kwargs)
+        return wrapper
+    return decorator
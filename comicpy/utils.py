@@ -6,9 +6,10 @@ Utils
 import os
 import sys
 import glob
+from hashlib import sha256
 from pathlib import Path
 
-from typing import Union, Tuple, TypeVar
+from typing import Union, Tuple, TypeVar, Iterator, List
 
 CurrentFile = TypeVar('CurrentFile')
 
@@ -54,6 +55,34 @@ class Paths:
         except Exception:
             return False
 
+    def link(
+        source: str,
+        dest: str
+    ) -> bool:
+        """
+        Links a file to a new path, with a hard link or, if the file system
+        does not support them, a symbolic link. An existing `dest` is
+        replaced.
+
+        Args
+            source: path of file.
+            dest: path of link.
+
+        Returns
+            bool: `True` if the link is created, otherwise, `False`.
+        """
+        Paths.remove(path=dest)
+        try:
+            os.link(source, dest)
+            return True
+        except OSError:
+            pass
+        try:
+            os.symlink(os.path.abspath(source), dest)
+            return True
+        except OSError:
+            return False
+
     def isfile(
         path
     ) -> bool:
@@ -228,6 +257,69 @@ class Paths:
             results.extend(filesMatch)
         return results
 
+    def scan_files(
+        directory: str,
+        extensions: Union[str, list, None]
+    ) -> Iterator[os.DirEntry]:
+        """
+        Recursively scans a directory looking for valid files, in a single
+        pass with `os.scandir`. Extensions are matched ignoring upper and lower
+        case letters. Symbolic links to directories are not followed.
+
+        The `stat` information of each entry yielded is already loaded, so
+        `entry.stat()` does not access the filesystem again.
+
+        Args
+            directory: directory path.
+            extensions: string or list of strings with the extensions that will
+                        be used to filter the files, `None` for all files.
+
+        Returns
+            Iterator[os.DirEntry]: entries of files matched.
+        """
+        if isinstance(extensions, str):
+            extensions = [extensions]
+        if extensions is not None:
+            extensions = {
+                '.%s' % extension.lstrip('.').lower()
+                for extension in extensions
+            }
+
+        pending = [directory]
+        while pending:
+            try:
+                scanner = os.scandir(pending.pop())
+            except OSError:
+                continue
+            with scanner:
+                for entry in scanner:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(entry.path)
+                        elif (
+                            extensions is None or
+                            Paths.splitext(entry.name)[1].lower() in
+                            extensions
+                        ) and entry.is_file():
+                            entry.stat()
+                            yield entry
+                    except OSError:
+                        continue
+
+    def sort_entries(
+        entries: List[os.DirEntry]
+    ) -> List[os.DirEntry]:
+        """
+        Sorts entries alphanumerically by their path.
+
+        Args
+            entries: list of `os.DirEntry` instances.
+
+        Returns
+            list: list of `os.DirEntry` instances sorted.
+        """
+        return sorted(entries, key=lambda entry: Path(entry.path))
+
     def get_files_recursive(
         extensions: Union[str, list],
         directory: str
@@ -243,18 +335,33 @@ class Paths:
         Returns
             list: list of `Path` instances.
         """
-        results = []
-        if isinstance(extensions, str):
-            extensions = [extensions]
-
-        dirPath = Path(directory)
+        return [
+            Path(entry.path)
+            for entry in Paths.scan_files(
+                                directory=directory,
+                                extensions=extensions
+                            )
+        ]
 
-        for ext in extensions:
-            results += list(dirPath.rglob(f'*{ext}'))
+    def get_hash(
+        path: str,
+        chunk_size: int = 2**20
+    ) -> str:
+        """
+        Calculates the SHA-256 hash of a file, reading it by chunks.
 
-        results = list(set(results))
+        Args
+            path: path of file.
+            chunk_size: size of each chunk read, default 1 MiB.
 
-        return results
+        Returns
+            str: hexadecimal hash.
+        """
+        hash_ = sha256()
+        with open(path, 'rb') as file:
+            for chunk in iter(lambda: file.read(chunk_size), b''):
+                hash_.update(chunk)
+        return hash_.hexdigest()
 
     def get_size(
         path: str,
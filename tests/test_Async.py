@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""
+Tests async methods of ComicPy
+"""
+
+from test_Base import BaseTestCase
+
+from comicpy.exceptionsClasses import ConversionCancelled
+from comicpy.utils import Paths
+
+import threading
+import asyncio
+import zipfile
+import shutil
+import os
+
+
+class AsyncTestCase(BaseTestCase):
+
+    def test_aprocess_pdf(self):
+        names = sorted(os.listdir(self.pdfs_dir))
+        running = {'now': 0, 'max': 0, 'calls': 0}
+        lock = threading.Lock()
+
+        comic = self.comicpy(concurrency=2)
+        process_pdf = comic.process_pdf
+
+        def count_process_pdf(**kwargs):
+            with lock:
+                running['now'] += 1
+                running['calls'] += 1
+                running['max'] = max(running['max'], running['now'])
+            try:
+                return process_pdf(**kwargs)
+            finally:
+                with lock:
+                    running['now'] -= 1
+
+        async def convert():
+            ticks = 0
+            done = asyncio.Event()
+
+            async def ticker():
+                nonlocal ticks
+                while not done.is_set():
+                    ticks += 1
+                    await asyncio.sleep(0.001)
+
+            task_ticker = asyncio.create_task(ticker())
+            results = await asyncio.gather(*[
+                comic.aprocess_pdf(
+                    filename=Paths.build(self.pdfs_dir, name),
+                    dest=Paths.build(self.temp_dir, 'async'),
+                )
+                for name in names
+            ])
+            done.set()
+            await task_ticker
+            return results, ticks
+
+        comic.process_pdf = count_process_pdf
+        try:
+            results, ticks = asyncio.run(convert())
+        finally:
+            comic.close()
+
+        self.assertEqual(running['calls'], len(names))
+        self.assertLessEqual(running['max'], 2)
+        self.assertEqual(len(results), len(names))
+        for metadata in results:
+            with zipfile.ZipFile(metadata[0]['name']) as file:
+                self.assertIsNone(file.testzip())
+        # the event loop was not blocked by the conversions.
+        self.assertGreater(ticks, len(names))
+
+    def test_aprocess_dir_cancel(self):
+        comic = self.comicpy(concurrency=1)
+        dest = Paths.build(self.temp_dir, 'async_cancel')
+        started = threading.Event()
+        process_file = comic.process_file
+
+        def slow_process_file(**kwargs):
+            started.set()
+            return process_file(**kwargs)
+
+        comic.process_file = slow_process_file
+
+        async def convert():
+            task = asyncio.create_task(
+                        comic.aprocess_dir(
+                            directory_path=self.pdfs_dir,
+                            extension_filter='pdf',
+                            dest=dest
+                        )
+                    )
+            while not started.is_set():
+                await asyncio.sleep(0.001)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            # the slot is free for the next conversions.
+            return await comic.aprocess_pdf(
+                        filename=Paths.build(self.pdfs_dir, 'image_1.pdf'),
+                        dest=dest
+                    )
+
+        try:
+            metadata = asyncio.run(convert())
+        finally:
+            comic.close()
+        self.assertEqual(len(metadata), 1)
+
+        converted = [
+            name
+            for root, dirs, files in os.walk(dest)
+            for name in files
+            if name.endswith('.cbz')
+        ]
+        # without the cancellation, the 4 files of directory and the PDF file
+        # converted after it are written.
+        self.assertLess(len(converted), 5)
+
+    def test_run_cancellable(self):
+        cancel_event = threading.Event()
+        cancel_event.set()
+        with self.assertRaises(ConversionCancelled):
+            self.comicpy_init.run_cancellable(
+                self.comicpy_init.process_pdf,
+                cancel_event,
+                filename=Paths.build(self.pdfs_dir, 'image_1.pdf'),
+                dest=self.temp_dir
+            )
+        # the cancellation is not kept by the next conversion.
+        metadata = self.comicpy_init.process_pdf(
+                        filename=Paths.build(self.pdfs_dir, 'image_1.pdf'),
+                        dest=self.temp_dir
+                    )
+        self.assertEqual(len(metadata), 1)
+
+    @classmethod
+    def tearDownClass(cls):
+        path = os.path.join(
+                    BaseTestCase.TESTS_DIR,
+                    BaseTestCase.TEMP_DIR
+                )
+        shutil.rmtree(path, ignore_errors=True)
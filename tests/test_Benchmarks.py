@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+Tests benchmarks
+"""
+
+from test_Base import BaseTestCase
+
+from benchmarks.corpus import PASSWORD, build_corpus
+from benchmarks.memory import check, measure_case
+from benchmarks.run import compare, run_case
+from comicpy.utils import Paths
+
+import pyzipper
+import shutil
+import os
+
+try:
+    import pymupdf as fitz
+except ImportError:
+    import fitz
+
+
+class BenchmarksTestCase(BaseTestCase):
+
+    def test_corpus(self):
+        corpus = build_corpus(
+                    directory=Paths.build(self.temp_dir, 'corpus'),
+                    files=2,
+                    pages=3,
+                    size=(120, 170),
+                    exec_path_rar=self.custom_path_rar_exec
+                )
+        pdfs = sorted(os.listdir(corpus['pdf']))
+        self.assertEqual(len(pdfs), 2)
+        for name in pdfs:
+            with fitz.open(Paths.build(corpus['pdf'], name)) as document:
+                self.assertEqual(document.page_count, 3)
+                self.assertEqual(len(document[0].get_images()), 1)
+
+        name = Paths.build(corpus['zip_aes'], 'comic_001.zip')
+        with pyzipper.AESZipFile(name) as file:
+            with self.assertRaises(RuntimeError):
+                file.read(file.namelist()[0])
+            file.setpassword(PASSWORD.encode())
+            self.assertEqual(len(file.namelist()), 3)
+        self.assertEqual(len(os.listdir(corpus['images'])), 2)
+
+        result = run_case(
+                    case='zip_aes',
+                    corpus=corpus,
+                    pages=6,
+                    options={'workers': 1, 'jobs': 1}
+                )
+        self.assertEqual(result['files'], 2)
+        self.assertGreater(result['pages_per_sec'], 0)
+
+        baseline = dict(result, pages_per_sec=result['pages_per_sec'] * 2)
+        self.assertEqual(
+            compare(
+                results={'zip_aes': result},
+                baseline={'zip_aes': baseline},
+                tolerance=10
+            ),
+            ['zip_aes']
+        )
+
+    def test_memory_growth(self):
+        corpus = build_corpus(
+                    directory=Paths.build(self.temp_dir, 'corpus_memory'),
+                    files=2,
+                    pages=2,
+                    size=(120, 170)
+                )
+        measures = measure_case(case='zip', corpus=corpus, pages=4)
+        self.assertGreater(measures['tracemalloc_peak'], 0)
+        self.assertGreaterEqual(measures['peak_rss'], measures['rss_growth'])
+
+        flat = {'pages': 1000, 'tracemalloc_peak': 100, 'rss_growth': None}
+        linear = dict(flat, pages=10000, tracemalloc_peak=1000)
+        report = check(results={
+                    'flat': [flat, dict(flat, pages=10000)],
+                    'linear': [linear, flat]
+                })
+        self.assertEqual(report['flat']['tracemalloc'], 0.0)
+        self.assertTrue(report['flat']['sublinear'])
+        self.assertAlmostEqual(report['linear']['tracemalloc'], 1.0)
+        self.assertIsNone(report['linear']['rss'])
+        self.assertFalse(report['linear']['sublinear'])
+
+    @classmethod
+    def tearDownClass(cls):
+        path = os.path.join(
+                    BaseTestCase.TESTS_DIR,
+                    BaseTestCase.TEMP_DIR
+                )
+        shutil.rmtree(path, ignore_errors=True)
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""
+Tests levels of integrity checks of outputs
+"""
+
+from test_Base import BaseTestCase
+
+from comicpy.utils import Paths
+
+from PIL import Image
+
+import zipfile
+import shutil
+import io
+import os
+
+
+class CheckIntegrityTestCase(BaseTestCase):
+
+    def jpeg(self) -> bytes:
+        imageIO = io.BytesIO()
+        Image.new('RGB', (64, 64), (200, 30, 30)).save(imageIO, 'JPEG')
+        return imageIO.getvalue()
+
+    def write_cbz(
+        self,
+        name: str,
+        pages: dict
+    ) -> str:
+        path = Paths.build(self.temp_dir, name)
+        with zipfile.ZipFile(path, 'w', zipfile.ZIP_STORED) as fileZip:
+            for page_name, data in pages.items():
+                fileZip.writestr(page_name, data)
+        return path
+
+    def test_check_integrity_levels(self):
+        results = self.comicpy_init.process_pdf(
+                        filename=self.files['image_1.pdf'],
+                        dest=self.temp_dir
+                    )
+        for level in ('header', 'structure', 'decode'):
+            self.assertIs(
+                self.comicpy_init.check_integrity(
+                    filename=results[0]['name'],
+                    show=False,
+                    level=level
+                ),
+                True
+            )
+
+    def test_check_integrity_rar(self):
+        results = self.comicpy_init.process_pdf(
+                        filename=self.files['image_1.pdf'],
+                        compressor='rar',
+                        dest=self.temp_dir
+                    )
+        for level in ('header', 'structure', 'decode'):
+            self.assertIs(
+                self.comicpy_init.check_integrity(
+                    filename=results[0]['name'],
+                    show=False,
+                    level=level
+                ),
+                True
+            )
+
+    def test_check_integrity_bad_crc(self):
+        data = self.jpeg()
+        path = self.write_cbz(name='bad_crc.cbz', pages={'page_1.jpg': data})
+        with open(path, 'rb') as file:
+            raw = bytearray(file.read())
+        # changes a byte of the page, after the local header.
+        offset = raw.index(data) + len(data) // 2
+        raw[offset] ^= 0xFF
+        with open(path, 'wb') as file:
+            file.write(raw)
+
+        check = self.comicpy_init.check_integrity
+        self.assertIs(check(filename=path, show=False), True)
+        self.assertIs(check(filename=path, show=False, level='structure'),
+                      False)
+        self.assertIs(check(filename=path, show=False, level='decode'),
+                      False)
+
+    def test_check_integrity_truncated_image(self):
+        data = self.jpeg()
+        path = self.write_cbz(
+                    name='truncated.cbz',
+                    pages={
+                        'page_1.jpg': data,
+                        'page_2.jpg': data[:len(data) // 2]
+                    }
+                )
+        check = self.comicpy_init.check_integrity
+        self.assertIs(check(filename=path, show=False, level='structure'),
+                      True)
+        self.assertIs(check(filename=path, show=False, level='decode'),
+                      False)
+
+    def test_check_integrity_empty_missing(self):
+        path = Paths.build(self.temp_dir, 'empty.cbz')
+        open(path, 'wb').close()
+        check = self.comicpy_init.check_integrity
+        self.assertIs(check(filename=path, show=False), False)
+        self.assertIs(
+            check(
+                filename=Paths.build(self.temp_dir, 'missing.cbz'),
+                show=False,
+                level='structure'
+            ),
+            False
+        )
+
+    def test_check_integrity_invalid_level(self):
+        with self.assertRaises(ValueError):
+            self.comicpy_init.check_integrity(
+                filename=self.files['image_dir_2.cbz'],
+                level='full'
+            )
+
+    def test_check_integrity_batch(self):
+        data = self.jpeg()
+        good = self.write_cbz(name='good.cbz', pages={'page_1.jpg': data})
+        bad = self.write_cbz(
+                    name='bad.cbz',
+                    pages={'page_1.jpg': data[:len(data) // 2]}
+                )
+        filenames = [good, bad, self.files['image_dir_2.cbz']]
+        results = self.comicpy_init.check_integrity_batch(
+                        filenames=filenames,
+                        show=False,
+                        level='decode',
+                        workers=2
+                    )
+        self.assertEqual(list(results), filenames)
+        self.assertEqual(list(results.values()), [True, False, True])
+        self.assertEqual(
+            self.comicpy_init.check_integrity_batch(filenames=[]),
+            {}
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        path = os.path.join(
+                    BaseTestCase.TESTS_DIR,
+                    BaseTestCase.TEMP_DIR
+                )
+        shutil.rmtree(path, ignore_errors=True)
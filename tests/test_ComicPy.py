@@ -25,9 +25,15 @@ from comicpy.models import (
     CurrentFile,
     CompressorFileData
 )
+from comicpy.utils import Paths
 
 import os
+import io
 import shutil
+import zipfile
+import tempfile
+
+from PIL import Image
 
 
 class ComicPyTestCase(BaseTestCase):
@@ -583,6 +589,277 @@ class ComicPyTestCase(BaseTestCase):
             )
         self.assertNotEqual(results, None)
 
+    def test_comicpy_dir_images_iter(self):
+        handler = self.comicpy_init.directoryhandler
+        items = []
+        for item, is_last in handler.iter_dir(
+                                directoryPath=self.images_dir,
+                                compressor='zip',
+                                join=True
+                            ):
+            # only the images of the current directory are kept.
+            self.assertEqual(len(item.list_data), 1)
+            items.append((item.list_data[0].filename, is_last))
+        handler.reset_counter()
+        self.assertEqual(
+            items,
+            [('Image0001.jpg', False), ('Image0002.jpg', True)]
+        )
+
+        dest = Paths.build(self.temp_dir, 'images_join', make=True)
+        results = self.comicpy_init.process_dir(
+                    directory_path=self.images_dir,
+                    extension_filter='images',
+                    compressor='zip',
+                    join=True,
+                    dest=dest
+            )
+        self.assertEqual(len(results), 1)
+        with zipfile.ZipFile(results[0]['name']) as file:
+            self.assertEqual(
+                file.namelist(),
+                ['Image0001.jpg', 'Image0002.jpg']
+            )
+
+    def test_comicpy_process_pdf_workers(self):
+        filename = 'comic 1.pdf'
+        currentFile = self.build_CurrentFile(
+                                filename=filename,
+                                raw_data=self.data[filename]
+                            )
+        serialData = self.comicpy_init.pdfphandler.process_pdf(
+                                currentFilePDF=currentFile,
+                                compressor='zip',
+                                resizeImage='preserve'
+                            )
+        with self.comicpy(workers=4, backend='thread') as comic:
+            parallelData = comic.pdfphandler.process_pdf(
+                                currentFilePDF=currentFile,
+                                compressor='zip',
+                                resizeImage='preserve'
+                            )
+        self.assertEqual(
+            [item.bytes_data.getvalue() for item in parallelData.list_data],
+            [item.bytes_data.getvalue() for item in serialData.list_data]
+        )
+
+    def test_paths_scan_files(self):
+        base = Paths.build(self.temp_dir, 'scan', 'sub', make=True)
+        names = ['a.PDF', 'b.pdf', 'c.Pdf', 'd.zip', 'pdf']
+        for name in names:
+            with open(Paths.build(base, name), 'wb') as file:
+                file.write(b'%PDF')
+        entries = list(Paths.scan_files(
+                            directory=Paths.build(self.temp_dir, 'scan'),
+                            extensions='pdf'
+                        ))
+        self.assertEqual(
+            sorted(entry.name for entry in entries),
+            ['a.PDF', 'b.pdf', 'c.Pdf']
+        )
+        self.assertTrue(all(entry.stat().st_size == 4 for entry in entries))
+
+    def test_comicpy_process_dir_incremental(self):
+        source = Paths.build(self.temp_dir, 'incremental', 'pdfs', make=True)
+        for name in ['image_1.pdf', 'image_2.pdf']:
+            shutil.copy(Paths.build(self.pdfs_dir, name), source)
+        dest = Paths.build(self.temp_dir, 'incremental')
+
+        def convert():
+            return self.comicpy_init.process_dir(
+                        directory_path=source,
+                        extension_filter='pdf',
+                        compressor='zip',
+                        dest=dest,
+                        incremental=True
+                    )
+
+        first = convert()
+        self.assertEqual(len(first), 2)
+        mtimes = [os.stat(item['name']).st_mtime_ns for item in first]
+
+        # unchanged files are skipped, outputs are not rewritten.
+        second = convert()
+        self.assertEqual(second, first)
+        self.assertEqual(
+            [os.stat(item['name']).st_mtime_ns for item in second],
+            mtimes
+        )
+
+        # touched but same content, skipped after comparing the hash.
+        changed = Paths.build(source, 'image_2.pdf')
+        os.utime(changed, ns=(0, 0))
+        third = convert()
+        self.assertEqual(
+            [os.stat(item['name']).st_mtime_ns for item in third],
+            mtimes
+        )
+
+        # modified content, only this file is converted again.
+        shutil.copy(Paths.build(self.pdfs_dir, 'image_1.pdf'), changed)
+        fourth = convert()
+        self.assertEqual(len(fourth), 2)
+        self.assertEqual(os.stat(fourth[0]['name']).st_mtime_ns, mtimes[0])
+        self.assertNotEqual(os.stat(fourth[1]['name']).st_mtime_ns, mtimes[1])
+        self.assertTrue(
+            self.comicpy_init.check_integrity(
+                filename=fourth[1]['name'],
+                show=False
+            )
+        )
+
+    def write_pages_zip(self, path: str, color: int, pages: int = 3) -> None:
+        with zipfile.ZipFile(path, 'w') as file:
+            for page in range(pages):
+                imageIO = io.BytesIO()
+                Image.new('RGB', (32, 48), (color, page * 40, 0)).save(
+                                                        imageIO,
+                                                        format='PNG'
+                                                    )
+                file.writestr('page_%d.png' % page, imageIO.getvalue())
+
+    def test_comicpy_process_dir_incremental_join(self):
+        source = Paths.build(self.temp_dir, 'incremental_join', 'zips',
+                             make=True)
+        for index, name in enumerate(['a.zip', 'b.zip', 'c.zip']):
+            self.write_pages_zip(Paths.build(source, name), color=index * 50)
+        dest = Paths.build(self.temp_dir, 'incremental_join')
+
+        def convert():
+            return self.comicpy_init.process_dir(
+                        directory_path=source,
+                        extension_filter='zip',
+                        compressor='zip',
+                        dest=dest,
+                        join=True,
+                        incremental=True
+                    )
+
+        def count_pages(metadata):
+            with zipfile.ZipFile(metadata[0]['name']) as file:
+                return len(file.namelist())
+
+        self.assertEqual(count_pages(convert()), 9)
+        # the joined archive is rebuilt with the pages of all inputs.
+        self.write_pages_zip(Paths.build(source, 'a.zip'), color=255)
+        self.assertEqual(count_pages(convert()), 9)
+
+    def test_comicpy_process_dir_invalid_files(self):
+        # invalid files are reported and skipped, with and without jobs.
+        source = Paths.build(self.temp_dir, 'invalid_files', make=True)
+        for name in ['empty.zip', 'image_dir_1.zip', 'no_image.zip']:
+            shutil.copy(self.files[name], source)
+        for join in (False, True):
+            names = []
+            for jobs in (1, 2):
+                dest = Paths.build(
+                            self.temp_dir,
+                            'invalid_%d_%d' % (jobs, join),
+                            make=True
+                        )
+                metadata = self.comicpy_init.process_dir(
+                                directory_path=source,
+                                extension_filter='zip',
+                                dest=dest,
+                                join=join,
+                                jobs=jobs
+                            )
+                names.append(
+                    [Paths.get_basename(item['name']) for item in metadata]
+                )
+                with zipfile.ZipFile(metadata[0]['name']) as file:
+                    self.assertGreater(len(file.namelist()), 0)
+            self.assertEqual(names, [['image_dir_1.cbz']] * 2)
+
+    def test_comicpy_process_dir_jobs(self):
+        for join in (False, True):
+            results = []
+            for jobs in (1, 2):
+                dest = Paths.build(
+                            self.temp_dir,
+                            'jobs_%d_%d' % (jobs, join),
+                            make=True
+                        )
+                metadata = self.comicpy_init.process_dir(
+                                directory_path=self.pdfs_dir,
+                                extension_filter='pdf',
+                                compressor='zip',
+                                join=join,
+                                dest=dest,
+                                jobs=jobs
+                            )
+                names = []
+                for item in metadata:
+                    with zipfile.ZipFile(item['name']) as file:
+                        names.append(file.namelist())
+                results.append((
+                    [Paths.get_basename(item['name']) for item in metadata],
+                    names
+                ))
+            self.assertEqual(results[0], results[1])
+
+        with self.assertRaises(ValueError):
+            self.comicpy_init.process_dir(
+                directory_path=self.pdfs_dir,
+                extension_filter='pdf',
+                jobs=0
+            )
+
+    def test_comicpy_process_stream(self):
+        filename = BaseTestCase.FILES['image_1.pdf']
+        metadata = self.comicpy_init.process_pdf(
+                        filename=filename,
+                        dest=Paths.build(self.temp_dir, 'stream')
+                    )
+        with zipfile.ZipFile(metadata[0]['name']) as file:
+            expected = [(name, file.read(name)) for name in file.namelist()]
+
+        class Unseekable:
+            def __init__(self):
+                self.chunks = []
+
+            def write(self, data):
+                self.chunks.append(bytes(data))
+                return len(data)
+
+        with open(filename, 'rb') as source, \
+                tempfile.SpooledTemporaryFile() as spooled:
+            for sink in (spooled, Unseekable()):
+                source.seek(0)
+                meta = self.comicpy_init.process_stream(
+                            source=source,
+                            sink=sink,
+                            filename='image_1.pdf'
+                        )
+                self.assertEqual(meta['name'], 'image_1.cbz')
+                if isinstance(sink, Unseekable):
+                    data = b''.join(sink.chunks)
+                else:
+                    sink.seek(0)
+                    data = sink.read()
+                self.assertEqual(meta['bytes'], len(data))
+                with zipfile.ZipFile(io.BytesIO(data)) as file:
+                    self.assertIsNone(file.testzip())
+                    result = [
+                        (name, file.read(name)) for name in file.namelist()
+                    ]
+                self.assertEqual(result, expected)
+
+    def test_comicpy_process_bytes(self):
+        with open(BaseTestCase.FILES['image_dir_2.rar'], 'rb') as file:
+            data = self.comicpy_init.process_bytes(
+                            source=file.read(),
+                            filename='image_dir_2.rar'
+                        )
+        with zipfile.ZipFile(io.BytesIO(data)) as file:
+            self.assertEqual(len(file.namelist()), 2)
+
+        with self.assertRaises(EmptyFile):
+            self.comicpy_init.process_bytes(
+                source=b'',
+                filename='image_1.pdf'
+            )
+
     @classmethod
     def tearDownClass(cls):
         path = os.path.join(
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""
+Tests conversion contexts
+"""
+
+from test_Base import BaseTestCase
+
+from comicpy.context import ConversionContexts
+from comicpy.utils import Paths
+
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import zipfile
+import rarfile
+import shutil
+import os
+
+
+class ContextTestCase(BaseTestCase):
+
+    def read_outputs(self, metadata: list) -> list:
+        results = []
+        for item in metadata:
+            if item['name'].endswith('.cbr'):
+                archive = rarfile.RarFile(item['name'])
+            else:
+                archive = zipfile.ZipFile(item['name'])
+            with archive:
+                content = sorted(
+                        (name, archive.read(name))
+                        for name in archive.namelist()
+                        if not name.endswith('/')
+                    )
+            results.append((Paths.get_basename(item['name']), content))
+        return results
+
+    def test_contexts_by_thread(self):
+        contexts = ConversionContexts()
+        with contexts.enter() as context:
+            context.BASE_DIR_ = 'main'
+            with contexts.enter() as nested:
+                self.assertIs(nested, context)
+
+            others = []
+            thread = threading.Thread(
+                        target=lambda: others.append(contexts.context)
+                    )
+            thread.start()
+            thread.join()
+            self.assertIsNot(others[0], context)
+            self.assertIsNone(others[0].BASE_DIR_)
+
+            tempdir = context.tempdir
+            self.assertTrue(Paths.isdir(tempdir))
+
+        # the outermost conversion ends with a new context.
+        self.assertIsNot(contexts.context, context)
+        self.assertFalse(os.path.exists(tempdir))
+
+    def test_comicpy_concurrent_conversions(self):
+        comic = self.comicpy_init
+        tasks = []
+        for name in sorted(os.listdir(self.pdfs_dir)):
+            for compressor in ('zip', 'rar'):
+                tasks.append(
+                    ('pdf', Paths.build(self.pdfs_dir, name), compressor)
+                )
+        for directory, filter in (
+            (self.zips_dir, 'zip'),
+            (self.rars_dir, 'rar'),
+            (self.images_dir, 'images')
+        ):
+            for join in (False, True):
+                tasks.append(('dir', directory, (filter, join)))
+
+        def convert(index: int, root: str) -> tuple:
+            kind, path, options = tasks[index]
+            dest = Paths.build(root, str(index), make=True)
+            if kind == 'pdf':
+                metadata = comic.process_pdf(
+                                filename=path,
+                                compressor=options,
+                                dest=dest
+                            )
+            else:
+                metadata = comic.process_dir(
+                                directory_path=path,
+                                extension_filter=options[0],
+                                join=options[1],
+                                compressor='rar',
+                                dest=dest
+                            )
+            return self.read_outputs(metadata=metadata)
+
+        root = Paths.build(self.temp_dir, 'concurrent')
+        serial = [
+            convert(index, Paths.build(root, 'serial'))
+            for index in range(len(tasks))
+        ]
+        self.assertTrue(all(serial))
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            for attempt in range(2):
+                path = Paths.build(root, 'threads_%d' % attempt)
+                results = list(executor.map(
+                                lambda index: convert(index, path),
+                                range(len(tasks))
+                            ))
+                self.assertEqual(results, serial)
+
+    @classmethod
+    def tearDownClass(cls):
+        path = os.path.join(
+                    BaseTestCase.TESTS_DIR,
+                    BaseTestCase.TEMP_DIR
+                )
+        shutil.rmtree(path, ignore_errors=True)
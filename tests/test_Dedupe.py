@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+"""
+Tests detection of duplicate inputs
+"""
+
+from test_Base import BaseTestCase
+
+from comicpy.dedupe import DuplicateIndex
+from comicpy.utils import Paths
+
+from contextlib import redirect_stdout
+import shutil
+import time
+import io
+import os
+
+
+class DedupeTestCase(BaseTestCase):
+
+    def write(self, path: str, data: bytes) -> str:
+        with open(path, 'wb') as file:
+            file.write(data)
+        return path
+
+    def entries(self, directory: str) -> list:
+        return Paths.sort_entries(
+                    entries=list(Paths.scan_files(
+                                    directory=directory,
+                                    extensions=None
+                                ))
+                )
+
+    def test_group(self):
+        directory = Paths.build(self.temp_dir, 'group', make=True)
+        size = 4 * DuplicateIndex.PARTIAL_SIZE
+        data = bytes(range(256)) * (size // 256)
+        changed = bytearray(data)
+        # same size, first and last bytes, different middle.
+        changed[size // 2] ^= 0xFF
+        a = self.write(Paths.build(directory, 'a.cbz'), data)
+        b = self.write(Paths.build(directory, 'b.cbz'), data)
+        c = self.write(Paths.build(directory, 'c.cbz'), bytes(changed))
+        d = self.write(Paths.build(directory, 'd.cbz'), data[:-1])
+        index_path = Paths.build(self.temp_dir, 'group_index.json')
+
+        index = DuplicateIndex(path=index_path)
+        groups = index.group(entries=self.entries(directory))
+        self.assertEqual(
+            [[entry.path for entry in group] for group in groups],
+            [[a, b], [c], [d]]
+        )
+        # "d" has a unique size, it is not read.
+        self.assertEqual(index.stats, {'partial': 3, 'full': 3, 'reused': 0})
+        index.save()
+
+        index = DuplicateIndex(path=index_path)
+        duplicates = index.find_duplicates(entries=self.entries(directory))
+        self.assertEqual(
+            {key: [entry.path for entry in value]
+             for key, value in duplicates.items()},
+            {a: [b]}
+        )
+        self.assertEqual(index.stats['partial'], 0)
+        self.assertEqual(index.stats['full'], 0)
+
+        # a changed file is hashed again.
+        time.sleep(0.01)
+        self.write(b, bytes(changed))
+        index = DuplicateIndex(path=index_path)
+        duplicates = index.find_duplicates(entries=self.entries(directory))
+        self.assertEqual(
+            {key: [entry.path for entry in value]
+             for key, value in duplicates.items()},
+            {b: [c]}
+        )
+        self.assertEqual(index.stats['full'], 1)
+
+    def test_save_drops_removed(self):
+        directory = Paths.build(self.temp_dir, 'removed', make=True)
+        a = self.write(Paths.build(directory, 'a.cbz'), b'data')
+        self.write(Paths.build(directory, 'b.cbz'), b'data')
+        index_path = Paths.build(self.temp_dir, 'removed_index.json')
+        index = DuplicateIndex(path=index_path)
+        index.find_duplicates(entries=self.entries(directory))
+        os.remove(a)
+        index.save()
+        self.assertEqual(
+            list(DuplicateIndex(path=index_path).records),
+            [Paths.get_abs_path(Paths.build(directory, 'b.cbz'))]
+        )
+
+    def make_library(self, name: str) -> str:
+        directory = Paths.build(self.temp_dir, name, make=True)
+        shutil.copy(self.files['image_1.pdf'], Paths.build(directory, 'a.pdf'))
+        shutil.copy(self.files['image_1.pdf'], Paths.build(directory, 'b.pdf'))
+        shutil.copy(self.files['image_2.pdf'], Paths.build(directory, 'c.pdf'))
+        return directory
+
+    def test_process_dir_dedupe_link(self):
+        directory = self.make_library(name='library_link')
+        dest = Paths.build(self.temp_dir, 'dest_link', make=True)
+        results = self.comicpy_init.process_dir(
+                        directory_path=directory,
+                        extension_filter='pdf',
+                        dest=dest,
+                        dedupe='link',
+                        dedupe_index=Paths.build(self.temp_dir, 'link.json')
+                    )
+        names = [Paths.get_basename(item['name']) for item in results]
+        self.assertEqual(names, ['a.cbz', 'b.cbz', 'c.cbz'])
+        self.assertTrue(os.path.samefile(results[0]['name'],
+                                         results[1]['name']))
+        self.assertFalse(os.path.samefile(results[0]['name'],
+                                          results[2]['name']))
+
+    def test_process_dir_dedupe_report(self):
+        directory = self.make_library(name='library_report')
+        dest = Paths.build(self.temp_dir, 'dest_report', make=True)
+        results = self.comicpy_init.process_dir(
+                        directory_path=directory,
+                        extension_filter='pdf',
+                        dest=dest,
+                        dedupe='report',
+                        dedupe_index=Paths.build(self.temp_dir, 'report.json')
+                    )
+        names = [Paths.get_basename(item['name']) for item in results]
+        self.assertEqual(names, ['a.cbz', 'c.cbz'])
+        self.assertFalse(Paths.exists(Paths.build(
+                            Paths.get_dirname(results[0]['name']),
+                            'b.cbz'
+                        )))
+
+    def test_process_dir_dedupe_other_extensions(self):
+        # copies with other extensions are compared, only inputs of the
+        # filter are converted.
+        directory = Paths.build(self.temp_dir, 'library_other', make=True)
+        shutil.copy(self.files['image_dir_2.zip'],
+                    Paths.build(directory, 'a.cbz'))
+        shutil.copy(self.files['image_dir_2.zip'],
+                    Paths.build(directory, 'b.zip'))
+        shutil.copy(self.files['image_dir_1.zip'],
+                    Paths.build(directory, 'c.zip'))
+        output = io.StringIO()
+        with redirect_stdout(output):
+            results = self.comicpy_init.process_dir(
+                        directory_path=directory,
+                        extension_filter='zip',
+                        dest=Paths.build(self.temp_dir, 'dest_other',
+                                         make=True),
+                        dedupe='link',
+                        dedupe_index=Paths.build(self.temp_dir, 'other.json')
+                    )
+        names = [Paths.get_basename(item['name']) for item in results]
+        self.assertEqual(names, ['b.cbz', 'c.cbz'])
+        self.assertIn(
+            '"%s" is a duplicate of "%s".' % (
+                Paths.get_abs_path(Paths.build(directory, 'a.cbz')),
+                Paths.get_abs_path(Paths.build(directory, 'b.zip'))
+            ),
+            output.getvalue()
+        )
+
+    def test_process_dir_dedupe_invalid(self):
+        with self.assertRaises(ValueError):
+            self.comicpy_init.process_dir(
+                directory_path=self.pdfs_dir,
+                extension_filter='pdf',
+                dest=self.temp_dir,
+                dedupe='remove'
+            )
+
+    @classmethod
+    def tearDownClass(cls):
+        path = os.path.join(
+                    BaseTestCase.TESTS_DIR,
+                    BaseTestCase.TEMP_DIR
+                )
+        shutil.rmtree(path, ignore_errors=True)
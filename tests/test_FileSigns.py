@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+"""
+Tests detection of types of files by content
+"""
+
+from test_Base import BaseTestCase
+
+from comicpy.checkfile import CheckFile
+from comicpy.utils import Paths
+
+from PIL import Image
+
+import zipfile
+import shutil
+import io
+import os
+
+
+class FileSignsTestCase(BaseTestCase):
+
+    def image(self, format: str) -> bytes:
+        imageIO = io.BytesIO()
+        Image.new('RGB', (8, 8), (10, 20, 30)).save(imageIO, format)
+        return imageIO.getvalue()
+
+    def copy(self, name: str, directory: str, new_name: str) -> str:
+        path = Paths.build(directory, new_name)
+        shutil.copy(self.files[name], path)
+        return path
+
+    def test_detect(self):
+        checker = CheckFile()
+        headers = {
+            'pdf': self.data['image_1.pdf'],
+            'zip': self.data['image_dir_1.zip'],
+            'rar': self.data['image_dir_1.rar'],
+            'jpeg': self.image('JPEG'),
+            'png': self.image('PNG'),
+            'webp': self.image('WEBP')
+        }
+        for file_type, data in headers.items():
+            self.assertEqual(
+                checker.detect(chunk_bytes=data[:CheckFile.HEADER_SIZE]),
+                file_type
+            )
+        self.assertEqual(
+            checker.detect(chunk_bytes=b'Rar!\x1a\x07\x00'),
+            'rar'
+        )
+        self.assertEqual(
+            checker.detect(chunk_bytes=b'Rar!\x1a\x07\x01\x00'),
+            'rar'
+        )
+        self.assertEqual(checker.detect(chunk_bytes=b'PK\x05\x06'), 'zip')
+        self.assertIsNone(checker.detect(chunk_bytes=b''))
+        self.assertIsNone(
+            checker.detect(chunk_bytes=b'RIFF\x00\x00\x00\x00WAVE')
+        )
+        # one different byte is not a signature.
+        self.assertIsNone(checker.detect(chunk_bytes=b'PK\x03\x05'))
+
+    def test_match_extension(self):
+        checker = CheckFile()
+        data = self.data['image_dir_1.zip']
+        self.assertIs(checker.match(extension='.cbz', chunk_bytes=data), True)
+        self.assertIs(checker.match(extension='.rar', chunk_bytes=data), False)
+        self.assertIsNone(checker.match(extension='.txt', chunk_bytes=data))
+
+    def test_classify_dir(self):
+        directory = Paths.build(self.temp_dir, 'classify', make=True)
+        subdirectory = Paths.build(directory, 'sub', make=True)
+        pdf = self.copy('image_1.pdf', directory, 'comic.cbz')
+        rar = self.copy('image_dir_1.rar', subdirectory, 'comic')
+        zip_ = self.copy('image_dir_1.zip', subdirectory, 'comic.zip')
+        png = Paths.build(directory, 'page.jpg')
+        with open(png, 'wb') as file:
+            file.write(self.image('PNG'))
+        with open(Paths.build(directory, 'notes.txt'), 'w') as file:
+            file.write('notes')
+
+        types = self.comicpy_init.classify_dir(directory_path=directory)
+        self.assertEqual(types, {
+            'pdf': [pdf],
+            'rar': [rar],
+            'zip': [zip_],
+            'png': [png]
+        })
+
+    def test_process_dir_misnamed(self):
+        directory = Paths.build(self.temp_dir, 'misnamed', make=True)
+        self.copy('image_dir_1.rar', directory, 'a_rar.cbz')
+        self.copy('image_dir_1.zip', directory, 'b_zip.cbz')
+        self.copy('image_1.pdf', directory, 'c_pdf.cbz')
+        dest = Paths.build(self.temp_dir, 'misnamed_dest', make=True)
+
+        results = self.comicpy_init.process_dir(
+                        directory_path=directory,
+                        extension_filter='cbz',
+                        dest=dest
+                    )
+        self.assertEqual(
+            [Paths.get_basename(item['name']) for item in results],
+            ['a_rar.cbr', 'b_zip.cbz', 'c_pdf.cbz']
+        )
+        for item in results:
+            self.assertTrue(self.comicpy_init.check_integrity(
+                                filename=item['name'],
+                                show=False,
+                                level='structure'
+                            ))
+
+    def test_process_dir_misnamed_by_content(self):
+        # misnamed files are inputs of the filter of their content.
+        directory = Paths.build(self.temp_dir, 'by_content', make=True)
+        subdirectory = Paths.build(directory, 'sub', make=True)
+        self.copy('image_dir_1.rar', directory, 'a_rar.cbz')
+        self.copy('image_dir_1.rar', subdirectory, 'b_rar')
+        self.copy('image_1.pdf', directory, 'c_pdf.cbr')
+        self.copy('image_dir_1.zip', directory, 'd_zip.zip')
+
+        inputs = {
+            extension_filter: [
+                Paths.get_basename(entry.path)
+                for entry in self.comicpy_init.scan_dir(
+                                directory_path=directory,
+                                extension_filter=extension_filter
+                            )
+            ]
+            for extension_filter in ('rar', 'pdf', 'zip', 'cbz')
+        }
+        self.assertEqual(inputs, {
+            'rar': ['a_rar.cbz', 'b_rar'],
+            'pdf': ['c_pdf.cbr'],
+            'zip': ['d_zip.zip'],
+            'cbz': ['a_rar.cbz']
+        })
+
+        for extension_filter, names in (
+            ('rar', ['a_rar.cbr', 'b_rar.cbr']),
+            ('pdf', ['c_pdf.cbz'])
+        ):
+            results = self.comicpy_init.process_dir(
+                        directory_path=directory,
+                        extension_filter=extension_filter,
+                        dest=Paths.build(
+                                self.temp_dir,
+                                'by_content_%s' % extension_filter,
+                                make=True
+                            )
+                    )
+            self.assertEqual(
+                [Paths.get_basename(item['name']) for item in results],
+                names
+            )
+
+    def test_process_bytes_misnamed(self):
+        data = self.comicpy_init.process_bytes(
+                    source=self.data['image_1.pdf'],
+                    filename='comic.cbr'
+                )
+        with zipfile.ZipFile(io.BytesIO(data)) as fileZip:
+            self.assertGreater(len(fileZip.namelist()), 0)
+
+    def test_process_file_invalid(self):
+        directory = Paths.build(self.temp_dir, 'invalid', make=True)
+        path = Paths.build(directory, 'text.cbz')
+        with open(path, 'wb') as file:
+            file.write(b'not a comic file')
+        self.assertIsNone(self.comicpy_init.process_file(
+                                filename=path,
+                                dest=self.temp_dir
+                            ))
+
+    @classmethod
+    def tearDownClass(cls):
+        path = os.path.join(
+                    BaseTestCase.TESTS_DIR,
+                    BaseTestCase.TEMP_DIR
+                )
+        shutil.rmtree(path, ignore_errors=True)
@@ -0,0 +1,262 @@
+# -*- coding: utf-8 -*-
+"""
+Tests ImagesHandler
+"""
+
+from test_Base import BaseTestCase
+
+from comicpy.handlers import ImagesHandler
+from comicpy.handlers import imageshandler as imageshandler_module
+from comicpy.handlers.sharedbuffers import SharedBuffers
+from comicpy.encoderprofiles import EncoderProfile
+from comicpy.exceptionsClasses import InvalidEncoderProfile
+from comicpy.cache import TranscodeCache
+from comicpy.utils import Paths
+
+from PIL import Image
+from concurrent.futures import ThreadPoolExecutor
+import unittest
+import shutil
+import io
+import os
+
+
+class ImagesHandlerTestCase(BaseTestCase):
+
+    def build_image(
+        self,
+        color: tuple,
+        mode: str = 'RGB',
+        size: tuple = (64, 96),
+        format: str = 'PNG'
+    ) -> bytes:
+        imageIO = io.BytesIO()
+        Image.new(mode, size, color).save(imageIO, format=format)
+        return imageIO.getvalue()
+
+    def build_arguments(self, n_images: int) -> list:
+        return [
+            {
+                'name_image': 'Image%s.png' % str(i).zfill(4),
+                'currentImage': self.build_image(color=(i * 10, 0, 0)),
+                'extension': 'PNG',
+                'sizeImage': 'preserve',
+                'unit': 'kb'
+            }
+            for i in range(n_images)
+        ]
+
+    def test_imageshandler_invalid_backend(self):
+        with self.assertRaises(ValueError):
+            ImagesHandler(workers=2, backend='xx')
+
+    def test_imageshandler_new_images_order(self):
+        arguments = self.build_arguments(n_images=8)
+        serial = ImagesHandler().new_images(images=arguments)
+        for backend in ImagesHandler.backends:
+            imageshandler = ImagesHandler(workers=3, backend=backend)
+            try:
+                results = imageshandler.new_images(images=arguments)
+            finally:
+                imageshandler.shutdown()
+            self.assertEqual(
+                [item.filename for item in results],
+                [item.filename for item in serial]
+            )
+            self.assertEqual(
+                [item.bytes_data.getvalue() for item in results],
+                [item.bytes_data.getvalue() for item in serial]
+            )
+
+    @unittest.skipUnless(os.path.isdir('/dev/shm'), 'requires /dev/shm')
+    def test_imageshandler_shared_buffers_released(self):
+        arguments = self.build_arguments(n_images=4)
+        arguments[2]['currentImage'] = b'invalid image'
+        imageshandler = ImagesHandler(workers=2, backend='process')
+        try:
+            with self.assertRaises(Exception):
+                imageshandler.new_images(images=arguments)
+            imageshandler.new_images(images=arguments[:2])
+        finally:
+            imageshandler.shutdown()
+        segments = [
+            name
+            for name in os.listdir('/dev/shm')
+            if name.startswith(SharedBuffers.PREFIX)
+        ]
+        self.assertEqual(segments, [])
+
+    def get_mode(self, image_comic) -> str:
+        return Image.open(image_comic.bytes_data).mode
+
+    def test_imageshandler_grayscale_modes(self):
+        imageshandler = ImagesHandler()
+        images = {
+            'L': self.build_image(color=128, mode='L'),
+            '1': self.build_image(color=1, mode='1'),
+            'gray_rgb': self.build_image(color=(120, 122, 119)),
+            'color': self.build_image(color=(200, 10, 10)),
+        }
+        modes = {}
+        for name, data in images.items():
+            image_comic = imageshandler.new_image(
+                                name_image='%s.png' % name,
+                                currentImage=data,
+                                extension='PNG',
+                                unit='kb',
+                                sizeImage='small'
+                            )
+            modes[name] = self.get_mode(image_comic)
+        self.assertEqual(
+            modes,
+            {'L': 'L', '1': 'L', 'gray_rgb': 'L', 'color': 'RGB'}
+        )
+        self.assertEqual(imageshandler.stats['grayscale'], 0)
+
+        imageshandler.new_images(images=[{
+            'name_image': 'L.jpeg',
+            'currentImage': images['L'],
+            'extension': 'JPEG',
+            'unit': 'kb',
+            'sizeImage': 'small'
+        }])
+        self.assertEqual(imageshandler.stats['grayscale'], 1)
+        self.assertEqual(
+            imageshandler.stats['decoded_bytes_saved'],
+            800 * 1200 * 2
+        )
+
+    def test_imageshandler_grayscale_without_numpy(self):
+        numpy_module = imageshandler_module.get_numpy()
+        imageshandler_module.numpy = None
+        try:
+            imageshandler = ImagesHandler()
+            gray = Image.new('RGB', (32, 32), (90, 92, 90))
+            color = Image.new('RGB', (32, 32), (90, 92, 150))
+            self.assertTrue(imageshandler.is_grayscale(image=gray))
+            self.assertFalse(imageshandler.is_grayscale(image=color))
+        finally:
+            imageshandler_module.numpy = numpy_module
+
+    def test_imageshandler_grayscale_disabled(self):
+        imageshandler = ImagesHandler(grayscale=False)
+        image_comic = imageshandler.new_image(
+                            name_image='L.png',
+                            currentImage=self.build_image(color=10, mode='L'),
+                            extension='PNG',
+                            unit='kb'
+                        )
+        self.assertEqual(self.get_mode(image_comic), 'RGB')
+
+    def build_noise_image(self) -> bytes:
+        imageIO = io.BytesIO()
+        Image.effect_noise((400, 600), 64).convert('RGB').save(
+                                                    imageIO,
+                                                    format='PNG'
+                                                )
+        return imageIO.getvalue()
+
+    def encode(self, imageshandler, data, name='page.jpeg', ext='JPEG'):
+        return imageshandler.new_image(
+                    name_image=name,
+                    currentImage=data,
+                    extension=ext,
+                    unit='b'
+                )
+
+    def test_imageshandler_invalid_profile(self):
+        with self.assertRaises(InvalidEncoderProfile):
+            ImagesHandler(profile='xx')
+
+    def test_imageshandler_profiles_size(self):
+        data = self.build_noise_image()
+        original = self.encode(ImagesHandler(), data)
+        small = self.encode(ImagesHandler(profile='small'), data)
+        custom = self.encode(
+                    ImagesHandler(profile=EncoderProfile('q', quality=50)),
+                    data
+                )
+        self.assertLess(small.bytes_data.getbuffer().nbytes,
+                        original.bytes_data.getbuffer().nbytes)
+        self.assertLess(custom.bytes_data.getbuffer().nbytes,
+                        small.bytes_data.getbuffer().nbytes)
+
+    def test_imageshandler_keep_webp(self):
+        data = self.build_image(color=(200, 10, 10), format='WEBP')
+        webp = self.encode(ImagesHandler(profile='small'), data,
+                           name='page.webp', ext='WEBP')
+        jpeg = self.encode(ImagesHandler(), data,
+                           name='page.webp', ext='WEBP')
+        self.assertEqual(webp.filename, 'page.webp')
+        self.assertEqual(Image.open(webp.bytes_data).format, 'WEBP')
+        self.assertEqual(jpeg.filename, 'page.jpeg')
+        self.assertEqual(Image.open(jpeg.bytes_data).format, 'JPEG')
+
+    def test_imageshandler_page_budget(self):
+        data = self.build_noise_image()
+        budget = 60000
+        image_comic = self.encode(
+                        ImagesHandler(profile='high', page_budget=budget),
+                        data
+                    )
+        self.assertLessEqual(image_comic.bytes_data.getbuffer().nbytes, budget)
+
+    def test_imageshandler_cache_hit(self):
+        cache = TranscodeCache(path=Paths.build(self.temp_dir, 'cache_hit'))
+        arguments = self.build_arguments(n_images=3)
+        first = ImagesHandler(cache=cache).new_images(images=arguments)
+        for backend in ImagesHandler.backends:
+            imageshandler = ImagesHandler(
+                                workers=2,
+                                backend=backend,
+                                cache=cache
+                            )
+            try:
+                second = imageshandler.new_images(images=arguments)
+            finally:
+                imageshandler.shutdown()
+            self.assertTrue(all(item.cached for item in second))
+            self.assertEqual(
+                [item.bytes_data.getvalue() for item in second],
+                [item.bytes_data.getvalue() for item in first]
+            )
+        other = ImagesHandler(cache=cache, profile='small').new_image(
+                                                            **arguments[0])
+        self.assertFalse(other.cached)
+
+    def test_imageshandler_cache_eviction(self):
+        cache = TranscodeCache(
+                    path=Paths.build(self.temp_dir, 'cache_evict'),
+                    max_size=3000
+                )
+        for i in range(10):
+            cache.put(key='%040x' % i, data=bytes(1000), mode='RGB')
+        self.assertLessEqual(cache.get_cache_size(), 3000)
+        self.assertIsNotNone(cache.get(key='%040x' % 9))
+        self.assertIsNone(cache.get(key='%040x' % 0))
+
+    def test_imageshandler_cache_concurrent_puts(self):
+        cache = TranscodeCache(
+                    path=Paths.build(self.temp_dir, 'cache_concurrent')
+                )
+        keys = ['%040x' % i for i in range(3)]
+
+        def put(worker: int) -> None:
+            for i in range(300):
+                cache.put(key=keys[i % 3], data=bytes(100 + worker), mode='L')
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            # the exceptions of the threads are raised by `result`.
+            for future in [executor.submit(put, i) for i in range(8)]:
+                future.result()
+        # overwritten entries are counted once.
+        self.assertEqual(cache.current_size, cache.get_cache_size())
+        self.assertEqual(len(cache.entries()), 3)
+
+    @classmethod
+    def tearDownClass(cls):
+        path = os.path.join(
+                    BaseTestCase.TESTS_DIR,
+                    BaseTestCase.TEMP_DIR
+                )
+        shutil.rmtree(path, ignore_errors=True)
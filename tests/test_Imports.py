@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+Tests lazy imports and startup time
+"""
+
+from test_Base import BaseTestCase
+
+from comicpy.version import VERSION
+
+import subprocess
+import shutil
+import sys
+import os
+
+
+# modules imported only when a file is converted.
+HEAVY_MODULES = (
+    'fitz',
+    'pymupdf',
+    'PIL',
+    'rarfile',
+    'pyzipper',
+    'Crypto',
+    'Cryptodome',
+    'numpy'
+)
+# highest cumulative import time of `comicpy`, in seconds.
+IMPORT_BUDGET = 0.1
+
+
+class ImportsTestCase(BaseTestCase):
+
+    def importtime(self, *args):
+        """
+        Runs Python with `-X importtime`, returns its output and the
+        cumulative import time of each module, in seconds.
+        """
+        process = subprocess.run(
+                    [sys.executable, '-X', 'importtime'] + list(args),
+                    capture_output=True,
+                    text=True,
+                    timeout=120
+                )
+        self.assertEqual(process.returncode, 0, process.stderr)
+        modules = {}
+        for line in process.stderr.splitlines():
+            if not line.startswith('import time:') or '[us]' in line:
+                continue
+            _, cumulative, name = line.split('|')
+            modules[name.strip()] = int(cumulative) / 10**6
+        return process.stdout, modules
+
+    def assertLight(self, modules):
+        heavy = [
+            name for name in modules
+            if name.split('.')[0] in HEAVY_MODULES
+        ]
+        self.assertEqual(heavy, [])
+
+    def test_import_comicpy(self):
+        _, modules = self.importtime('-c', 'import comicpy')
+        self.assertLight(modules)
+        self.assertLess(modules['comicpy'], IMPORT_BUDGET)
+
+    def test_cli_version(self):
+        output, modules = self.importtime('-m', 'comicpy', '--version')
+        self.assertIn(VERSION, output)
+        self.assertLight(modules)
+
+    def test_lazy_handlers(self):
+        code = '\n'.join([
+            'import sys',
+            'from comicpy import ComicPy',
+            'print("PIL" in sys.modules)',
+            'comic = ComicPy()',
+            'print(sorted(comic.handlers))',
+            'print("pymupdf" in sys.modules, "rarfile" in sys.modules)',
+            'comic.process_pdf(filename=sys.argv[1], dest=sys.argv[2])',
+            'print(sorted(comic.handlers))',
+            'print("pymupdf" in sys.modules, "rarfile" in sys.modules)',
+        ])
+        process = subprocess.run(
+                    [
+                        sys.executable, '-c', code,
+                        self.files['image_1.pdf'],
+                        self.temp_dir
+                    ],
+                    capture_output=True,
+                    text=True,
+                    timeout=120
+                )
+        self.assertEqual(process.returncode, 0, process.stderr)
+        self.assertEqual(
+            process.stdout.splitlines(),
+            ['False', '[]', 'False False', "['pdf', 'zip']", 'True False']
+        )
+
+    def test_lazy_attributes(self):
+        import comicpy
+        from comicpy.handlers import PdfHandler
+        from comicpy.handlers.pdfhandler import PdfHandler as Handler
+
+        self.assertIs(PdfHandler, Handler)
+        self.assertIs(comicpy.PdfHandler, Handler)
+        self.assertIn('ComicPy', dir(comicpy))
+        self.assertEqual(sorted(comicpy.__all__), sorted(set(comicpy.__all__)))
+        for name in comicpy.__all__:
+            self.assertIsNotNone(getattr(comicpy, name))
+        with self.assertRaises(AttributeError):
+            comicpy.NotAName
+
+    @classmethod
+    def tearDownClass(cls):
+        path = os.path.join(
+                    BaseTestCase.TESTS_DIR,
+                    BaseTestCase.TEMP_DIR
+                )
+        shutil.rmtree(path, ignore_errors=True)
@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+"""
+Tests MemoryBudget
+"""
+
+from test_Base import BaseTestCase
+
+from benchmarks.corpus import make_pdf, page_images
+from comicpy.memorybudget import MemoryBudget
+from comicpy.utils import Paths
+
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import zipfile
+import shutil
+import time
+import os
+
+
+class MemoryBudgetTestCase(BaseTestCase):
+
+    def test_budget_waits(self):
+        budget = MemoryBudget(limit=100)
+        first, second = object(), object()
+        budget.acquire(nbytes=80, owner=first)
+        # the oldest holder passes the limit, it never waits.
+        budget.acquire(nbytes=80, owner=first)
+        self.assertEqual(budget.stats['current'], 160)
+
+        acquired = threading.Event()
+
+        def acquire_second():
+            budget.acquire(nbytes=50, owner=second)
+            acquired.set()
+
+        thread = threading.Thread(target=acquire_second)
+        thread.start()
+        time.sleep(0.05)
+        self.assertFalse(acquired.is_set())
+
+        budget.release(nbytes=80, owner=first)
+        time.sleep(0.05)
+        self.assertFalse(acquired.is_set())
+        budget.release_all(owner=first)
+        thread.join(timeout=5)
+        self.assertTrue(acquired.is_set())
+
+        # bytes not held are not released.
+        budget.release(nbytes=500, owner=second)
+        budget.release(nbytes=10, owner=first)
+        self.assertEqual(budget.stats['current'], 0)
+        self.assertEqual(budget.stats['peak'], 160)
+        self.assertEqual(budget.stats['waits'], 1)
+        self.assertGreater(budget.stats['wait_time'], 0)
+
+        with self.assertRaises(ValueError):
+            MemoryBudget(limit=0)
+
+    def test_budget_draining(self):
+        budget = MemoryBudget(limit=100)
+        owner = object()
+        # the data of the input file is kept, it passes the limit.
+        budget.acquire(nbytes=300, owner=owner, keep=True)
+        with budget.draining(owner=owner):
+            # nothing is being written, a page passes the limit.
+            budget.acquire(nbytes=80, owner=owner)
+
+            waited = threading.Event()
+
+            def wait_owner():
+                budget.wait(owner=owner)
+                waited.set()
+
+            # the next page waits until the previous one is written.
+            thread = threading.Thread(target=wait_owner)
+            thread.start()
+            time.sleep(0.05)
+            self.assertFalse(waited.is_set())
+            budget.release(nbytes=80, owner=owner)
+            thread.join(timeout=5)
+            self.assertTrue(waited.is_set())
+        self.assertEqual(budget.stats['waits'], 1)
+        self.assertEqual(budget.stats['peak'], 380)
+
+        # without draining, the oldest holder never waits.
+        budget.acquire(nbytes=80, owner=owner)
+        budget.wait(owner=owner)
+        budget.release(nbytes=300, owner=owner, keep=True)
+        self.assertEqual(budget.stats['current'], 80)
+        budget.release_all(owner=owner)
+        self.assertEqual(budget.stats['current'], 0)
+        self.assertEqual(budget.kept, {})
+
+    def test_comicpy_memory_limit_pdf(self):
+        images = list(page_images(pages=30, size=(300, 420)))
+        path = make_pdf(
+                    path=Paths.build(self.temp_dir, 'pages_30.pdf'),
+                    images=images
+                )
+        # the data of the PDF file is kept while its pages are extracted.
+        limit = os.path.getsize(path) + 1
+        comic = self.comicpy(memory_limit=limit)
+        metadata = comic.process_pdf(
+                        filename=path,
+                        dest=Paths.build(self.temp_dir, 'budget_pdf')
+                    )
+        with zipfile.ZipFile(metadata[0]['name']) as file:
+            self.assertIsNone(file.testzip())
+            sizes = [info.file_size for info in file.infolist()]
+        self.assertEqual(len(sizes), 30)
+
+        # each page is extracted while the previous one is written, at most
+        # one page, extracted and transcoded, passes the limit.
+        page = max(len(data) for name, data in images) + max(sizes)
+        self.assertGreater(comic.budget.stats['waits'], 0)
+        self.assertLessEqual(comic.budget.stats['peak'], limit + page)
+        self.assertEqual(comic.budget.stats['current'], 0)
+
+    def test_comicpy_memory_limit(self):
+        names = sorted(os.listdir(self.pdfs_dir))
+        peaks = []
+        for memory_limit in (None, 1):
+            comic = self.comicpy(memory_limit=memory_limit)
+            dest = Paths.build(self.temp_dir, 'budget_%s' % memory_limit)
+
+            def convert(name):
+                return comic.process_pdf(
+                            filename=Paths.build(self.pdfs_dir, name),
+                            dest=dest
+                        )
+
+            with ThreadPoolExecutor(max_workers=len(names)) as executor:
+                results = list(executor.map(convert, names))
+
+            sizes = []
+            for name, metadata in zip(names, results):
+                with zipfile.ZipFile(metadata[0]['name']) as file:
+                    self.assertIsNone(file.testzip())
+                    # the PDF file, its images extracted, at most the size
+                    # of file, and its images transcoded.
+                    sizes.append(2 * os.path.getsize(
+                        Paths.build(self.pdfs_dir, name)
+                    ) + sum(
+                        info.file_size for info in file.infolist()
+                    ))
+            self.assertEqual(comic.budget.stats['current'], 0)
+            peaks.append(comic.budget.stats['peak'])
+
+        # without limit the data of all files can be in flight, with the
+        # limit only that of one file.
+        self.assertLessEqual(peaks[0], sum(sizes))
+        self.assertLessEqual(peaks[1], max(sizes))
+
+    def test_comicpy_memory_limit_jobs(self):
+        comic = self.comicpy(memory_limit=1000)
+        # the limit is divided between the worker processes.
+        self.assertEqual(comic.get_job_options()['memory_limit'], 1000)
+        self.assertEqual(
+            comic.get_job_options(jobs=4)['memory_limit'],
+            250
+        )
+        self.assertEqual(
+            comic.get_job_options(jobs=2000)['memory_limit'],
+            1
+        )
+        options = self.comicpy().get_job_options(jobs=4)
+        self.assertIsNone(options['memory_limit'])
+
+    @classmethod
+    def tearDownClass(cls):
+        path = os.path.join(
+                    BaseTestCase.TESTS_DIR,
+                    BaseTestCase.TEMP_DIR
+                )
+        shutil.rmtree(path, ignore_errors=True)
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+Tests metrics of stages
+"""
+
+from test_Base import BaseTestCase
+
+from comicpy.metrics import Metrics
+from comicpy.utils import Paths
+
+from concurrent.futures import ThreadPoolExecutor
+import shutil
+import os
+
+
+class MetricsTestCase(BaseTestCase):
+
+    def test_metrics_prometheus(self):
+        metrics = Metrics()
+        with metrics.timer(stage='read', bytes_in=10) as record:
+            record['bytes_out'] = 10
+        metrics.merge(stats={'rar': {
+                    'calls': 2, 'seconds': 0.5, 'bytes_in': 3, 'bytes_out': 1
+                }})
+        stats = metrics.snapshot()
+        self.assertEqual(list(stats), ['read', 'rar'])
+        self.assertEqual(stats['rar']['calls'], 2)
+
+        path = Paths.build(self.temp_dir, 'metrics', make=True)
+        path = Paths.build(path, 'comicpy.prom')
+        metrics.write_prometheus(path=path)
+        with open(path) as file:
+            lines = file.read().splitlines()
+        self.assertIn('# TYPE comicpy_stage_calls_total counter', lines)
+        self.assertIn('comicpy_stage_bytes_in_total{stage="read"} 10', lines)
+        self.assertIn('comicpy_stage_seconds_total{stage="rar"} 0.5', lines)
+
+    def test_comicpy_last_stats(self):
+        comic = self.comicpy_init
+        comic.metrics.reset()
+        filename = Paths.build(self.pdfs_dir, 'image_1.pdf')
+        comic.process_pdf(
+            filename=filename,
+            compressor='rar',
+            dest=self.temp_dir
+        )
+        stats = comic.last_stats.snapshot()
+        for stage in ('read', 'check', 'extract', 'decode', 'encode',
+                      'write', 'rar'):
+            self.assertGreater(stats[stage]['calls'], 0)
+        self.assertEqual(
+            stats['read']['bytes_in'],
+            os.path.getsize(filename)
+        )
+        self.assertEqual(stats['decode']['calls'], 4)
+
+        comic.process_zip(
+            filename=BaseTestCase.FILES['image_dir_2.zip'],
+            resize='small',
+            dest=self.temp_dir
+        )
+        stats_zip = comic.last_stats.snapshot()
+        self.assertEqual(stats_zip['protection']['calls'], 1)
+        self.assertEqual(stats_zip['resize']['calls'], 2)
+        self.assertNotIn('rar', stats_zip)
+
+        # the totals of the instance add all conversions.
+        totals = comic.metrics.snapshot()
+        self.assertEqual(
+            totals['decode']['calls'],
+            stats['decode']['calls'] + stats_zip['decode']['calls']
+        )
+
+        # the last statistics are kept by thread.
+        def convert(name):
+            comic.process_pdf(
+                filename=Paths.build(self.pdfs_dir, name),
+                dest=self.temp_dir
+            )
+            return comic.last_stats.snapshot()['read']['bytes_in']
+
+        names = sorted(os.listdir(self.pdfs_dir))
+        with ThreadPoolExecutor(max_workers=len(names)) as executor:
+            sizes = list(executor.map(convert, names))
+        self.assertEqual(sizes, [
+            os.path.getsize(Paths.build(self.pdfs_dir, name))
+            for name in names
+        ])
+
+    def test_comicpy_metrics_jobs(self):
+        comic = self.comicpy()
+        comic.process_dir(
+            directory_path=self.pdfs_dir,
+            extension_filter='pdf',
+            dest=Paths.build(self.temp_dir, 'metrics_jobs'),
+            jobs=2
+        )
+        stats = comic.last_stats.snapshot()
+        self.assertEqual(stats['read']['calls'], 4)
+        self.assertEqual(stats['write']['calls'], 4)
+        comic.close()
+
+    @classmethod
+    def tearDownClass(cls):
+        path = os.path.join(
+                    BaseTestCase.TESTS_DIR,
+                    BaseTestCase.TEMP_DIR
+                )
+        shutil.rmtree(path, ignore_errors=True)
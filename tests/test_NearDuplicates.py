@@ -0,0 +1,236 @@
+# -*- coding: utf-8 -*-
+"""
+Tests dropping of near duplicate pages
+"""
+
+from test_Base import BaseTestCase
+
+from comicpy.comicpycontroller import ComicPy
+from comicpy.handlers import ImagesHandler
+from comicpy.handlers import imageshandler as imageshandler_module
+from comicpy.handlers.imageshandler import PageHashes
+from comicpy.cache import TranscodeCache
+from comicpy.utils import Paths
+
+from PIL import Image, ImageDraw
+
+import zipfile
+import random
+import shutil
+import io
+import os
+
+
+class NearDuplicatesTestCase(BaseTestCase):
+
+    def build_page(self, seed: int) -> Image.Image:
+        generator = random.Random(seed)
+        image = Image.new('L', (400, 600), 255)
+        draw = ImageDraw.Draw(image)
+        for _ in range(12):
+            x, y = generator.randrange(380), generator.randrange(580)
+            draw.rectangle(
+                (
+                    x,
+                    y,
+                    x + generator.randrange(20, 200),
+                    y + generator.randrange(20, 300)
+                ),
+                fill=generator.randrange(256)
+            )
+        return image
+
+    def encode(
+        self,
+        image: Image.Image,
+        format: str = 'PNG',
+        **options
+    ) -> bytes:
+        imageIO = io.BytesIO()
+        image.save(imageIO, format=format, **options)
+        return imageIO.getvalue()
+
+    def build_copy(self, seed: int) -> bytes:
+        # other scan of the same page, smaller and with JPEG artifacts.
+        return self.encode(
+                    self.build_page(seed=seed).resize((380, 570)),
+                    format='JPEG',
+                    quality=60
+                )
+
+    def distance(self, a: int, b: int) -> int:
+        return bin(a ^ b).count('1')
+
+    def test_dhash(self):
+        imageshandler = ImagesHandler(near_duplicates=6)
+        page = imageshandler.get_dhash(image=self.build_page(seed=1))
+        copy = imageshandler.get_dhash_data(data=self.build_copy(seed=1))
+        other = imageshandler.get_dhash(image=self.build_page(seed=2))
+        self.assertLessEqual(self.distance(page, copy), 6)
+        self.assertGreater(self.distance(page, other), 6)
+
+        image_comic = imageshandler.new_image(
+                            name_image='Image0001.png',
+                            currentImage=self.encode(self.build_page(seed=1)),
+                            extension='PNG',
+                            unit='kb'
+                        )
+        self.assertEqual(image_comic.dhash, page)
+
+    def test_dhash_cached(self):
+        # pages loaded from the cache have the hash of pages transcoded.
+        imageshandler = ImagesHandler(
+                            near_duplicates=6,
+                            cache=TranscodeCache(
+                                path=Paths.build(self.temp_dir, 'cache_dhash')
+                            )
+                        )
+        arguments = {
+            'name_image': 'Image0001.jpg',
+            'currentImage': self.encode(
+                                self.build_page(seed=3),
+                                format='JPEG',
+                                quality=95
+                            ),
+            'extension': 'JPEG',
+            'unit': 'kb',
+            'sizeImage': 'small'
+        }
+        image_comic = imageshandler.new_image(**arguments)
+        cached = imageshandler.new_image(**arguments)
+        self.assertFalse(image_comic.cached)
+        self.assertTrue(cached.cached)
+        self.assertEqual(cached.dhash, image_comic.dhash)
+        self.assertEqual(
+            image_comic.dhash,
+            imageshandler.get_dhash_data(
+                data=image_comic.bytes_data.getvalue()
+            )
+        )
+
+    def test_dhash_without_numpy(self):
+        imageshandler = ImagesHandler()
+        pages = [self.build_page(seed=seed) for seed in range(3)]
+        expected = [imageshandler.get_dhash(image=page) for page in pages]
+        numpy_module = imageshandler_module.get_numpy()
+        imageshandler_module.numpy = None
+        try:
+            self.assertEqual(
+                [imageshandler.get_dhash(image=page) for page in pages],
+                expected
+            )
+            hashes = PageHashes()
+            hashes.add(dhash=expected[0])
+            hashes.add(dhash=expected[1])
+            self.assertEqual(
+                hashes.distance(dhash=expected[2]),
+                min(self.distance(expected[2], dhash)
+                    for dhash in expected[:2])
+            )
+        finally:
+            imageshandler_module.numpy = numpy_module
+
+    def test_page_hashes(self):
+        hashes = PageHashes()
+        self.assertIsNone(hashes.distance(dhash=0))
+        values = [random.Random(seed).getrandbits(64) for seed in range(100)]
+        for dhash in values:
+            hashes.add(dhash=dhash)
+        self.assertEqual(hashes.distance(dhash=values[70]), 0)
+        self.assertEqual(
+            hashes.distance(dhash=values[70] ^ 0b101),
+            min(self.distance(values[70] ^ 0b101, dhash) for dhash in values)
+        )
+
+    def test_near_duplicates_invalid(self):
+        with self.assertRaises(ValueError):
+            ImagesHandler(near_duplicates=65)
+        with self.assertRaises(ValueError):
+            ComicPy(near_duplicates=-1)
+
+    def make_pages(self, name: str) -> str:
+        """
+        Two chapters with the same credits page, scanned again in the second.
+        """
+        directory = Paths.build(self.temp_dir, name, make=True)
+        chapters = {
+            '1': [
+                ('credits.png', self.encode(self.build_page(seed=1))),
+                ('page.png', self.encode(self.build_page(seed=2)))
+            ],
+            '2': [
+                ('credits.jpg', self.build_copy(seed=1)),
+                ('page.png', self.encode(self.build_page(seed=3)))
+            ]
+        }
+        for chapter, pages in chapters.items():
+            path = Paths.build(directory, chapter, make=True)
+            for filename, data in pages:
+                with open(Paths.build(path, filename), 'wb') as file:
+                    file.write(data)
+        return directory
+
+    def count_images(self, filename: str) -> int:
+        with zipfile.ZipFile(filename) as file:
+            return len(file.namelist())
+
+    def test_process_dir_join(self):
+        directory = self.make_pages(name='pages_join')
+        comic = ComicPy(unit='kb', near_duplicates=6)
+        results = comic.process_dir(
+                    directory_path=directory,
+                    extension_filter='images',
+                    compressor='zip',
+                    join=True,
+                    dest=Paths.build(self.temp_dir, 'dest_join', make=True)
+                )
+        self.assertEqual(self.count_images(results[0]['name']), 3)
+        self.assertEqual(comic.imageshandler.stats['near_duplicates'], 1)
+
+    def test_process_dir_separated(self):
+        # the pages of each output are compared only between them.
+        directory = self.make_pages(name='pages_separated')
+        comic = ComicPy(unit='kb', near_duplicates=6)
+        results = comic.process_dir(
+                    directory_path=directory,
+                    extension_filter='images',
+                    compressor='zip',
+                    join=False,
+                    dest=Paths.build(self.temp_dir, 'dest_sep', make=True)
+                )
+        self.assertEqual(
+            [self.count_images(item['name']) for item in results],
+            [2, 2]
+        )
+        self.assertEqual(comic.imageshandler.stats['near_duplicates'], 0)
+
+    def test_process_dir_join_jobs(self):
+        directory = self.make_pages(name='pages_cbz')
+        files = Paths.build(self.temp_dir, 'files_cbz', make=True)
+        for chapter in ('1', '2'):
+            path = Paths.build(files, 'chapter_%s.cbz' % chapter)
+            with zipfile.ZipFile(path, 'w') as file:
+                for entry in sorted(os.scandir(
+                    Paths.build(directory, chapter)
+                ), key=lambda entry: entry.name):
+                    file.write(entry.path, arcname=entry.name)
+
+        comic = ComicPy(unit='kb', near_duplicates=6)
+        results = comic.process_dir(
+                    directory_path=files,
+                    extension_filter='cbz',
+                    compressor='zip',
+                    join=True,
+                    jobs=2,
+                    dest=Paths.build(self.temp_dir, 'dest_jobs', make=True)
+                )
+        self.assertEqual(self.count_images(results[0]['name']), 3)
+        self.assertEqual(comic.imageshandler.stats['near_duplicates'], 1)
+
+    @classmethod
+    def tearDownClass(cls):
+        path = os.path.join(
+                    BaseTestCase.TESTS_DIR,
+                    BaseTestCase.TEMP_DIR
+                )
+        shutil.rmtree(path, ignore_errors=True)
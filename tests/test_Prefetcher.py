@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""
+Tests Prefetcher
+"""
+
+from test_Base import BaseTestCase
+
+from comicpy.prefetcher import Prefetcher, IOStats
+from comicpy.memorybudget import MemoryBudget
+from comicpy.context import ConversionContext
+from comicpy.utils import Paths
+
+from threading import Event
+import shutil
+import os
+
+
+class PrefetcherTestCase(BaseTestCase):
+
+    def make_files(self, number: int) -> list:
+        directory = Paths.build(self.temp_dir, 'prefetch', make=True)
+        paths = []
+        for index in range(number):
+            path = Paths.build(directory, 'file_%d' % index)
+            with open(path, 'wb') as file:
+                file.write(b'%d' % index)
+            paths.append(path)
+        return paths
+
+    def test_prefetcher_order(self):
+        paths = self.make_files(number=6)
+        for depth in (0, 1, 3):
+            iostats = IOStats()
+            with Prefetcher(
+                paths=paths,
+                depth=depth,
+                iostats=iostats
+            ) as prefetcher:
+                data = [prefetcher.get(path=path) for path in paths]
+            self.assertEqual(data, [b'%d' % i for i in range(6)])
+            self.assertEqual(iostats.stats['files'], 6)
+            self.assertEqual(iostats.stats['bytes'], 6)
+
+    def test_prefetcher_bounded(self):
+        paths = self.make_files(number=5)
+        started = []
+        release = Event()
+
+        def reader(path):
+            started.append(path)
+            release.wait(timeout=5)
+            with open(path, 'rb') as file:
+                return file.read()
+
+        prefetcher = Prefetcher(paths=paths, depth=2, reader=reader)
+        try:
+            self.assertEqual(len(prefetcher.window), 2)
+            self.assertEqual(len(prefetcher.pending), 3)
+            release.set()
+            # files skipped are discarded, without reading them again.
+            self.assertEqual(prefetcher.get(path=paths[2]), b'2')
+            self.assertEqual(prefetcher.get(path=paths[4]), b'4')
+            self.assertEqual(len(prefetcher.window), 0)
+        finally:
+            prefetcher.close()
+        self.assertNotIn(paths[3], prefetcher.pending)
+
+    def test_prefetcher_errors(self):
+        paths = self.make_files(number=1)
+        missing = Paths.build(self.temp_dir, 'prefetch', 'missing')
+        with Prefetcher(paths=[missing] + paths, depth=2) as prefetcher:
+            with self.assertRaises(FileNotFoundError):
+                prefetcher.get(path=missing)
+            self.assertEqual(prefetcher.get(path=paths[0]), b'0')
+
+        with self.assertRaises(ValueError):
+            Prefetcher(paths=paths, depth=-1)
+
+    def test_prefetcher_budget(self):
+        paths = self.make_files(number=5)
+        budget = MemoryBudget(limit=100)
+        context = ConversionContext(budget=budget)
+        prefetcher = Prefetcher(paths=paths, depth=2, context=context)
+        try:
+            self.assertEqual(prefetcher.get(path=paths[0]), b'0')
+            # the files read ahead are kept until they are requested.
+            for future in [future for path, future in prefetcher.window]:
+                future.result()
+            self.assertEqual(budget.stats['current'], 2)
+            self.assertEqual(budget.kept[context], 2)
+            # files skipped are released.
+            self.assertEqual(prefetcher.get(path=paths[3]), b'3')
+        finally:
+            prefetcher.close()
+        self.assertEqual(budget.stats['current'], 0)
+        self.assertLessEqual(budget.stats['peak'], 3)
+
+    def test_comicpy_prefetch_stats(self):
+        comic = self.comicpy(prefetch=2)
+        results = comic.process_dir(
+                        directory_path=self.pdfs_dir,
+                        extension_filter='pdf',
+                        dest=self.temp_dir
+                    )
+        self.assertEqual(len(results), 4)
+        self.assertEqual(comic.iostats.stats['files'], 4)
+        self.assertEqual(
+            comic.iostats.stats['bytes'],
+            sum(
+                os.path.getsize(Paths.build(self.pdfs_dir, name))
+                for name in os.listdir(self.pdfs_dir)
+            )
+        )
+        self.assertGreater(comic.iostats.stats['cpu'], 0)
+        self.assertIsNone(comic.prefetcher)
+
+    @classmethod
+    def tearDownClass(cls):
+        path = os.path.join(
+                    BaseTestCase.TESTS_DIR,
+                    BaseTestCase.TEMP_DIR
+                )
+        shutil.rmtree(path, ignore_errors=True)
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""
+Tests profiling
+"""
+
+from test_Base import BaseTestCase
+
+from comicpy.profiling import (
+    get_profiler,
+    start_profiling,
+    stop_profiling
+)
+from comicpy.utils import Paths
+
+import subprocess
+import tracemalloc
+import pstats
+import shutil
+import sys
+import os
+
+
+class ProfilingTestCase(BaseTestCase):
+
+    def test_profiler_cpu(self):
+        path = Paths.build(self.temp_dir, 'comicpy.pstats')
+        profiler = start_profiling(mode='cpu', path=path, top=5)
+        with self.assertRaises(ValueError):
+            start_profiling(mode='cpu')
+        self.comicpy_init.process_pdf(
+                    filename=self.files['image_1.pdf'],
+                    dest=self.temp_dir
+                )
+        self.assertIs(stop_profiling(), profiler)
+        self.assertIsNone(get_profiler())
+
+        stats = pstats.Stats(path)
+        functions = {function[2] for function in stats.stats}
+        self.assertIn('to_pymupdf', functions)
+        self.assertIn('cumulative', profiler.report())
+
+    def test_profiler_mem(self):
+        path = Paths.build(self.temp_dir, 'comicpy.tracemalloc')
+        profiler = start_profiling(mode='mem', path=path, top=5)
+        self.comicpy_init.process_dir(
+                    directory_path=self.pdfs_dir,
+                    extension_filter='pdf',
+                    dest=Paths.build(self.temp_dir, 'profile_mem')
+                )
+        stop_profiling()
+        self.assertFalse(tracemalloc.is_tracing())
+
+        names = os.listdir(self.pdfs_dir)
+        self.assertEqual(len(profiler.files), len(names))
+        for peak in profiler.files.values():
+            self.assertGreater(peak, 0)
+            self.assertLessEqual(peak, profiler.peak)
+        report = profiler.report()
+        self.assertIn('Top allocation sites:', report)
+        self.assertEqual(
+            len(tracemalloc.Snapshot.load(path).traces),
+            len(profiler.snapshot.traces)
+        )
+
+        with self.assertRaises(ValueError):
+            start_profiling(mode='io')
+
+    def test_cli_profiler(self):
+        path = os.path.abspath(
+                    Paths.build(self.temp_dir, 'cli.tracemalloc')
+                )
+        filename = os.path.abspath(BaseTestCase.FILES['image_1.pdf'])
+        env = dict(os.environ, PYTHONPATH=os.getcwd())
+        # the CBZ file is written in the current directory.
+        process = subprocess.run(
+                    [
+                        sys.executable, '-c',
+                        'from comicpy.cli import CliComicPy; CliComicPy()',
+                        '--type', 'f',
+                        '--path', filename,
+                        '--profiler', 'mem',
+                        '--profiler_file', path,
+                        '--profiler_top', '3'
+                    ],
+                    capture_output=True,
+                    cwd=self.temp_dir,
+                    env=env,
+                    timeout=120
+                )
+        self.assertEqual(process.returncode, 0)
+        self.assertIn(filename.encode(), process.stdout)
+        self.assertIn(b'Profile written to', process.stdout)
+        self.assertTrue(Paths.exists(path))
+
+    def tearDown(self):
+        stop_profiling()
+
+    @classmethod
+    def tearDownClass(cls):
+        path = os.path.join(
+                    BaseTestCase.TESTS_DIR,
+                    BaseTestCase.TEMP_DIR
+                )
+        shutil.rmtree(path, ignore_errors=True)
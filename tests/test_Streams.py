@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+Tests streaming CBZ writer
+"""
+
+from test_Base import BaseTestCase
+
+from comicpy.streams import CBZWriter, SinkWriter
+
+from concurrent.futures import ThreadPoolExecutor
+import subprocess
+import zipfile
+import shutil
+import sys
+import io
+import os
+
+
+class StreamsTestCase(BaseTestCase):
+
+    def test_cbz_writer_pipe(self):
+        read_fd, write_fd = os.pipe()
+        members = [('%d/page.jpg' % i, os.urandom(2**16)) for i in range(4)]
+
+        def read_pipe():
+            with os.fdopen(read_fd, 'rb') as pipe:
+                return pipe.read()
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(read_pipe)
+            with os.fdopen(write_fd, 'wb') as pipe:
+                with CBZWriter(sink=pipe) as writer:
+                    for name, data in members:
+                        writer.add(arcname=name, data=data)
+            data = future.result()
+
+        self.assertEqual(writer.size, len(data))
+        with zipfile.ZipFile(io.BytesIO(data)) as file:
+            self.assertIsNone(file.testzip())
+            self.assertEqual(
+                [(name, file.read(name)) for name in file.namelist()],
+                members
+            )
+            # sizes are written after the data of each member.
+            for info in file.infolist():
+                self.assertTrue(info.flag_bits & 0x08)
+
+    def test_sink_writer_would_block(self):
+        class RawSink(io.RawIOBase):
+            # writes part of the data and then would block.
+            def __init__(self):
+                self.data = bytearray()
+
+            def writable(self):
+                return True
+
+            def write(self, data):
+                if self.data:
+                    return None
+                self.data += data[:10]
+                return 10
+
+        sink = RawSink()
+        writer = SinkWriter(sink=sink)
+        with self.assertRaises(BlockingIOError) as error:
+            writer.write(b'x' * 100)
+        self.assertEqual(error.exception.characters_written, 10)
+        self.assertEqual(writer.size, 10)
+        self.assertEqual(bytes(sink.data), b'x' * 10)
+
+    def test_sink_writer_nonblocking_pipe(self):
+        read_fd, write_fd = os.pipe()
+        os.set_blocking(write_fd, False)
+        data = os.urandom(2**20)
+
+        def read_pipe():
+            with os.fdopen(read_fd, 'rb') as pipe:
+                return pipe.read()
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(read_pipe)
+            with os.fdopen(write_fd, 'wb', buffering=0) as pipe:
+                writer = SinkWriter(sink=pipe)
+                self.assertEqual(writer.write(data), len(data))
+            self.assertEqual(future.result(), data)
+        self.assertEqual(writer.size, len(data))
+
+    def test_cli_output_stdout(self):
+        process = subprocess.run(
+                    [
+                        sys.executable, '-c',
+                        'from comicpy.cli import CliComicPy; CliComicPy()',
+                        '--type', 'f',
+                        '--path', BaseTestCase.FILES['image_1.pdf'],
+                        '--progress',
+                        '-o', '-'
+                    ],
+                    capture_output=True,
+                    timeout=120
+                )
+        self.assertEqual(process.returncode, 0)
+        self.assertTrue(process.stdout.startswith(b'PK\x03\x04'))
+        self.assertIn(b'Current file', process.stderr)
+        with zipfile.ZipFile(io.BytesIO(process.stdout)) as file:
+            self.assertEqual(len(file.namelist()), 4)
+
+    @classmethod
+    def tearDownClass(cls):
+        path = os.path.join(
+                    BaseTestCase.TESTS_DIR,
+                    BaseTestCase.TEMP_DIR
+                )
+        shutil.rmtree(path, ignore_errors=True)
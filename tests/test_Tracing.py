@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""
+Tests tracing
+"""
+
+from test_Base import BaseTestCase
+
+from comicpy.tracing import get_tracer, span, stop_tracing
+from comicpy.utils import Paths
+
+import shutil
+import json
+import os
+
+
+class TracingTestCase(BaseTestCase):
+
+    def load_trace(self, path):
+        with open(path) as file:
+            trace = json.load(file)
+        return [
+            event for event in trace['traceEvents'] if event['ph'] == 'X'
+        ]
+
+    def test_trace_pdf(self):
+        path = Paths.build(self.temp_dir, 'trace_pdf.json')
+        with self.comicpy(trace=path) as comic:
+            comic.process_pdf(
+                        filename=self.files['image_1.pdf'],
+                        dest=self.temp_dir
+                    )
+        stop_tracing()
+
+        events = self.load_trace(path)
+        names = {event['name'] for event in events}
+        for name in ('process_pdf', 'to_pymupdf', 'page', 'new_image',
+                     'to_zip'):
+            self.assertIn(name, names)
+        pages = [event for event in events if event['name'] == 'page']
+        self.assertEqual(
+            [event['args']['page'] for event in pages],
+            [str(number) for number in range(1, len(pages) + 1)]
+        )
+        process = [
+            event for event in events if event['name'] == 'process_pdf'
+        ][0]
+        self.assertEqual(
+            process['args']['filename'],
+            self.files['image_1.pdf']
+        )
+        # the spans of the pages are inside the span of the file.
+        for event in pages:
+            self.assertGreaterEqual(event['ts'], process['ts'])
+            self.assertLessEqual(
+                event['ts'] + event['dur'],
+                process['ts'] + process['dur'] + 1
+            )
+
+    def test_trace_jobs(self):
+        path = Paths.build(self.temp_dir, 'trace_jobs.json')
+        with self.comicpy(trace=path) as comic:
+            comic.process_dir(
+                        directory_path=self.pdfs_dir,
+                        extension_filter='pdf',
+                        compressor='zip',
+                        dest=Paths.build(self.temp_dir, 'trace_jobs'),
+                        jobs=2
+                    )
+        stop_tracing()
+
+        events = self.load_trace(path)
+        files = [event for event in events if event['name'] == 'file']
+        self.assertEqual(len(files), len(os.listdir(self.pdfs_dir)))
+        # the spans of the worker processes are sent to the parent.
+        self.assertNotIn(os.getpid(), {event['pid'] for event in files})
+        self.assertIn(
+            'process_dir',
+            {
+                event['name'] for event in events
+                if event['pid'] == os.getpid()
+            }
+        )
+
+    def test_trace_disabled(self):
+        self.assertIsNone(get_tracer())
+        with span('page', page=1) as args:
+            self.assertEqual(args, {'page': 1})
+        comic = self.comicpy(trace=False)
+        self.assertIsNone(comic.tracer)
+        comic.close()
+
+    def tearDown(self):
+        stop_tracing()
+
+    @classmethod
+    def tearDownClass(cls):
+        path = os.path.join(
+                    BaseTestCase.TESTS_DIR,
+                    BaseTestCase.TEMP_DIR
+                )
+        shutil.rmtree(path, ignore_errors=True)